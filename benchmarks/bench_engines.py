@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark the merge engines and automatic engine selection.
+
+Run from the repository root after ``pip install -e .``:
+
+    python benchmarks/bench_engines.py
+"""
+
+import timeit
+
+from flexmerge import Merger
+
+
+def deep_tree(depth, leaf):
+    """Build a narrow tree nested ``depth`` levels deep."""
+    root = node = {}
+    for level in range(depth):
+        node["value"] = leaf + level
+        node["child"] = {}
+        node = node["child"]
+    return root
+
+
+def wide_tree(width, leaf):
+    """Build a shallow tree with ``width`` small nested dicts."""
+    return {
+        f"key{i}": {"a": leaf, "b": {"c": leaf, "items": [leaf]}} for i in range(width)
+    }
+
+
+def flat_dict(width, leaf):
+    """Build a flat dict of scalars."""
+    return {f"key{i}": leaf for i in range(width)}
+
+
+def bench(label, left, right, number):
+    """Time every engine on the same inputs."""
+    for engine in ("recursive", "iterative", "union", "auto"):
+        merger = Merger().engine(engine)
+        seconds = timeit.timeit(lambda: merger.merge(left, right), number=number)
+        print(f"{label:<20} {engine:<10} {seconds / number * 1e3:9.3f} ms/merge")
+
+
+def main():
+    """Run all benchmark shapes."""
+    bench("deep (depth=200)", deep_tree(200, 0), deep_tree(200, 1), 2000)
+    bench("wide (width=10000)", wide_tree(10_000, 0), wide_tree(10_000, 1), 20)
+    bench("flat (width=20)", flat_dict(20, 0), flat_dict(20, 1), 20000)
+
+    left, right = deep_tree(50_000, 0), deep_tree(50_000, 1)
+    merger = Merger().engine("iterative")
+    seconds = timeit.timeit(lambda: merger.merge(left, right), number=3) / 3
+    print(f"{'deep (depth=50000)':<20} {'iterative':<10} {seconds * 1e3:9.3f} ms/merge")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark batch merging of many small record pairs.
+
+Run from the repository root after ``pip install -e .``:
+
+    python benchmarks/bench_merge_many.py
+"""
+
+import time
+
+from flexmerge import Merger, merge
+
+ROWS = 200_000
+
+
+def make_rows(count):
+    """Build ``count`` pairs of small ETL-style records."""
+    return [
+        (
+            {"id": i, "name": f"user{i}", "tags": ["a"], "meta": {"source": "x"}},
+            {"id": i, "score": i % 7, "tags": ["b"], "meta": {"seen": True}},
+        )
+        for i in range(count)
+    ]
+
+
+def report(label, seconds):
+    """Print throughput in rows per second."""
+    print(f"{label:<28} {ROWS / seconds:12,.0f} rows/s")
+
+
+def main():
+    """Compare per-call merging with merge_many."""
+    rows = make_rows(ROWS)
+
+    start = time.perf_counter()
+    for left, right in rows:
+        merge(left, right)
+    report("merge() per row", time.perf_counter() - start)
+
+    merger = Merger()
+    start = time.perf_counter()
+    for left, right in rows:
+        merger.merge(left, right)
+    report("Merger.merge() per row", time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in merger.merge_many(rows):
+        pass
+    report("merge_many()", time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in merger.merge_many(rows, trusted=True):
+        pass
+    report("merge_many(trusted=True)", time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,12 +5,30 @@ This library provides a clean API for merging dictionaries with customizable
 strategies for handling lists, nested dictionaries, and other data types.
 """
 
+from .conflicts import Conflict, MergeConflictError
+from .context import MergeContext
+from .engine import BuiltinEngines
+from .explain import MergeEstimate
+from .fingerprint import Fingerprinter, fingerprint
+from .intern import Interner
+from .limits import MergeLimitError, MergeLimits
 from .merger import Merger, merge, merge_shallow, merge_unique
+from .schema import Schema, SchemaError, SchemaViolation
+from .snapshot import LazyDict, Snapshot, SnapshotError, load_snapshot, save_snapshot
+from .sources import EnvSource, ParseCache
 from .strategies import (
     BuiltinDictStrategies,
     BuiltinListStrategies,
+    BuiltinScalarStrategies,
     DictStrategy,
     ListStrategy,
+    ScalarStrategy,
+    by_key,
+    context_strategy,
+    sorted_merge,
+    sorted_unique,
+    unique_approx,
+    unique_partitioned,
 )
 
 __version__ = "0.1.0"
@@ -21,6 +39,34 @@ __all__ = [
     "merge_shallow",
     "ListStrategy",
     "DictStrategy",
+    "ScalarStrategy",
     "BuiltinListStrategies",
     "BuiltinDictStrategies",
+    "BuiltinScalarStrategies",
+    "BuiltinEngines",
+    "MergeEstimate",
+    "Interner",
+    "Fingerprinter",
+    "fingerprint",
+    "Conflict",
+    "MergeConflictError",
+    "MergeLimits",
+    "MergeLimitError",
+    "Schema",
+    "SchemaError",
+    "SchemaViolation",
+    "ParseCache",
+    "EnvSource",
+    "LazyDict",
+    "Snapshot",
+    "SnapshotError",
+    "load_snapshot",
+    "save_snapshot",
+    "by_key",
+    "context_strategy",
+    "MergeContext",
+    "sorted_merge",
+    "sorted_unique",
+    "unique_approx",
+    "unique_partitioned",
 ]
@@ -0,0 +1,5 @@
+"""Allow running the command-line interface with ``python -m flexmerge``."""
+
+from .cli import main
+
+raise SystemExit(main())
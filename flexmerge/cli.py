@@ -0,0 +1,221 @@
+"""
+Command-line interface for merging JSON/TOML configuration files.
+
+Example:
+    $ flexmerge base.json prod.toml --lists unique --jobs 4 --stats > out.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, Any
+
+from .engine import BUILTIN_ENGINES, BuiltinEngines
+from .merger import Merger
+from .paths import compile_patterns, project
+from .sources import EnvSource, load_file
+from .strategies import (
+    BUILTIN_DICT_STRATEGIES,
+    BUILTIN_LIST_STRATEGIES,
+    BUILTIN_SCALAR_STRATEGIES,
+    by_key,
+)
+
+# Encoded output is collected into chunks of about this many characters
+# before being written, instead of building one string for the whole result
+_WRITE_CHUNK_SIZE = 1 << 16
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Create the argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="flexmerge",
+        description="Merge JSON/TOML files in order and write the result as JSON.",
+    )
+    parser.add_argument("files", nargs="+", help="JSON or TOML files to merge")
+    list_group = parser.add_mutually_exclusive_group()
+    list_group.add_argument(
+        "--lists",
+        choices=sorted(BUILTIN_LIST_STRATEGIES),
+        default="append",
+        help="list merge strategy (default: append)",
+    )
+    list_group.add_argument(
+        "--by-key",
+        metavar="FIELD",
+        help="merge lists of records by this field instead of --lists",
+    )
+    parser.add_argument(
+        "--dicts",
+        choices=sorted(BUILTIN_DICT_STRATEGIES),
+        default="deep",
+        help="dict merge strategy (default: deep)",
+    )
+    parser.add_argument(
+        "--scalars",
+        choices=sorted(BUILTIN_SCALAR_STRATEGIES),
+        default="replace",
+        help="strategy for scalars set by several files (default: replace)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=sorted([*BUILTIN_ENGINES, BuiltinEngines.AUTO.value]),
+        default=BuiltinEngines.ITERATIVE.value,
+        help="merge engine; auto picks one from a sample of the inputs "
+        "(default: iterative)",
+    )
+    parser.add_argument(
+        "--env",
+        metavar="PREFIX",
+        help="overlay environment variables such as PREFIX__DB__HOST last",
+    )
+    parser.add_argument(
+        "--include",
+        action="append",
+        metavar="PATH",
+        help="only merge this dotted key path, '*' matching any key (repeatable)",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        metavar="PATH",
+        help="leave out this dotted key path (repeatable)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of worker processes used to parse the files (default: 1)",
+    )
+    parser.add_argument(
+        "-o", "--output", help="write the result to this file instead of stdout"
+    )
+    parser.add_argument(
+        "--indent", type=int, default=None, help="indent the JSON output"
+    )
+    parser.add_argument(
+        "--sort-keys", action="store_true", help="sort keys in the JSON output"
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="print timing and node counts to stderr",
+    )
+    return parser
+
+
+def _load_documents(paths: Sequence[str], jobs: int) -> list[Any]:
+    """Parse the input files, in worker processes when ``jobs`` > 1."""
+    if jobs <= 1 or len(paths) <= 1:
+        return [load_file(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(paths))) as executor:
+        return list(executor.map(load_file, paths))
+
+
+def _write_json(
+    value: Any, stream: IO[str], indent: int | None, sort_keys: bool
+) -> None:
+    """Encode a value incrementally and write it in buffered chunks."""
+    encoder = json.JSONEncoder(indent=indent, sort_keys=sort_keys)
+    buffer: list[str] = []
+    size = 0
+    for chunk in encoder.iterencode(value):
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= _WRITE_CHUNK_SIZE:
+            stream.write("".join(buffer))
+            buffer.clear()
+            size = 0
+    buffer.append("\n")
+    stream.write("".join(buffer))
+
+
+def _count_nodes(value: Any) -> dict[str, int]:
+    """Count dicts, lists and scalars in a tree and measure its depth."""
+    counts = {"dicts": 0, "lists": 0, "scalars": 0, "depth": 0}
+    stack = [(value, 1)]
+    while stack:
+        node, depth = stack.pop()
+        if depth > counts["depth"]:
+            counts["depth"] = depth
+        if isinstance(node, dict):
+            counts["dicts"] += 1
+            stack.extend((child, depth + 1) for child in node.values())
+        elif isinstance(node, list):
+            counts["lists"] += 1
+            stack.extend((child, depth + 1) for child in node)
+        else:
+            counts["scalars"] += 1
+    return counts
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """
+    Run the command-line interface.
+
+    Args:
+        argv: Command-line arguments (default: ``sys.argv[1:]``)
+
+    Returns:
+        Process exit code
+    """
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    merger = Merger().dicts(args.dicts).scalars(args.scalars).engine(args.engine)
+    merger.lists(by_key(args.by_key) if args.by_key else args.lists)
+
+    try:
+        start = time.perf_counter()
+        documents = _load_documents(args.files, args.jobs)
+        if args.env is not None:
+            documents.append(EnvSource(args.env).load())
+        parsed = time.perf_counter()
+        if args.include is not None or args.exclude is not None:
+            # Projected here so that --stats describes the merged documents
+            include = None if args.include is None else compile_patterns(args.include)
+            exclude = None if args.exclude is None else compile_patterns(args.exclude)
+            documents = [project(d, include, exclude) for d in documents]
+        result = merger.merge(*documents)
+        merged = time.perf_counter()
+
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                _write_json(result, f, args.indent, args.sort_keys)
+        else:
+            _write_json(result, sys.stdout, args.indent, args.sort_keys)
+            sys.stdout.flush()
+        written = time.perf_counter()
+    except (OSError, ValueError, TypeError) as e:
+        print(f"flexmerge: error: {e}", file=sys.stderr)
+        return 1
+
+    if args.stats:
+        engine = args.engine
+        if engine == BuiltinEngines.AUTO.value:
+            engine += f":{merger.explain(*documents).engine}"
+        counts = _count_nodes(result)
+        nodes = counts["dicts"] + counts["lists"] + counts["scalars"]
+        print(
+            f"flexmerge: parse {(parsed - start) * 1e3:.1f} ms "
+            f"({len(args.files)} files, jobs={args.jobs}), "
+            f"merge {(merged - parsed) * 1e3:.1f} ms (engine={engine}), "
+            f"write {(written - merged) * 1e3:.1f} ms",
+            file=sys.stderr,
+        )
+        print(
+            f"flexmerge: {nodes} nodes (dicts={counts['dicts']}, "
+            f"lists={counts['lists']}, scalars={counts['scalars']}), "
+            f"depth={counts['depth']}",
+            file=sys.stderr,
+        )
+
+    return 0
@@ -0,0 +1,131 @@
+"""
+Detection of conflicting values between merge layers.
+
+Two layers conflict when they set the same path to different values that
+the merge would not combine, so one of them would silently win. Checks
+work on key-set intersections, so subtrees that only one layer touches are
+skipped without being walked.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from typing import Any, NamedTuple
+
+from .engine import _is_scalar
+
+
+class Conflict(NamedTuple):
+    """A path set to different values by two layers."""
+
+    path: tuple[Any, ...]
+    layers: tuple[int, int]
+    left: Any
+    right: Any
+
+
+class MergeConflictError(ValueError):
+    """Raised by strict merges when layers set the same path differently."""
+
+    def __init__(self, conflicts: Sequence[Conflict]) -> None:
+        """
+        Initialize the error.
+
+        Args:
+            conflicts: Conflicts found, at least one
+        """
+        self.conflicts = list(conflicts)
+        first = self.conflicts[0]
+        message = (
+            f"Conflicting values at '{format_path(first.path)}' in layers "
+            f"{first.layers[0]} and {first.layers[1]}: "
+            f"{first.left!r} != {first.right!r}"
+        )
+        if len(self.conflicts) > 1:
+            message += f" (and {len(self.conflicts) - 1} more)"
+        super().__init__(message)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickle from the conflicts, so the error survives worker processes."""
+        return (type(self), (self.conflicts,))
+
+
+def format_path(path: Sequence[Any]) -> str:
+    """Format a key path as a dotted string."""
+    return ".".join(str(key) for key in path)
+
+
+def find_conflicts(
+    layers: Sequence[Mapping[Any, Any]],
+    deep: bool = True,
+    compare_lists: bool = False,
+    compare_scalars: bool = True,
+    fail_fast: bool = False,
+    layer_ids: Sequence[int] | None = None,
+) -> list[Conflict]:
+    """
+    Find paths that two layers set to different values.
+
+    Every pair of layers is compared. For each pair of mappings only the
+    keys both define (``left.keys() & right.keys()``) are examined, so
+    disjoint subtrees cost a single set intersection. Values that are the
+    same object are skipped without comparing them.
+
+    Args:
+        layers: Mappings in merge order
+        deep: Descend into nested mappings set by both layers; when False
+            they are compared as whole values
+        compare_lists: Report lists that differ; when False lists are
+            assumed to be combined by the list strategy
+        compare_scalars: Report scalars that differ; when False they are
+            assumed to be combined by a scalar strategy
+        fail_fast: Return as soon as one conflict is found
+        layer_ids: Layer numbers to report instead of positions in ``layers``
+
+    Returns:
+        Conflicts ordered by layer pair; the order of paths within a pair
+        is unspecified
+    """
+    ids = range(len(layers)) if layer_ids is None else layer_ids
+    conflicts: list[Conflict] = []
+
+    for right_index in range(1, len(layers)):
+        right = layers[right_index]
+        for left_index in range(right_index):
+            pair = (ids[left_index], ids[right_index])
+            stack: list[tuple[Mapping[Any, Any], Mapping[Any, Any], tuple[Any, ...]]]
+            stack = [(layers[left_index], right, ())]
+            while stack:
+                left_map, right_map, path = stack.pop()
+                for key in left_map.keys() & right_map.keys():
+                    left_value = left_map[key]
+                    right_value = right_map[key]
+                    if left_value is right_value:
+                        continue
+                    if (
+                        deep
+                        and isinstance(left_value, Mapping)
+                        and isinstance(right_value, Mapping)
+                    ):
+                        stack.append((left_value, right_value, path + (key,)))
+                        continue
+                    if (
+                        not compare_lists
+                        and isinstance(left_value, list)
+                        and isinstance(right_value, list)
+                    ):
+                        continue
+                    if (
+                        not compare_scalars
+                        and _is_scalar(left_value)
+                        and _is_scalar(right_value)
+                    ):
+                        continue
+                    if left_value != right_value:
+                        conflicts.append(
+                            Conflict(path + (key,), pair, left_value, right_value)
+                        )
+                        if fail_fast:
+                            return conflicts
+
+    return conflicts
@@ -0,0 +1,196 @@
+"""
+Merge context passed to context-aware (v2) strategies.
+
+A v2 strategy takes a third ``ctx`` argument telling it where in the tree
+it is and letting it hand the rest of the merge back to the walk with
+``ctx.recurse``. Nested pairs of mappings met by ``recurse`` are passed to
+the dict strategy again with a child context, so custom logic for a few
+keys runs inline in a single walk instead of re-implementing the deep
+merge.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, Callable
+
+from .engine import (
+    _MISSING,
+    _is_scalar,
+    _lift_scalars,
+    _list_lifter,
+    _materialize,
+)
+
+if TYPE_CHECKING:
+    from .merger import Merger
+
+
+def accepts_context(strategy: Any) -> bool:
+    """Check whether a strategy takes a ``MergeContext`` argument."""
+    return getattr(strategy, "accepts_context", False)
+
+
+class _Walk:
+    """Strategies shared by every context of one merge."""
+
+    __slots__ = (
+        "merger",
+        "dict_strategy",
+        "dict_context",
+        "list_strategy",
+        "list_context",
+        "scalars",
+        "initial",
+        "lift_list",
+    )
+
+    def __init__(
+        self,
+        merger: Merger | None,
+        dict_strategy: Callable[..., Any] | None,
+        list_strategy: Callable[..., Any],
+    ) -> None:
+        self.merger = merger
+        # None stands for the default deep merge of nested mappings
+        self.dict_strategy = dict_strategy
+        self.dict_context = accepts_context(dict_strategy)
+        self.list_strategy = list_strategy
+        self.list_context = accepts_context(list_strategy)
+        # None stands for the right-hand value replacing the left one
+        self.scalars = merger._scalar_merge() if merger is not None else None
+        self.initial = getattr(self.scalars, "initial", None)
+        self.lift_list = _list_lifter(list_strategy, self.initial)
+
+
+class MergeContext:
+    """
+    Position of a merge step, passed to context-aware strategies.
+
+    Attributes:
+        path: Keys leading from the root to the values being merged
+        merger: Merger running the merge, or None when the strategy was
+            called directly without a context
+    """
+
+    __slots__ = ("path", "_walk")
+
+    def __init__(self, walk: _Walk, path: tuple[Any, ...] = ()) -> None:
+        self._walk = walk
+        self.path = path
+
+    @classmethod
+    def root(
+        cls,
+        merger: Merger | None,
+        dict_strategy: Callable[..., Any] | None,
+        list_strategy: Callable[..., Any],
+    ) -> MergeContext:
+        """Create the context for the top level of a merge."""
+        return cls(_Walk(merger, dict_strategy, list_strategy))
+
+    @property
+    def merger(self) -> Merger | None:
+        """Merger running the merge."""
+        return self._walk.merger
+
+    @property
+    def depth(self) -> int:
+        """Nesting depth of the values being merged (0 at the top level)."""
+        return len(self.path)
+
+    def child(self, key: Any) -> MergeContext:
+        """Return the context for the values under ``key``."""
+        return MergeContext(self._walk, self.path + (key,))
+
+    def at(self, path: tuple[Any, ...]) -> MergeContext:
+        """Return the context for the values at ``path`` below this one."""
+        return MergeContext(self._walk, self.path + path)
+
+    def merge_dicts(
+        self, left: Mapping[str, Any], right: Mapping[str, Any]
+    ) -> dict[str, Any]:
+        """Merge two mappings at this path with the dict strategy."""
+        walk = self._walk
+        merged: dict[str, Any]
+        if walk.dict_strategy is None:
+            merged = self.recurse(left, right)
+        elif walk.dict_context:
+            merged = walk.dict_strategy(left, right, self)
+        else:
+            merged = walk.dict_strategy(_materialize(left), _materialize(right))
+        return merged
+
+    def merge_lists(self, left: list[Any], right: list[Any]) -> list[Any]:
+        """Merge two lists at this path with the list strategy."""
+        walk = self._walk
+        merged: list[Any]
+        if walk.list_context:
+            merged = walk.list_strategy(left, right, self)
+        else:
+            merged = walk.list_strategy(left, right)
+        return merged
+
+    def recurse(self, left: Any, right: Any) -> Any:
+        """
+        Merge two values at this path with the default deep-merge rules.
+
+        Keys of two mappings are merged one by one: nested mappings are
+        passed to the dict strategy with a child context, lists to the list
+        strategy, two scalars to the merger's scalar strategy, and any
+        other right-hand value replaces the left one. Values that are not
+        both mappings are merged as a single pair.
+
+        Args:
+            left: Left value
+            right: Right value
+
+        Returns:
+            Merged value
+        """
+        if not (isinstance(left, Mapping) and isinstance(right, Mapping)):
+            return self._merge_value(left, right)
+
+        result = _materialize(left)
+        for key, right_value in right.items():
+            left_value = result.get(key, _MISSING)
+            if left_value is _MISSING:
+                result[key] = self.lift(right_value)
+            else:
+                result[key] = self.child(key)._merge_value(left_value, right_value)
+        return result
+
+    def _merge_value(self, left: Any, right: Any) -> Any:
+        """Merge one pair of values at this path."""
+        if isinstance(left, Mapping) and isinstance(right, Mapping):
+            return self.merge_dicts(left, right)
+        if isinstance(left, list) and isinstance(right, list):
+            return self.merge_lists(left, right)
+        walk = self._walk
+        if walk.scalars is None:
+            return right
+        if _is_scalar(left) and _is_scalar(right):
+            return walk.scalars(left, right)
+        return self.lift(right)
+
+    def lift(self, value: Any) -> Any:
+        """
+        Prepare a value entering the result without a counterpart.
+
+        With a scalar strategy that has an ``initial`` step (such as
+        ``count``), its scalars are lifted; otherwise it is returned as is.
+
+        Args:
+            value: Value taken from the right-hand side
+
+        Returns:
+            Value to place in the result
+        """
+        walk = self._walk
+        if walk.initial is None:
+            return value
+        return _lift_scalars(value, walk.initial, walk.lift_list)
+
+    def __repr__(self) -> str:
+        """String representation of the context."""
+        return f"MergeContext(path={self.path!r})"
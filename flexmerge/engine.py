@@ -0,0 +1,382 @@
+"""
+Merge engines that drive the deep merge of nested dictionaries.
+
+An engine provides two operations: copying the first layer into a fresh
+result tree and deep merging another layer into it. Merges can be given a
+``same`` check that lets the engine share a right-hand subtree instead of
+walking it when merging would not change it, and a scalar strategy that
+combines two scalar values set at the same path instead of keeping the
+right one. The recursive engine
+mirrors the original merge loop; the iterative engine walks the tree
+with an explicit stack, so it has no depth limit and avoids the cost of a
+Python frame per nesting level.
+
+Any ``collections.abc.Mapping`` is merged like a dict. Such mappings are
+read in place and only the levels the merge actually writes to are
+materialized as new dicts; untouched mapping subtrees are shared with the
+result as-is.
+
+Merges given a ``MergeGuard`` take a separate path-tracking walk, shared
+by all engines, that checks every step against the merge's resource
+limits; the unguarded loops pay nothing for it.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from copy import deepcopy
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from .limits import MergeGuard
+
+ListMerge = Callable[[list[Any], list[Any]], list[Any]]
+# Tells whether merging a right-hand mapping into a left-hand one would just
+# give the right-hand mapping, so the subtree can be shared without a walk
+SameCheck = Callable[[Any, Any], bool]
+# Combines two scalar values set at the same path. It may have an
+# ``initial`` method mapping a scalar to the value it starts from when it
+# enters the result (as ``count`` does)
+ScalarMerge = Callable[[Any, Any], Any]
+
+# Immutable leaf types that can be shared between input and result
+_ATOMIC_TYPES = frozenset(
+    {str, int, float, bool, complex, bytes, type(None), range, type(Ellipsis)}
+)
+
+_MISSING = object()
+
+
+class BuiltinEngines(Enum):
+    """Enumeration of built-in merge engines."""
+
+    RECURSIVE = "recursive"
+    ITERATIVE = "iterative"
+    UNION = "union"
+    AUTO = "auto"
+
+
+def _copy_tree(value: Any) -> Any:
+    """
+    Deep copy nested dicts and lists without recursion.
+
+    Plain dicts and lists are copied with an explicit stack; shared and
+    cyclic references are preserved through a memo like ``deepcopy`` does.
+    Immutable scalars and nested mappings that are not dicts are shared,
+    and any other object is handed to ``deepcopy``. A mapping passed as
+    ``value`` itself is materialized into a dict one level deep.
+    """
+    value_type = type(value)
+    if value_type is dict or value_type is list:
+        root = value.copy()
+    elif value_type in _ATOMIC_TYPES:
+        return value
+    elif isinstance(value, Mapping) and not isinstance(value, dict):
+        root = dict(value)
+    else:
+        return deepcopy(value)
+
+    memo = {id(value): root}
+    stack = [root]
+    pop = stack.pop
+    push = stack.append
+
+    while stack:
+        container = pop()
+        items = container.items() if type(container) is dict else enumerate(container)
+        for key, item in items:
+            item_type = type(item)
+            if item_type is dict or item_type is list:
+                copied = memo.get(id(item))
+                if copied is None:
+                    copied = item.copy()
+                    memo[id(item)] = copied
+                    push(copied)
+                container[key] = copied
+            elif item_type not in _ATOMIC_TYPES and (
+                isinstance(item, dict) or not isinstance(item, Mapping)
+            ):
+                container[key] = deepcopy(item)
+
+    return root
+
+
+def _is_scalar(value: Any) -> bool:
+    """Check whether a value is combined by the scalar strategy."""
+    return type(value) in _ATOMIC_TYPES or not isinstance(value, (Mapping, list))
+
+
+def _lift_scalars(
+    value: Any,
+    initial: Callable[[Any], Any],
+    lift_list: Callable[[list[Any]], list[Any]] | None = None,
+) -> Any:
+    """
+    Apply a scalar strategy's ``initial`` step to the scalars of a subtree.
+
+    Mappings along the way are rebuilt as new dicts. Lists are left as they
+    are, since their items are merged by the list strategy, unless
+    ``lift_list`` (see ``_list_lifter``) is given to lift them.
+    """
+    if isinstance(value, list):
+        return value if lift_list is None else lift_list(value)
+    if not isinstance(value, Mapping):
+        return initial(value)
+
+    root: dict[Any, Any] = {}
+    stack = [(root, value)]
+    while stack:
+        target, source = stack.pop()
+        for key, item in source.items():
+            if isinstance(item, Mapping):
+                child: dict[Any, Any] = {}
+                target[key] = child
+                stack.append((child, item))
+            elif isinstance(item, list):
+                target[key] = item if lift_list is None else lift_list(item)
+            else:
+                target[key] = initial(item)
+    return root
+
+
+def _list_lifter(
+    list_strategy: Any, initial: Callable[[Any], Any] | None
+) -> Callable[[list[Any]], list[Any]] | None:
+    """
+    Resolve how lists entering a result are lifted for a scalar reducer.
+
+    List strategies that merge the items of both lists (such as ``by_key``)
+    define ``lift_items(items, initial)``; for the others lists stay as they
+    are and None is returned.
+    """
+    lift_items = getattr(list_strategy, "lift_items", None)
+    if initial is None or lift_items is None:
+        return None
+
+    def lift_list(items: list[Any]) -> list[Any]:
+        lifted: list[Any] = lift_items(items, initial)
+        return lifted
+
+    return lift_list
+
+
+def _materialize(value: Mapping[str, Any]) -> dict[str, Any]:
+    """Return a new dict holding the top level of a mapping."""
+    return value.copy() if isinstance(value, dict) else dict(value)
+
+
+def _merge_guarded(
+    left: Mapping[str, Any],
+    right: Mapping[str, Any],
+    list_strategy: ListMerge,
+    same: SameCheck | None,
+    scalars: ScalarMerge | None,
+    guard: MergeGuard,
+) -> dict[str, Any]:
+    """
+    Deep merge two dictionaries under the limits of a guard.
+
+    The result is the same as the engines give. Every level carries its
+    key path so the guard can report where a limit was exceeded, and
+    values taken from the right side without merging are walked by the
+    guard, since they end up in the result.
+    """
+    result = _materialize(left)
+    initial = getattr(scalars, "initial", None)
+    stack: list[tuple[dict[str, Any], Mapping[str, Any], tuple[Any, ...]]] = [
+        (result, right, ())
+    ]
+
+    while stack:
+        target, source, path = stack.pop()
+        for key, right_value in source.items():
+            guard.visit(path, key)
+            left_value = target.get(key, _MISSING)
+            if left_value is _MISSING:
+                guard.check_value(right_value, path, key)
+                if initial is not None:
+                    right_value = _lift_scalars(right_value, initial)
+                target[key] = right_value
+            elif isinstance(left_value, Mapping) and isinstance(right_value, Mapping):
+                if same is not None and same(left_value, right_value):
+                    target[key] = right_value
+                    continue
+                guard.enter(path, key)
+                merged = _materialize(left_value)
+                target[key] = merged
+                stack.append((merged, right_value, path + (key,)))
+            elif isinstance(left_value, list) and isinstance(right_value, list):
+                guard.check_lists(left_value, right_value, path, key)
+                merged_list = list_strategy(left_value, right_value)
+                guard.check_merged_list(merged_list, path, key)
+                target[key] = merged_list
+            elif (
+                scalars is not None
+                and _is_scalar(left_value)
+                and _is_scalar(right_value)
+            ):
+                target[key] = scalars(left_value, right_value)
+            else:
+                guard.check_value(right_value, path, key)
+                if initial is not None:
+                    right_value = _lift_scalars(right_value, initial)
+                target[key] = right_value
+
+    return result
+
+
+class RecursiveEngine:
+    """Engine that recurses once per nesting level."""
+
+    name = BuiltinEngines.RECURSIVE.value
+
+    def copy(self, value: Any) -> Any:
+        """Copy the first layer into a new result tree."""
+        return _copy_tree(value)
+
+    def merge(
+        self,
+        left: Mapping[str, Any],
+        right: Mapping[str, Any],
+        list_strategy: ListMerge,
+        same: SameCheck | None = None,
+        scalars: ScalarMerge | None = None,
+        guard: MergeGuard | None = None,
+    ) -> dict[str, Any]:
+        """Deep merge two dictionaries."""
+        if guard is not None:
+            return _merge_guarded(left, right, list_strategy, same, scalars, guard)
+        result = _materialize(left)
+        initial = getattr(scalars, "initial", None)
+
+        for key, right_value in right.items():
+            if key in result:
+                left_value = result[key]
+                if isinstance(left_value, Mapping) and isinstance(right_value, Mapping):
+                    if same is not None and same(left_value, right_value):
+                        result[key] = right_value
+                    else:
+                        result[key] = self.merge(
+                            left_value, right_value, list_strategy, same, scalars
+                        )
+                elif isinstance(left_value, list) and isinstance(right_value, list):
+                    result[key] = list_strategy(left_value, right_value)
+                elif scalars is None:
+                    result[key] = right_value
+                elif _is_scalar(left_value) and _is_scalar(right_value):
+                    result[key] = scalars(left_value, right_value)
+                elif initial is not None:
+                    result[key] = _lift_scalars(right_value, initial)
+                else:
+                    result[key] = right_value
+            elif initial is not None:
+                result[key] = _lift_scalars(right_value, initial)
+            else:
+                result[key] = right_value
+
+        return result
+
+
+class IterativeEngine:
+    """Engine that walks nested dictionaries with an explicit stack."""
+
+    name = BuiltinEngines.ITERATIVE.value
+    # Merge levels whose right-hand values are all scalars with dict.update
+    bulk_scalar_levels = False
+
+    def copy(self, value: Any) -> Any:
+        """Copy the first layer into a new result tree."""
+        return _copy_tree(value)
+
+    def merge(
+        self,
+        left: Mapping[str, Any],
+        right: Mapping[str, Any],
+        list_strategy: ListMerge,
+        same: SameCheck | None = None,
+        scalars: ScalarMerge | None = None,
+        guard: MergeGuard | None = None,
+    ) -> dict[str, Any]:
+        """Deep merge two dictionaries."""
+        if guard is not None:
+            return _merge_guarded(left, right, list_strategy, same, scalars, guard)
+        result = _materialize(left)
+        initial = getattr(scalars, "initial", None)
+        # Each entry pairs a freshly copied result dict with the right-hand
+        # mapping still to be merged into it
+        stack = [(result, right)]
+        pop = stack.pop
+        push = stack.append
+        bulk = self.bulk_scalar_levels and scalars is None
+        atomic_types = _ATOMIC_TYPES
+
+        while stack:
+            target, source = pop()
+            if bulk:
+                for right_value in source.values():
+                    if type(right_value) not in atomic_types:
+                        break
+                else:
+                    # Scalars always replace: merge the level in one update
+                    target.update(source)
+                    continue
+            for key, right_value in source.items():
+                left_value = target.get(key, _MISSING)
+                if left_value is _MISSING:
+                    if initial is not None:
+                        right_value = _lift_scalars(right_value, initial)
+                    target[key] = right_value
+                elif (
+                    same is not None
+                    and isinstance(left_value, Mapping)
+                    and isinstance(right_value, Mapping)
+                    and same(left_value, right_value)
+                ):
+                    target[key] = right_value
+                elif isinstance(left_value, dict) and isinstance(right_value, dict):
+                    merged = left_value.copy()
+                    target[key] = merged
+                    push((merged, right_value))
+                elif isinstance(left_value, list) and isinstance(right_value, list):
+                    target[key] = list_strategy(left_value, right_value)
+                elif (
+                    type(left_value) not in _ATOMIC_TYPES
+                    and isinstance(left_value, Mapping)
+                    and isinstance(right_value, Mapping)
+                ):
+                    merged = _materialize(left_value)
+                    target[key] = merged
+                    push((merged, right_value))
+                elif scalars is None:
+                    target[key] = right_value
+                elif _is_scalar(left_value) and _is_scalar(right_value):
+                    target[key] = scalars(left_value, right_value)
+                else:
+                    if initial is not None:
+                        right_value = _lift_scalars(right_value, initial)
+                    target[key] = right_value
+
+        return result
+
+
+class UnionEngine(IterativeEngine):
+    """
+    Iterative engine that merges scalar-only levels with one dict update.
+
+    Before walking the keys of a right-hand mapping, its values are
+    scanned; if all are immutable scalars they can only replace the left
+    values, so the level is merged with ``dict.update`` in C. This pays off
+    for flat and leaf-heavy trees and costs an extra scan of levels that
+    hold a container.
+    """
+
+    name = BuiltinEngines.UNION.value
+    bulk_scalar_levels = True
+
+
+BUILTIN_ENGINES: dict[str, RecursiveEngine | IterativeEngine] = {
+    BuiltinEngines.RECURSIVE.value: RecursiveEngine(),
+    BuiltinEngines.ITERATIVE.value: IterativeEngine(),
+    BuiltinEngines.UNION.value: UnionEngine(),
+}
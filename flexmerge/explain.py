@@ -0,0 +1,201 @@
+"""
+Cheap shape estimates of merge inputs, and engine selection based on them.
+
+The inputs are sampled rather than walked: containers with more than
+``sample_size`` children contribute a sample whose counts are scaled up
+(the first values of a mapping, items spread over the length of a list).
+After ``max_visits`` containers, only one container child of each
+further container is followed, standing for all of them (Knuth's
+estimator of tree size), so the cost is bounded by the sample budget and
+the depth of the inputs rather than their size, while small inputs are
+still counted exactly.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from itertools import islice
+from typing import Any, NamedTuple
+
+from .engine import _ATOMIC_TYPES, BuiltinEngines
+
+# Share of keys in scalar-only mappings above which the union engine's
+# bulk updates save more than its extra scans cost
+_UNION_SCALAR_LEVEL_RATIO = 0.25
+_GOLDEN_RATIO = (5**0.5 - 1) / 2
+# Layers with at most this many top-level keys in total use the union
+# engine without being sampled: its extra scans cost less than the sampling
+_SMALL_LAYERS_KEYS = 64
+
+
+class MergeEstimate(NamedTuple):
+    """
+    Estimated shape of the layers of a merge.
+
+    Counts cover all layers and are scaled up from samples unless ``exact``
+    is true.
+
+    Attributes:
+        layers: Number of layers
+        nodes: Mappings, lists and scalars, including the layers themselves
+        depth: Deepest nesting level seen (1 for flat layers)
+        mappings: Mappings, including the layers themselves
+        lists: Lists
+        list_items: Items in all lists
+        max_list_length: Length of the longest list seen
+        hashable_ratio: Share of list items that are hashable (1.0 when
+            there are no list items)
+        scalar_level_ratio: Share of the keys of mappings walked by the
+            engines (not inside lists) that are in mappings holding only
+            scalars
+        exact: Whether every node was visited
+        engine: Engine that ``engine("auto")`` uses for these layers
+    """
+
+    layers: int
+    nodes: int
+    depth: int
+    mappings: int
+    lists: int
+    list_items: int
+    max_list_length: int
+    hashable_ratio: float
+    scalar_level_ratio: float
+    exact: bool
+    engine: str
+
+
+def _sample(node: Mapping[Any, Any] | Sequence[Any], sample_size: int) -> Sequence[Any]:
+    """Return up to ``sample_size`` children of a container."""
+    if isinstance(node, Mapping):
+        # Mappings have no cheap random access; take their first values
+        return list(islice(node.values(), sample_size))
+    size = len(node)
+    if size <= sample_size:
+        return node
+    # Golden-ratio steps spread the picks without aliasing with periodic
+    # patterns in the list, as evenly spaced picks would
+    return [node[int((i * _GOLDEN_RATIO) % 1 * size)] for i in range(sample_size)]
+
+
+def _is_small(layers: Sequence[Mapping[str, Any]]) -> bool:
+    """Check whether layers are small enough to skip sampling."""
+    return sum(len(layer) for layer in layers) <= _SMALL_LAYERS_KEYS
+
+
+def choose_engine(layers: Sequence[Mapping[str, Any]], bulk_scalars: bool) -> str:
+    """
+    Choose the engine for a merge, as ``estimate(layers).engine`` would.
+
+    Small inputs are decided without sampling them.
+    """
+    if not bulk_scalars:
+        return BuiltinEngines.ITERATIVE.value
+    if _is_small(layers):
+        return BuiltinEngines.UNION.value
+    return estimate(layers, bulk_scalars).engine
+
+
+def estimate(
+    layers: Sequence[Mapping[str, Any]],
+    bulk_scalars: bool = True,
+    sample_size: int = 8,
+    max_visits: int = 16,
+) -> MergeEstimate:
+    """
+    Estimate the shape of merge inputs from a bounded sample.
+
+    Args:
+        layers: Mappings in merge order
+        bulk_scalars: Whether scalar-only levels can be merged in bulk,
+            i.e. no scalar strategy combines values
+        sample_size: Children sampled per container
+        max_visits: Containers visited before only one container child
+            per container is followed
+
+    Returns:
+        Estimated shape and the engine chosen for it
+    """
+    nodes = mappings = lists = list_items = 0.0
+    walked = scalar_levels = hashable = hashed = 0.0
+    depth = max_list_length = visits = 0
+    exact = True
+
+    # Each entry is (container, depth, number of containers it stands for,
+    # whether it is reached through mappings only)
+    stack: list[tuple[Any, int, float, bool]] = [
+        (layer, 1, 1.0, True) for layer in layers
+    ]
+    while stack:
+        node, level, weight, is_walked = stack.pop()
+        visits += 1
+        nodes += weight
+        depth = max(depth, level)
+
+        is_mapping = isinstance(node, Mapping)
+        size = len(node)
+        if is_mapping:
+            mappings += weight
+            if is_walked:
+                walked += weight * size
+        else:
+            is_walked = False
+            lists += weight
+            list_items += weight * size
+            max_list_length = max(max_list_length, size)
+        if not size:
+            continue
+
+        sampled = _sample(node, sample_size)
+        if len(sampled) < size:
+            exact = False
+        child_weight = weight * size / len(sampled)
+        containers = []
+        for child in sampled:
+            if not is_mapping:
+                hashed += child_weight
+                try:
+                    hash(child)
+                except TypeError:
+                    pass
+                else:
+                    hashable += child_weight
+            if type(child) in _ATOMIC_TYPES or not isinstance(child, (Mapping, list)):
+                nodes += child_weight
+            else:
+                containers.append(child)
+
+        if not containers:
+            if is_walked:
+                scalar_levels += weight * size
+        elif visits <= max_visits:
+            for child in containers:
+                stack.append((child, level + 1, child_weight, is_walked))
+        else:
+            # Follow one container child standing for all of them
+            exact = False
+            pick = int((visits * _GOLDEN_RATIO) % 1 * len(containers))
+            weight = child_weight * len(containers)
+            stack.append((containers[pick], level + 1, weight, is_walked))
+
+    scalar_level_ratio = scalar_levels / walked if walked else 1.0
+    if bulk_scalars and (
+        _is_small(layers) or scalar_level_ratio >= _UNION_SCALAR_LEVEL_RATIO
+    ):
+        engine = BuiltinEngines.UNION.value
+    else:
+        engine = BuiltinEngines.ITERATIVE.value
+
+    return MergeEstimate(
+        layers=len(layers),
+        nodes=round(nodes),
+        depth=depth,
+        mappings=round(mappings),
+        lists=round(lists),
+        list_items=round(list_items),
+        max_list_length=max_list_length,
+        hashable_ratio=hashable / hashed if hashed else 1.0,
+        scalar_level_ratio=scalar_level_ratio,
+        exact=exact,
+        engine=engine,
+    )
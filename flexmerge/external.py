@@ -0,0 +1,281 @@
+"""
+Out-of-core merging backed by an on-disk SQLite database.
+
+Each input layer is streamed one top-level entry at a time into a SQLite
+file, then the entries are read back grouped by key and merged one key at
+a time. Only a single key's values (plus a bounded insert buffer) are held
+in memory, so datasets larger than RAM can be merged as long as every
+individual top-level value fits.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import pickle
+import re
+import sqlite3
+import tempfile
+from collections.abc import Iterable, Iterator, Mapping
+from itertools import groupby
+from typing import TYPE_CHECKING, Any, Union
+
+from .sources import PathLike, load_file
+from .strategies import BUILTIN_DICT_STRATEGIES, BuiltinDictStrategies
+
+if TYPE_CHECKING:
+    from .merger import Merger
+
+ExternalSource = Union[PathLike, Mapping[str, Any], Iterable[tuple[str, Any]]]
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# Dict strategies whose result can be computed independently per top-level key
+_KEYWISE_DICT_STRATEGIES = (
+    BuiltinDictStrategies.DEEP.value,
+    BuiltinDictStrategies.SHALLOW.value,
+)
+
+
+def iter_json_items(
+    path: PathLike, chunk_size: int = 1 << 20
+) -> Iterator[tuple[str, Any]]:
+    """
+    Stream the top-level ``(key, value)`` pairs of a JSON object file.
+
+    The file is read in chunks and each top-level value is decoded on its
+    own, so memory use is bounded by the largest single value rather than
+    the file size.
+
+    Args:
+        path: JSON file whose top-level value is an object
+        chunk_size: Number of characters read at a time
+
+    Yields:
+        Top-level keys and their decoded values, in file order
+
+    Raises:
+        ValueError: If the file is not a valid JSON object
+    """
+    decoder = json.JSONDecoder()
+
+    with open(path, encoding="utf-8") as f:
+        buf = ""
+        pos = 0
+        eof = False
+        read_size = chunk_size
+
+        def more() -> bool:
+            """Append the next chunk to the buffer, dropping consumed text."""
+            nonlocal buf, pos, eof
+            if eof:
+                return False
+            chunk = f.read(read_size)
+            if not chunk:
+                eof = True
+                return False
+            buf = buf[pos:] + chunk
+            pos = 0
+            return True
+
+        def skip_whitespace() -> None:
+            nonlocal pos
+            while True:
+                match = _WHITESPACE.match(buf, pos)
+                pos = match.end() if match else pos
+                if pos < len(buf) or not more():
+                    return
+
+        def expect(char: str) -> None:
+            nonlocal pos
+            skip_whitespace()
+            if buf[pos : pos + 1] != char:
+                found = buf[pos : pos + 1] or "end of file"
+                raise ValueError(f"Expected {char!r} in {path}, found {found!r}")
+            pos += 1
+
+        def decode() -> Any:
+            nonlocal pos, read_size
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    # Possibly cut off at the end of the buffer: read more
+                    # (in growing chunks to stay linear on huge values)
+                    if not more():
+                        raise
+                    read_size *= 2
+                    continue
+                # A number or literal ending exactly at the buffer end may
+                # continue in the next chunk
+                if end == len(buf) and more():
+                    continue
+                pos = end
+                read_size = chunk_size
+                return value
+
+        expect("{")
+        skip_whitespace()
+        if buf[pos : pos + 1] == "}":
+            return
+
+        while True:
+            skip_whitespace()
+            key = decode()
+            if not isinstance(key, str):
+                raise ValueError(f"Expected an object key in {path}, found {key!r}")
+            expect(":")
+            skip_whitespace()
+            yield key, decode()
+
+            skip_whitespace()
+            separator = buf[pos : pos + 1]
+            pos += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                found = separator or "end of file"
+                raise ValueError(f"Expected ',' or '}}' in {path}, found {found!r}")
+
+
+def _iter_source(source: ExternalSource) -> Iterator[tuple[str, Any]]:
+    """Iterate over the top-level entries of one layer."""
+    if isinstance(source, (str, os.PathLike)):
+        if os.fspath(source).lower().endswith(".json"):
+            return iter_json_items(source)
+        document = load_file(source)
+        if not isinstance(document, Mapping):
+            raise TypeError(f"File does not contain a table: {source}")
+        return iter(document.items())
+    if isinstance(source, Mapping):
+        return iter(source.items())
+    return iter(source)
+
+
+def _spill(
+    conn: sqlite3.Connection, sources: Iterable[ExternalSource], memory_budget: int
+) -> None:
+    """Write every layer's entries into the database in bounded batches."""
+    # A database reused from an earlier merge is started afresh
+    conn.execute("DROP TABLE IF EXISTS entries")
+    conn.execute("DROP TABLE IF EXISTS keys")
+    conn.execute(
+        "CREATE TABLE entries ("
+        "key TEXT NOT NULL, layer INTEGER NOT NULL, "
+        "seq INTEGER NOT NULL, value BLOB NOT NULL)"
+    )
+    conn.execute("CREATE TABLE keys (key TEXT PRIMARY KEY, position INTEGER NOT NULL)")
+
+    batch: list[tuple[str, int, int, bytes]] = []
+    batch_bytes = 0
+    seq = 0
+
+    def flush() -> None:
+        conn.executemany(
+            "INSERT OR IGNORE INTO keys VALUES (?, ?)",
+            [(key, row_seq) for key, _, row_seq, _ in batch],
+        )
+        conn.executemany("INSERT INTO entries VALUES (?, ?, ?, ?)", batch)
+        batch.clear()
+
+    for layer, source in enumerate(sources):
+        for key, value in _iter_source(source):
+            if not isinstance(key, str):
+                raise TypeError(f"Layer {layer} has a non-string key: {key!r}")
+            data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            batch.append((key, layer, seq, data))
+            seq += 1
+            batch_bytes += len(data) + len(key)
+            if batch_bytes >= memory_budget:
+                flush()
+                batch_bytes = 0
+
+    flush()
+    conn.execute("CREATE INDEX entries_by_key ON entries (key, layer, seq)")
+    conn.execute("CREATE INDEX keys_by_position ON keys (position)")
+    conn.commit()
+
+
+def merge_external(
+    merger: Merger,
+    sources: Iterable[ExternalSource],
+    db_path: PathLike | None = None,
+    memory_budget: int = 64 << 20,
+) -> Iterator[tuple[str, Any]]:
+    """
+    Merge layers through an on-disk SQLite database, one top-level key at a time.
+
+    Args:
+        merger: Merger whose strategies are applied to each key
+        sources: Layers as JSON/TOML file paths, mappings or iterables of
+            ``(key, value)`` pairs; JSON files are parsed incrementally
+        db_path: SQLite file to use, replacing the tables of an earlier
+            merge; a temporary file is created and removed afterwards when
+            omitted
+        memory_budget: Approximate number of bytes buffered before entries
+            are written to the database; half of it is also given to SQLite
+            as page cache
+
+    Yields:
+        Top-level keys and merged values, in first-seen order like ``merge``
+
+    Raises:
+        ValueError: If the dict strategy cannot be applied key by key
+    """
+    strategy = merger._dict_strategy
+    if not any(
+        strategy is BUILTIN_DICT_STRATEGIES[name] for name in _KEYWISE_DICT_STRATEGIES
+    ):
+        raise ValueError(
+            "External merge requires the 'deep' or 'shallow' dict strategy"
+        )
+
+    return _merge_spilled(merger, sources, db_path, memory_budget)
+
+
+def _merge_spilled(
+    merger: Merger,
+    sources: Iterable[ExternalSource],
+    db_path: PathLike | None,
+    memory_budget: int,
+) -> Iterator[tuple[str, Any]]:
+    """Spill the layers to SQLite and yield the merged keys."""
+    copy = merger._layer_copier()
+    merge_pair = merger._pair_merger()
+    interner = merger._interner
+
+    tmp_dir = None
+    if db_path is None:
+        tmp_dir = tempfile.TemporaryDirectory(prefix="flexmerge-")
+        db_path = os.path.join(tmp_dir.name, "merge.sqlite3")
+
+    conn = sqlite3.connect(os.fspath(db_path))
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute(f"PRAGMA cache_size = {-max(memory_budget // 2048, 1024)}")
+        _spill(conn, sources, memory_budget // 2)
+
+        rows = conn.execute(
+            "SELECT k.key, e.layer, e.value FROM keys AS k "
+            "JOIN entries AS e ON e.key = k.key "
+            "ORDER BY k.position, e.layer, e.seq"
+        )
+        for key, group in groupby(rows, key=lambda row: row[0]):
+            # Merging single-key dicts gives each value exactly the
+            # treatment it would get inside a full in-memory merge
+            entries = [(layer, pickle.loads(data)) for _, layer, data in group]
+            layers = [{key: value} for _, value in entries]
+            if merger._strict:
+                merger._raise_on_conflicts(layers, [layer for layer, _ in entries])
+            result = copy(layers[0])
+            for layer in layers[1:]:
+                result = merge_pair(result, layer)
+            value = result[key]
+            if interner is not None:
+                value = interner.intern(value)
+            yield key, value
+    finally:
+        conn.close()
+        if tmp_dir is not None:
+            tmp_dir.cleanup()
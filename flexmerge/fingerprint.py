@@ -0,0 +1,212 @@
+"""
+Merkle-style structural fingerprints of nested dicts and lists.
+
+A container's fingerprint is a BLAKE2b digest of its type, its keys and
+scalar items, and the fingerprints of its child containers, so equal trees
+(same keys in the same order, same values and value types) get equal
+fingerprints. Fingerprints of containers are cached by identity, so a
+subtree shared between inputs, or between inputs and a merge result, is
+only hashed once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Mapping
+from typing import Any
+
+_DIGEST_SIZE = 16
+
+
+def _is_container(value: Any) -> bool:
+    """Check whether a value gets its own cached fingerprint."""
+    value_type = type(value)
+    return (
+        value_type is dict
+        or value_type is list
+        or (value_type is not str and isinstance(value, Mapping))
+    )
+
+
+def _encode_scalar(value: Any, parts: list[bytes]) -> None:
+    """Append the encoding of a scalar value."""
+    value_type = type(value)
+    if value_type is str:
+        data = value.encode("utf-8", "surrogatepass")
+        parts.append(b"s%d:" % len(data))
+        parts.append(data)
+    elif value_type is bool:
+        parts.append(b"T" if value else b"F")
+    elif value_type is int:
+        parts.append(b"i%d;" % value)
+    elif value_type is float:
+        parts.append(b"f" + value.hex().encode() + b";")
+    elif value is None:
+        parts.append(b"N")
+    else:
+        data = f"{value_type.__module__}.{value_type.__qualname__}:{value!r}"
+        encoded = data.encode("utf-8", "surrogatepass")
+        parts.append(b"o%d:" % len(encoded))
+        parts.append(encoded)
+
+
+class Fingerprinter:
+    """
+    Computes and caches structural fingerprints of dict/list trees.
+
+    Fingerprints are cached per container object, and the cache keeps a
+    reference to every object it has fingerprinted, so a cache entry stays
+    valid only as long as the object is not mutated. Reuse one instance
+    across merges of read-only inputs (for example documents from a
+    ``ParseCache``) and call ``clear()`` to release the cache.
+
+    Example:
+        >>> fingerprints = Fingerprinter()
+        >>> fingerprints.hexdigest({"a": [1, 2]}) == fingerprint({"a": [1, 2]})
+        True
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        # id -> (object, digest, subtree contains a list)
+        self._cache: dict[int, tuple[Any, bytes, bool]] = {}
+        # Read-only cache consulted before computing new fingerprints
+        self._base: dict[int, tuple[Any, bytes, bool]] = {}
+
+    def _overlay(self) -> Fingerprinter:
+        """
+        Return a fingerprinter that reads this cache but stores elsewhere.
+
+        Used for short-lived trees such as intermediate and final merge
+        results, which must not accumulate in a long-lived cache.
+        """
+        overlay = Fingerprinter()
+        overlay._base = self._cache
+        return overlay
+
+    def digest(self, value: Any) -> bytes:
+        """
+        Return the binary fingerprint of a value.
+
+        Args:
+            value: Tree of dicts, lists, mappings and scalars
+
+        Returns:
+            16-byte digest
+        """
+        if _is_container(value):
+            return self._entry(value)[1]
+        parts: list[bytes] = []
+        _encode_scalar(value, parts)
+        return hashlib.blake2b(b"".join(parts), digest_size=_DIGEST_SIZE).digest()
+
+    def hexdigest(self, value: Any) -> str:
+        """Return the fingerprint of a value as a hex string."""
+        return self.digest(value).hex()
+
+    def same(self, left: Any, right: Any, lists_idempotent: bool) -> bool:
+        """
+        Check whether merging ``right`` into ``left`` would just give ``right``.
+
+        This holds when both trees are identical and either they contain no
+        lists or the list strategy returns a list merged with itself unchanged.
+
+        Args:
+            left: Left container
+            right: Right container
+            lists_idempotent: Whether the list strategy is idempotent
+        """
+        if left is right and lists_idempotent:
+            return True
+        left_entry = self._entry(left)
+        right_entry = self._entry(right)
+        return left_entry[1] == right_entry[1] and (
+            lists_idempotent or not right_entry[2]
+        )
+
+    def _entry(self, root: Any) -> tuple[Any, bytes, bool]:
+        """Fingerprint a container bottom-up with an explicit stack."""
+        cache = self._cache
+        base = self._base
+        entry = cache.get(id(root)) or base.get(id(root))
+        if entry is not None:
+            return entry
+
+        # Each frame is a container and whether its children were pushed
+        stack = [(root, False)]
+        in_progress: set[int] = set()
+        while stack:
+            node, expanded = stack.pop()
+            node_id = id(node)
+            if node_id in cache or node_id in base:
+                continue
+            is_list = type(node) is list
+            if not expanded:
+                if node_id in in_progress:
+                    raise ValueError("Cannot fingerprint a cyclic structure")
+                in_progress.add(node_id)
+                stack.append((node, True))
+                for child in node if is_list else node.values():
+                    child_id = id(child)
+                    if (
+                        _is_container(child)
+                        and child_id not in cache
+                        and child_id not in base
+                    ):
+                        stack.append((child, False))
+                continue
+
+            has_lists = is_list
+            if is_list:
+                parts = [b"L%d[" % len(node)]
+                items: Any = enumerate(node)
+            else:
+                parts = [b"D%d{" % len(node)]
+                items = node.items()
+            for key, child in items:
+                if not is_list:
+                    _encode_scalar(key, parts)
+                if _is_container(child):
+                    child_id = id(child)
+                    child_entry = cache.get(child_id) or base[child_id]
+                    parts.append(b"#")
+                    parts.append(child_entry[1])
+                    has_lists = has_lists or child_entry[2]
+                else:
+                    _encode_scalar(child, parts)
+            digest = hashlib.blake2b(b"".join(parts), digest_size=_DIGEST_SIZE).digest()
+            cache[node_id] = (node, digest, has_lists)
+            in_progress.discard(node_id)
+
+        return cache[id(root)]
+
+    def clear(self) -> None:
+        """Drop every cached fingerprint."""
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        """Number of cached container fingerprints."""
+        return len(self._cache)
+
+
+def fingerprint(value: Any) -> str:
+    """
+    Compute the structural fingerprint of a tree.
+
+    Equal trees, with keys in the same order and values of the same
+    types, get equal fingerprints, so the result can be used as a change
+    detection or cache key.
+
+    Args:
+        value: Tree of dicts, lists, mappings and scalars
+
+    Returns:
+        Hex digest
+
+    Example:
+        >>> fingerprint({"a": 1}) == fingerprint({"a": 1})
+        True
+        >>> fingerprint({"a": 1}) == fingerprint({"a": 1.0})
+        False
+    """
+    return Fingerprinter().hexdigest(value)
@@ -0,0 +1,350 @@
+"""
+Merging records that share a key, with hash partitions spilled to disk.
+
+Records are read once, in order. Up to ``max_in_memory`` of them are
+buffered; when the input ends within that, the groups are merged in
+memory in one pass. Larger inputs are hash-partitioned by key into
+temporary files, so every record of a group lands in the same partition,
+and each partition is then read back and its groups merged on their own.
+Memory use is bounded by the buffer and by the merged groups of a single
+partition (one per worker process when partitions are merged in
+parallel). Each group is folded as its records arrive: only the merged
+value so far is kept, not the records.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import pickle
+import tempfile
+from collections import deque
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Union
+
+from .conflicts import format_path
+from .dedupe import _mixed_hash
+from .limits import MergeGuard
+from .paths import Pattern, parse_path
+from .sources import PathLike
+
+if TYPE_CHECKING:
+    from .engine import IterativeEngine, RecursiveEngine
+    from .merger import Merger
+
+RecordSource = Union[PathLike, Iterable[Mapping[str, Any]]]
+GroupKey = Union[Pattern, Callable[[Mapping[str, Any]], Any]]
+
+_MISSING = object()
+
+# Largest number of entries pickled together when spilling
+_SPILL_BATCH = 1024
+
+
+def iter_ndjson(path: PathLike) -> Iterator[Any]:
+    """
+    Stream the values of a newline-delimited JSON file.
+
+    Args:
+        path: File with one JSON value per line; blank lines are skipped
+
+    Yields:
+        Decoded values, in file order
+
+    Raises:
+        ValueError: If a line is not valid JSON
+    """
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {number} of {path}: {e}") from e
+
+
+def _iter_records(records: RecordSource) -> Iterator[Mapping[str, Any]]:
+    """Iterate over the records of a file or an iterable, checking their type."""
+    if isinstance(records, (str, os.PathLike)):
+        records = iter_ndjson(records)
+    for index, record in enumerate(records):
+        if not isinstance(record, Mapping):
+            raise TypeError(f"Record {index} is not a dictionary: {type(record)}")
+        yield record
+
+
+def _key_function(key: GroupKey) -> Callable[[Mapping[str, Any], int], Any]:
+    """Resolve a key path or callable into a function of a record and its index."""
+    if callable(key):
+        return lambda record, index: key(record)
+
+    path = parse_path(key)
+    if not path:
+        raise ValueError("Group key must name at least one field")
+
+    if len(path) == 1:
+        field = path[0]
+
+        def lookup_field(record: Mapping[str, Any], index: int) -> Any:
+            value = record.get(field, _MISSING)
+            if value is _MISSING:
+                raise ValueError(f"Record {index} has no key at '{field}'")
+            return value
+
+        return lookup_field
+
+    def lookup(record: Mapping[str, Any], index: int) -> Any:
+        value: Any = record
+        for part in path:
+            if not isinstance(value, Mapping):
+                value = _MISSING
+                break
+            value = value.get(part, _MISSING)
+            if value is _MISSING:
+                break
+        if value is _MISSING:
+            raise ValueError(f"Record {index} has no key at '{format_path(path)}'")
+        return value
+
+    return lookup
+
+
+def _keyed(
+    records: RecordSource, key_of: Callable[[Mapping[str, Any], int], Any]
+) -> Iterator[tuple[Any, Mapping[str, Any]]]:
+    """Pair each record with its group key."""
+    for index, record in enumerate(_iter_records(records)):
+        group_key = key_of(record, index)
+        try:
+            hash(group_key)
+        except TypeError:
+            raise TypeError(
+                f"Record {index} has an unhashable group key: {group_key!r}"
+            ) from None
+        yield group_key, record
+
+
+def _restore_key(result: dict[str, Any], path: tuple[Any, ...], value: Any) -> None:
+    """Set the key field of a merged group, copying the mappings above it."""
+    parent = result
+    for part in path[:-1]:
+        child = dict(parent[part])
+        parent[part] = child
+        parent = child
+    parent[path[-1]] = value
+
+
+def _fold_groups(
+    merger: Merger,
+    engine: RecursiveEngine | IterativeEngine,
+    entries: Iterable[tuple[Any, Mapping[str, Any]]],
+    owned: bool,
+    key_path: tuple[Any, ...] | None = None,
+) -> dict[Any, dict[str, Any]]:
+    """
+    Merge the records of each key in order, in first-seen key order.
+
+    Records that are ``owned`` (decoded from a file or spill) start their
+    group's result without being copied. With a scalar reducer, the field
+    at ``key_path`` is set back to the first record's key value instead of
+    being reduced.
+    """
+    copy = merger._layer_copier(owned)
+    merge_pair = merger._pair_merger(engine)
+    strict = merger._strict
+    limits = merger._limits
+    # The deep engines check the right layer as they walk it
+    check_right = not merger._uses_engines()
+    groups: dict[Any, dict[str, Any]] = {}
+    for key, record in entries:
+        result: Any = groups.get(key, _MISSING)
+        if result is _MISSING:
+            if limits is not None:
+                MergeGuard(limits).check_layer(record)
+            groups[key] = copy(record)
+            continue
+        if strict:
+            merger._raise_on_conflicts((result, record))
+        if limits is not None:
+            # Each record is merged under its own limits
+            guard = MergeGuard(limits)
+            if check_right:
+                guard.check_layer(record)
+            groups[key] = merger._merge_dicts(result, record, engine, guard)
+        else:
+            groups[key] = merge_pair(result, record)
+    if key_path is not None and merger._scalar_merge() is not None:
+        for key, result in groups.items():
+            _restore_key(result, key_path, key)
+    return groups
+
+
+def _iter_spill(path: str) -> Iterator[tuple[Any, Mapping[str, Any]]]:
+    """Read back the entries of a partition file."""
+    with open(path, "rb") as f:
+        unpickler = pickle.Unpickler(f)
+        while True:
+            try:
+                batch = unpickler.load()
+            except EOFError:
+                return
+            yield from batch
+
+
+def _merge_partition(
+    merger: Merger,
+    engine: RecursiveEngine | IterativeEngine,
+    path: str,
+    key_path: tuple[Any, ...] | None,
+) -> list[tuple[Any, dict[str, Any]]]:
+    """Merge the groups of one partition file; run in worker processes."""
+    groups = _fold_groups(merger, engine, _iter_spill(path), True, key_path)
+    return list(groups.items())
+
+
+def group_merge(
+    merger: Merger,
+    records: RecordSource,
+    key: GroupKey,
+    partitions: int = 64,
+    max_in_memory: int = 100_000,
+    jobs: int = 1,
+) -> Iterator[tuple[Any, dict[str, Any]]]:
+    """
+    Merge the records sharing a key, one result per key.
+
+    Args:
+        merger: Merger whose strategies are applied to each group
+        records: Iterable of mappings, or an NDJSON file path
+        key: Key path of the field to group by (see ``flexmerge.paths``)
+            or a function of a record returning a hashable key
+        partitions: Number of hash partitions spilled to temporary files
+            for inputs larger than ``max_in_memory``
+        max_in_memory: Largest number of records grouped in memory
+            without spilling
+        jobs: Number of worker processes merging spilled partitions
+
+    Returns:
+        Iterator of keys and merged records
+
+    Raises:
+        ValueError: If partitions or jobs is less than 1, or the key path
+            is empty
+    """
+    if partitions < 1:
+        raise ValueError("partitions must be at least 1")
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1")
+    key_of = _key_function(key)
+    key_path = None if callable(key) else parse_path(key)
+
+    return _group_records(
+        merger, records, key_of, key_path, partitions, max_in_memory, jobs
+    )
+
+
+def _group_records(
+    merger: Merger,
+    records: RecordSource,
+    key_of: Callable[[Mapping[str, Any], int], Any],
+    key_path: tuple[Any, ...] | None,
+    partitions: int,
+    max_in_memory: int,
+    jobs: int,
+) -> Iterator[tuple[Any, dict[str, Any]]]:
+    """Group the records in memory, or spill them to partitions first."""
+    entries = _keyed(records, key_of)
+    buffer = []
+    for entry in entries:
+        buffer.append(entry)
+        if len(buffer) > max_in_memory:
+            break
+    if not buffer:
+        return
+
+    engine = merger._engine_for((buffer[0][1],))
+    interner = merger._interner
+    limits = merger._limits
+
+    def finish(
+        groups: Iterable[tuple[Any, dict[str, Any]]],
+    ) -> Iterator[tuple[Any, dict[str, Any]]]:
+        for group_key, result in groups:
+            if limits is not None:
+                MergeGuard(limits).check_output(result)
+            if merger._schema is not None:
+                merger._check_schema(result)
+            if interner is not None:
+                result = interner.intern(result)
+            yield group_key, result
+
+    if len(buffer) <= max_in_memory:
+        owned = isinstance(records, (str, os.PathLike))
+        groups = _fold_groups(merger, engine, buffer, owned, key_path)
+        yield from finish(groups.items())
+        return
+
+    tmp_dir = tempfile.TemporaryDirectory(prefix="flexmerge-")
+    try:
+        paths = [
+            os.path.join(tmp_dir.name, f"partition-{i}.pickle")
+            for i in range(partitions)
+        ]
+        # Entries are pickled in batches per partition, within the
+        # in-memory budget
+        batch_size = max(1, min(_SPILL_BATCH, max_in_memory // partitions))
+        batches: list[list[tuple[Any, Mapping[str, Any]]]] = [
+            [] for _ in range(partitions)
+        ]
+        files = [open(path, "wb") for path in paths]
+        try:
+            for entry in _chain_buffer(buffer, entries):
+                partition = ((_mixed_hash(entry[0]) >> 32) * partitions) >> 32
+                batch = batches[partition]
+                batch.append(entry)
+                if len(batch) >= batch_size:
+                    files[partition].write(pickle.dumps(batch, pickle.HIGHEST_PROTOCOL))
+                    batch.clear()
+            for batch, f in zip(batches, files):
+                if batch:
+                    f.write(pickle.dumps(batch, pickle.HIGHEST_PROTOCOL))
+        finally:
+            for f in files:
+                f.close()
+
+        if jobs == 1:
+            for path in paths:
+                yield from finish(_merge_partition(merger, engine, path, key_path))
+            return
+
+        # Results are interned here; the interner's lock cannot be pickled
+        worker_merger = merger.copy().interner(None)
+        # At most one partition waits for the consumer beyond those in
+        # progress, so results do not pile up in memory
+        with ProcessPoolExecutor(max_workers=min(jobs, partitions)) as executor:
+            pending: deque[Any] = deque()
+            for path in paths:
+                pending.append(
+                    executor.submit(
+                        _merge_partition, worker_merger, engine, path, key_path
+                    )
+                )
+                if len(pending) > jobs:
+                    yield from finish(pending.popleft().result())
+            while pending:
+                yield from finish(pending.popleft().result())
+    finally:
+        tmp_dir.cleanup()
+
+
+def _chain_buffer(
+    buffer: list[tuple[Any, Mapping[str, Any]]],
+    rest: Iterator[tuple[Any, Mapping[str, Any]]],
+) -> Iterator[tuple[Any, Mapping[str, Any]]]:
+    """Yield the buffered entries, releasing them, then the rest of the input."""
+    buffer.reverse()
+    while buffer:
+        yield buffer.pop()
+    yield from rest
@@ -0,0 +1,254 @@
+"""
+Interning of structurally identical subtrees in merge results.
+
+Merging many overlays onto one base produces results full of equal
+sub-dicts and lists (shared feature-flag blocks, default sections, ...),
+each a separate allocation. An ``Interner`` keeps a bounded table of
+canonical containers and copies trees so that equal subtrees share one
+object, and interns string keys with ``sys.intern``.
+
+The trees passed in are never modified or kept: canonical containers are
+copies owned by the interner. Interned trees share objects with each
+other and must be treated as read-only.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from .engine import _ATOMIC_TYPES
+
+# Marks a reference to an already interned child container in a signature
+_REF = object()
+
+
+class Interner:
+    """
+    Bounded table that makes equal dict/list subtrees share one object.
+
+    Trees are walked bottom-up: children are interned first, then each
+    container is looked up by a signature made of its scalar items and the
+    identities of its (already canonical) child containers. Containers with
+    leaves other than built-in immutable scalars are left as they are.
+
+    The table holds at most ``max_entries`` containers and evicts the least
+    recently used one beyond that; dicts and lists cannot be weakly
+    referenced, so the bound is what keeps it from growing without limit.
+
+    Example:
+        >>> interner = Interner()
+        >>> a = interner.intern({"flags": {"beta": True}})
+        >>> b = interner.intern({"flags": {"beta": True}, "x": 1})
+        >>> a["flags"] is b["flags"]
+        True
+    """
+
+    def __init__(self, max_entries: int = 65536, intern_keys: bool = True) -> None:
+        """
+        Initialize the interner.
+
+        Args:
+            max_entries: Maximum number of canonical containers kept
+            intern_keys: Also intern string keys of canonical dicts
+
+        Raises:
+            ValueError: If max_entries is less than 1
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.intern_keys = intern_keys
+        self.hits = 0
+        self.misses = 0
+        self.saved_bytes = 0
+        self._table: OrderedDict[tuple[Any, ...], Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def intern(self, value: Any) -> Any:
+        """
+        Copy a tree so that equal subtrees share canonical objects.
+
+        The tree is left as it is and the result shares no containers
+        with it, except for containers on a reference cycle, which are
+        returned unchanged.
+
+        Args:
+            value: Tree of dicts, lists and scalars
+
+        Returns:
+            Interned tree
+        """
+        if type(value) is not dict and type(value) is not list:
+            return value
+
+        with self._lock:
+            return self._intern_tree(value)
+
+    def _intern_tree(self, root: Any) -> Any:
+        """Intern a tree bottom-up with an explicit stack."""
+        # id -> canonical replacement for containers finished in this pass
+        done: dict[int, Any] = {}
+        # Containers on a reference cycle are left as they are
+        cyclic: set[int] = set()
+        active = {id(root)}
+        # Entries are (container, iterator over its values)
+        stack: list[tuple[Any, Any]] = [(root, _values(root))]
+
+        while stack:
+            node, items = stack[-1]
+            for child in items:
+                child_type = type(child)
+                if child_type is not dict and child_type is not list:
+                    continue
+                child_id = id(child)
+                if child_id in done:
+                    continue
+                if child_id in active:
+                    cyclic.update(active)
+                else:
+                    active.add(child_id)
+                    stack.append((child, _values(child)))
+                    break
+            else:
+                stack.pop()
+                node_id = id(node)
+                active.discard(node_id)
+                if node_id in cyclic:
+                    done[node_id] = node
+                else:
+                    done[node_id] = self._canonical(_rebuild(node, done))
+
+        return done[id(root)]
+
+    def _canonical(self, node: Any) -> Any:
+        """Return the canonical container equal to ``node``, a copy of our own."""
+        signature = _signature(node)
+        if signature is None:
+            return node
+
+        table = self._table
+        canonical = table.get(signature)
+        if canonical is not None:
+            table.move_to_end(signature)
+            self.hits += 1
+            self.saved_bytes += sys.getsizeof(node)
+            return canonical
+
+        self.misses += 1
+        if self.intern_keys and type(node) is dict:
+            node = self._intern_keys(node)
+        table[signature] = node
+        if len(table) > self.max_entries:
+            table.popitem(last=False)
+        return node
+
+    def _intern_keys(self, node: dict[Any, Any]) -> dict[Any, Any]:
+        """Return ``node`` with its string keys interned."""
+        interned = {}
+        replaced = False
+        for key, item in node.items():
+            if type(key) is str:
+                canonical_key = sys.intern(key)
+                if canonical_key is not key:
+                    replaced = True
+                    self.saved_bytes += sys.getsizeof(key)
+                key = canonical_key
+            interned[key] = item
+        return interned if replaced else node
+
+    def clear(self) -> None:
+        """Drop every canonical container and reset the statistics."""
+        with self._lock:
+            self._table.clear()
+            self.hits = 0
+            self.misses = 0
+            self.saved_bytes = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """
+        Interning statistics.
+
+        ``saved_bytes`` estimates the memory released by dropping duplicate
+        containers and key strings (their shallow ``sys.getsizeof`` size),
+        assuming nothing else refers to them.
+        """
+        return {
+            "entries": len(self._table),
+            "hits": self.hits,
+            "misses": self.misses,
+            "saved_bytes": self.saved_bytes,
+        }
+
+    def __len__(self) -> int:
+        """Number of canonical containers in the table."""
+        return len(self._table)
+
+
+def _values(node: Any) -> Any:
+    """Iterate over the values of a dict or the items of a list."""
+    return iter(node.values()) if type(node) is dict else iter(node)
+
+
+def _rebuild(node: Any, done: dict[int, Any]) -> Any:
+    """Copy a container with its child containers replaced from ``done``."""
+    if type(node) is dict:
+        return {
+            key: done[id(item)] if type(item) is dict or type(item) is list else item
+            for key, item in node.items()
+        }
+    return [
+        done[id(item)] if type(item) is dict or type(item) is list else item
+        for item in node
+    ]
+
+
+def _signature(node: Any) -> tuple[Any, ...] | None:
+    """
+    Build a hashable signature of a container whose children are canonical.
+
+    Keys and scalars are tagged with their type so that ``1``, ``1.0`` and
+    ``True`` stay distinct. Returns None if the container holds a leaf that
+    is not a built-in immutable scalar.
+    """
+    parts: list[Any] = [type(node)]
+    append = parts.append
+    if type(node) is dict:
+        for key, item in node.items():
+            key_type = type(key)
+            if key_type not in _ATOMIC_TYPES:
+                return None
+            append(key_type)
+            append(key)
+            item_type = type(item)
+            if item_type is dict or item_type is list:
+                append(_REF)
+                append(id(item))
+            elif item_type is float:
+                # hex() keeps -0.0 apart from 0.0 and makes NaNs comparable
+                append(float)
+                append(item.hex())
+            elif item_type in _ATOMIC_TYPES:
+                append(item_type)
+                append(item)
+            else:
+                return None
+    else:
+        for item in node:
+            item_type = type(item)
+            if item_type is dict or item_type is list:
+                append(_REF)
+                append(id(item))
+            elif item_type is float:
+                # hex() keeps -0.0 apart from 0.0 and makes NaNs comparable
+                append(float)
+                append(item.hex())
+            elif item_type in _ATOMIC_TYPES:
+                append(item_type)
+                append(item)
+            else:
+                return None
+    return tuple(parts)
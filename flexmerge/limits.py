@@ -0,0 +1,208 @@
+"""
+Resource limits for merges of untrusted input.
+
+A ``MergeGuard`` tracks one merge call against a set of ``MergeLimits``:
+the nodes visited, the length of lists, the nesting depth, the size of the
+result and the elapsed time. The engines call it as they walk the layers,
+so a merge stops as soon as it exceeds a limit instead of after the work
+is done, and the error names the path where it happened. Each check is a
+counter update and a comparison; the clock is read every
+``_CLOCK_INTERVAL`` nodes and after each list merge.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any, NamedTuple
+
+from .conflicts import format_path
+from .engine import _ATOMIC_TYPES
+
+_CLOCK_INTERVAL = 1024
+_UNLIMITED = float("inf")
+
+
+class MergeLimits(NamedTuple):
+    """
+    Budgets for one merge call; None leaves a budget unlimited.
+
+    Attributes:
+        max_nodes: Values visited, counting every key the merge walks,
+            every value of a subtree it takes from a layer and every item
+            handed to the list strategy
+        max_list_length: Length of any list, in the layers or in the
+            result, and combined length of two lists merged together
+        max_depth: Nesting level of any mapping or list, counted like
+            ``MergeEstimate.depth`` (1 for flat layers)
+        max_output_nodes: Values in the result
+        timeout: Wall-clock seconds the merge may take
+    """
+
+    max_nodes: int | None = None
+    max_list_length: int | None = None
+    max_depth: int | None = None
+    max_output_nodes: int | None = None
+    timeout: float | None = None
+
+
+class MergeLimitError(ValueError):
+    """Raised when a merge exceeds one of its resource limits."""
+
+    def __init__(self, limit: str, maximum: float, path: Sequence[Any]) -> None:
+        """
+        Initialize the error.
+
+        Args:
+            limit: Name of the exceeded ``MergeLimits`` field
+            maximum: Configured value of the limit
+            path: Key path at which the limit was exceeded
+        """
+        self.limit = limit
+        self.maximum = maximum
+        self.path = tuple(path)
+        where = f"'{format_path(self.path)}'" if self.path else "the top level"
+        super().__init__(f"Merge exceeded {limit}={maximum} at {where}")
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickle from the fields, so the error survives worker processes."""
+        return (type(self), (self.limit, self.maximum, self.path))
+
+
+class MergeGuard:
+    """Running counters of one merge call, checked against its limits."""
+
+    __slots__ = (
+        "limits",
+        "nodes",
+        "_max_nodes",
+        "_max_list_length",
+        "_max_depth",
+        "_timeout",
+        "_deadline",
+        "_next_clock",
+    )
+
+    def __init__(self, limits: MergeLimits) -> None:
+        """
+        Start tracking a merge; the clock starts now.
+
+        Args:
+            limits: Budgets to enforce
+        """
+        self.limits = limits
+        self.nodes = 0
+        self._max_nodes = _UNLIMITED if limits.max_nodes is None else limits.max_nodes
+        self._max_list_length = (
+            _UNLIMITED if limits.max_list_length is None else limits.max_list_length
+        )
+        self._max_depth = _UNLIMITED if limits.max_depth is None else limits.max_depth
+        self._timeout = _UNLIMITED if limits.timeout is None else limits.timeout
+        if limits.timeout is None:
+            self._deadline = self._next_clock = _UNLIMITED
+        else:
+            self._deadline = time.monotonic() + limits.timeout
+            self._next_clock = _CLOCK_INTERVAL
+
+    def visit(self, path: tuple[Any, ...], key: Any, count: int = 1) -> None:
+        """Count nodes visited at ``path + (key,)``."""
+        self.nodes += count
+        if self.nodes > self._max_nodes:
+            raise MergeLimitError("max_nodes", self._max_nodes, path + (key,))
+        if self.nodes >= self._next_clock:
+            self._next_clock = self.nodes + _CLOCK_INTERVAL
+            self.check_clock(path + (key,))
+
+    def check_clock(self, path: tuple[Any, ...]) -> None:
+        """Raise if the merge has run out of time."""
+        if time.monotonic() > self._deadline:
+            raise MergeLimitError("timeout", self._timeout, path)
+
+    def enter(self, path: tuple[Any, ...], key: Any) -> None:
+        """Check the depth of a container the merge descends into."""
+        if len(path) + 2 > self._max_depth:
+            raise MergeLimitError("max_depth", self._max_depth, path + (key,))
+
+    def check_lists(
+        self, left: list[Any], right: list[Any], path: tuple[Any, ...], key: Any
+    ) -> None:
+        """Check two lists before the list strategy merges them."""
+        self.check_value(right, path, key)
+        length = len(left) + len(right)
+        if length > self._max_list_length:
+            raise MergeLimitError(
+                "max_list_length", self._max_list_length, path + (key,)
+            )
+        # The strategy reads the left items again
+        self.visit(path, key, len(left))
+
+    def check_merged_list(
+        self, merged: list[Any], path: tuple[Any, ...], key: Any
+    ) -> None:
+        """Check the list returned by the list strategy."""
+        if len(merged) > self._max_list_length:
+            raise MergeLimitError(
+                "max_list_length", self._max_list_length, path + (key,)
+            )
+        self.check_clock(path + (key,))
+
+    def check_layer(self, layer: Mapping[str, Any]) -> None:
+        """Walk a whole layer, counting and checking its nodes."""
+        self._walk(layer, ())
+
+    def check_value(self, value: Any, path: tuple[Any, ...], key: Any) -> None:
+        """Walk a value the merge takes from a layer without merging it."""
+        if type(value) in _ATOMIC_TYPES or not isinstance(value, (Mapping, list)):
+            return
+        self.enter(path, key)
+        self._walk(value, path + (key,))
+
+    def check_output(self, result: Mapping[str, Any]) -> None:
+        """Count the values of the result, stopping at the limit."""
+        maximum = self.limits.max_output_nodes
+        if maximum is None:
+            return
+        count = 0
+        seen: set[int] = set()
+        stack: list[tuple[Any, tuple[Any, ...]]] = [(result, ())]
+        while stack:
+            node, path = stack.pop()
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            items = node.items() if isinstance(node, Mapping) else enumerate(node)
+            for key, child in items:
+                count += 1
+                if count > maximum:
+                    raise MergeLimitError("max_output_nodes", maximum, path + (key,))
+                if type(child) not in _ATOMIC_TYPES and isinstance(
+                    child, (Mapping, list)
+                ):
+                    stack.append((child, path + (key,)))
+
+    def _walk(self, value: Any, path: tuple[Any, ...]) -> None:
+        """Count and check the nodes below a container at ``path``."""
+        # Shared and cyclic subtrees are walked once
+        seen: set[int] = set()
+        stack = [(value, path)]
+        while stack:
+            node, node_path = stack.pop()
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            items: Iterable[tuple[Any, Any]]
+            if isinstance(node, Mapping):
+                items = node.items()
+            else:
+                if len(node) > self._max_list_length:
+                    raise MergeLimitError(
+                        "max_list_length", self._max_list_length, node_path
+                    )
+                items = enumerate(node)
+            for key, child in items:
+                self.visit(node_path, key)
+                if type(child) not in _ATOMIC_TYPES and isinstance(
+                    child, (Mapping, list)
+                ):
+                    self.enter(node_path, key)
+                    stack.append((child, node_path + (key,)))
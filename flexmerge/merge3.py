@@ -0,0 +1,135 @@
+"""
+Three-way merge of a common base with two independently edited versions.
+
+Each side is compared with the base to tell deliberate edits from values
+that were simply left alone. Subtrees that are the same object as, or
+equal to, the base on either side are resolved without being walked, so
+the cost grows with the size of the changes rather than the documents.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from itertools import chain
+from typing import TYPE_CHECKING, Any
+
+from .conflicts import Conflict, MergeConflictError
+from .engine import _MISSING
+from .strategies import BUILTIN_DICT_STRATEGIES
+
+if TYPE_CHECKING:
+    from .merger import Merger
+
+ON_CONFLICT_CHOICES = ("raise", "ours", "theirs")
+
+# Layer numbers reported in conflicts: base is 0
+_OURS, _THEIRS = 1, 2
+
+# Base, ours, theirs, result dict to fill and path of one level
+_Frame = tuple[
+    Mapping[str, Any],
+    Mapping[str, Any],
+    Mapping[str, Any],
+    dict[str, Any],
+    tuple[Any, ...],
+]
+
+
+class _Deleted:
+    """Marker for a key that one side deleted."""
+
+    def __repr__(self) -> str:
+        return "<deleted>"
+
+
+# Reported as the value of a side that deleted a key in a conflict
+DELETED = _Deleted()
+
+
+def merge3(
+    merger: Merger,
+    base: Mapping[str, Any],
+    ours: Mapping[str, Any],
+    theirs: Mapping[str, Any],
+    on_conflict: str = "raise",
+) -> dict[str, Any]:
+    """
+    Merge the changes from ``base`` to ``ours`` and ``theirs``.
+
+    See ``Merger.merge3``.
+    """
+    if on_conflict not in ON_CONFLICT_CHOICES:
+        raise ValueError(f"Unknown conflict policy: {on_conflict}")
+
+    deep = merger._dict_strategy == BUILTIN_DICT_STRATEGIES["deep"]
+    merge_pair = merger._pair_merger()
+    list_strategy = merger._list_strategy
+    # Context-aware strategies are given the path of the values they merge
+    root = merger._context_root() if merger._takes_context() else None
+    conflicts: list[Conflict] = []
+
+    result: dict[str, Any] = {}
+    stack: list[_Frame] = [(base, ours, theirs, result, ())]
+
+    while stack:
+        base_map, ours_map, theirs_map, target, path = stack.pop()
+        keys = chain(ours_map, (key for key in theirs_map if key not in ours_map))
+        for key in keys:
+            base_value = base_map.get(key, _MISSING)
+            ours_value = ours_map.get(key, _MISSING)
+            theirs_value = theirs_map.get(key, _MISSING)
+
+            # Unchanged on one side (or the same on both): take the other
+            if ours_value is theirs_value or _unchanged(theirs_value, base_value):
+                value = ours_value
+            elif _unchanged(ours_value, base_value):
+                value = theirs_value
+            elif ours_value == theirs_value:
+                value = ours_value
+
+            # Changed on both sides
+            elif isinstance(ours_value, Mapping) and isinstance(theirs_value, Mapping):
+                if deep:
+                    child: dict[str, Any] = {}
+                    if not isinstance(base_value, Mapping):
+                        # Added or retyped on both sides: diff against nothing
+                        base_value = {}
+                    stack.append(
+                        (base_value, ours_value, theirs_value, child, path + (key,))
+                    )
+                    value = child
+                elif root is not None:
+                    value = root.at(path + (key,)).merge_dicts(ours_value, theirs_value)
+                else:
+                    value = merge_pair(ours_value, theirs_value)
+            elif isinstance(ours_value, list) and isinstance(theirs_value, list):
+                if root is not None:
+                    value = root.at(path + (key,)).merge_lists(ours_value, theirs_value)
+                else:
+                    value = list_strategy(ours_value, theirs_value)
+            else:
+                conflicts.append(
+                    Conflict(
+                        path + (key,),
+                        (_OURS, _THEIRS),
+                        DELETED if ours_value is _MISSING else ours_value,
+                        DELETED if theirs_value is _MISSING else theirs_value,
+                    )
+                )
+                value = ours_value if on_conflict == "ours" else theirs_value
+
+            if value is not _MISSING:
+                target[key] = value
+
+    if conflicts and on_conflict == "raise":
+        raise MergeConflictError(conflicts)
+    return result
+
+
+def _unchanged(value: Any, base_value: Any) -> bool:
+    """Check whether a side left a value as it was in the base."""
+    if value is base_value:
+        return True
+    if value is _MISSING or base_value is _MISSING:
+        return False
+    return bool(value == base_value)
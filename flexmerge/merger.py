@@ -4,18 +4,50 @@ Merger class for combining dictionaries with customizable strategies.
 
 from __future__ import annotations
 
-from copy import deepcopy
-from typing import Any, Callable
-
+import os
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from itertools import chain
+from typing import IO, Any, Callable
+
+from .conflicts import Conflict, MergeConflictError, find_conflicts
+from .context import MergeContext, accepts_context
+from .engine import (
+    BUILTIN_ENGINES,
+    BuiltinEngines,
+    IterativeEngine,
+    RecursiveEngine,
+    ScalarMerge,
+    _lift_scalars,
+    _list_lifter,
+    _materialize,
+)
+from .explain import MergeEstimate, choose_engine, estimate
+from .external import ExternalSource, merge_external
+from .fingerprint import Fingerprinter
+from .group import GroupKey, RecordSource, group_merge
+from .intern import Interner
+from .limits import MergeGuard, MergeLimits
+from .merge3 import merge3
+from .objects import T, merge_objects
+from .paths import PathTrie, Pattern, compile_patterns, project
+from .schema import Schema, SchemaError
+from .snapshot import SnapshotError, load_snapshot, save_snapshot
+from .sources import DEFAULT_PARSE_CACHE, EnvSource, ParseCache, PathLike
 from .strategies import (
     BUILTIN_DICT_STRATEGIES,
     BUILTIN_LIST_STRATEGIES,
+    BUILTIN_SCALAR_STRATEGIES,
     BuiltinDictStrategies,
     BuiltinListStrategies,
+    BuiltinScalarStrategies,
+    ContextStrategy,
     DictStrategy,
+    KeyedListStrategy,
     ListStrategy,
-    _deep_merge_dicts_with_strategy,
+    ScalarStrategy,
+    SortedListStrategy,
 )
+from .stream import merge_to_stream
 
 
 class Merger:
@@ -39,8 +71,18 @@ class Merger:
         """Initialize merger with default strategies."""
         self._list_strategy: ListStrategy = BUILTIN_LIST_STRATEGIES["append"]
         self._dict_strategy: DictStrategy = BUILTIN_DICT_STRATEGIES["deep"]
+        self._scalar_strategy: ScalarStrategy = BUILTIN_SCALAR_STRATEGIES["replace"]
         self._custom_list_strategies: dict[str, ListStrategy] = {}
         self._custom_dict_strategies: dict[str, DictStrategy] = {}
+        self._engine: RecursiveEngine | IterativeEngine = BUILTIN_ENGINES[
+            BuiltinEngines.ITERATIVE.value
+        ]
+        self._auto_engine = False
+        self._interner: Interner | None = None
+        self._strict = False
+        self._fail_fast = False
+        self._limits: MergeLimits | None = None
+        self._schema: Schema | None = None
 
     def lists(self, strategy: str | ListStrategy | BuiltinListStrategies) -> Merger:
         """
@@ -59,10 +101,11 @@ class Merger:
             strategy = strategy.value
 
         if isinstance(strategy, str):
-            if strategy in BUILTIN_LIST_STRATEGIES:
-                self._list_strategy = BUILTIN_LIST_STRATEGIES[strategy]
-            elif strategy in self._custom_list_strategies:
+            # Registered custom strategies take precedence over built-ins
+            if strategy in self._custom_list_strategies:
                 self._list_strategy = self._custom_list_strategies[strategy]
+            elif strategy in BUILTIN_LIST_STRATEGIES:
+                self._list_strategy = BUILTIN_LIST_STRATEGIES[strategy]
             else:
                 raise ValueError(f"Unknown list strategy: {strategy}")
         else:
@@ -88,10 +131,11 @@ class Merger:
             strategy = strategy.value
 
         if isinstance(strategy, str):
-            if strategy in BUILTIN_DICT_STRATEGIES:
-                self._dict_strategy = BUILTIN_DICT_STRATEGIES[strategy]
-            elif strategy in self._custom_dict_strategies:
+            # Registered custom strategies take precedence over built-ins
+            if strategy in self._custom_dict_strategies:
                 self._dict_strategy = self._custom_dict_strategies[strategy]
+            elif strategy in BUILTIN_DICT_STRATEGIES:
+                self._dict_strategy = BUILTIN_DICT_STRATEGIES[strategy]
             else:
                 raise ValueError(f"Unknown dict strategy: {strategy}")
         else:
@@ -100,12 +144,241 @@ class Merger:
 
         return self
 
-    def list_strategy(self, name: str) -> Callable[[ListStrategy], ListStrategy]:
+    def scalars(
+        self, strategy: str | ScalarStrategy | BuiltinScalarStrategies
+    ) -> Merger:
+        """
+        Set the strategy for two scalar values set at the same path.
+
+        By default the right-hand value replaces the left one. Reducers
+        combine the values instead, during the same walk as the deep merge,
+        so metric dicts can be aggregated in a single pass: ``"sum"``,
+        ``"min"`` and ``"max"`` (None counts as missing),
+        ``"first_non_null"``, ``"last_non_null"``, and ``"count"``, which
+        replaces every scalar with the number of layers that set it.
+
+        The scalar strategy applies wherever nested dicts are deep merged:
+        with the ``"deep"`` dict strategy and inside ``ctx.recurse`` of
+        context-aware strategies. Values that are not both scalars (dicts,
+        lists or a mix) follow the usual rules.
+
+        Args:
+            strategy: Built-in strategy name or a function taking
+                ``(left, right)`` and returning the merged value
+
+        Returns:
+            Self for method chaining
+
+        Raises:
+            ValueError: If strategy is not found
+
+        Example:
+            >>> Merger().scalars("sum").merge(
+            ...     {"requests": {"ok": 10, "failed": 1}},
+            ...     {"requests": {"ok": 5, "failed": 2}},
+            ... )
+            {'requests': {'ok': 15, 'failed': 3}}
+        """
+        if isinstance(strategy, BuiltinScalarStrategies):
+            strategy = strategy.value
+
+        if isinstance(strategy, str):
+            if strategy not in BUILTIN_SCALAR_STRATEGIES:
+                raise ValueError(f"Unknown scalar strategy: {strategy}")
+            self._scalar_strategy = BUILTIN_SCALAR_STRATEGIES[strategy]
+        else:
+            # Assume it's a callable strategy
+            self._scalar_strategy = strategy
+
+        return self
+
+    def engine(self, engine: str | BuiltinEngines) -> Merger:
+        """
+        Set the engine that performs deep merges.
+
+        The default ``"iterative"`` engine uses an explicit stack and has no
+        depth limit. ``"union"`` works the same way but merges levels whose
+        right-hand values are all scalars with a single ``dict.update``,
+        which is faster for flat and leaf-heavy trees. ``"recursive"``
+        recurses once per nesting level and is kept as a reference
+        implementation.
+
+        ``"auto"`` picks an engine for every merge from a cheap sample of
+        its inputs (see ``explain``). Where the inputs are not known up
+        front (``merge_external``, ``merge_objects``, three-way merges) the
+        iterative engine is used.
+
+        Args:
+            engine: Built-in engine name or enum value
+
+        Returns:
+            Self for method chaining
+
+        Raises:
+            ValueError: If engine is not found
+        """
+        if isinstance(engine, BuiltinEngines):
+            engine = engine.value
+
+        self._auto_engine = engine == BuiltinEngines.AUTO.value
+        if self._auto_engine:
+            engine = BuiltinEngines.ITERATIVE.value
+        elif engine not in BUILTIN_ENGINES:
+            raise ValueError(f"Unknown engine: {engine}")
+        self._engine = BUILTIN_ENGINES[engine]
+
+        return self
+
+    def interner(self, interner: Interner | None) -> Merger:
+        """
+        Intern every merge result through a shared table.
+
+        Equal dict/list subtrees of the results (for example the same
+        feature-flag block in thousands of tenant configurations) then share
+        one object and string keys are interned. Interned results share
+        objects with each other and must be treated as read-only.
+
+        Args:
+            interner: Interner to use, or None to stop interning
+
+        Returns:
+            Self for method chaining
+
+        Example:
+            >>> interner = Interner(max_entries=10_000)
+            >>> merger = Merger().interner(interner)
+            >>> configs = [merger.merge(base, overlay) for overlay in overlays]
+            >>> interner.stats["saved_bytes"]
+        """
+        self._interner = interner
+
+        return self
+
+    def strict(self, enabled: bool = True, fail_fast: bool = False) -> Merger:
+        """
+        Reject merges in which layers set the same value differently.
+
+        In strict mode every merge first checks all pairs of layers for
+        paths set to different values that would otherwise be silently
+        overridden, and raises ``MergeConflictError`` listing them. Nested
+        dicts are only descended into with the ``"deep"`` dict strategy, and
+        lists only count as conflicting with the ``"replace"`` and
+        ``"keep"`` list strategies, which drop one side.
+
+        Args:
+            enabled: Turn strict mode on or off
+            fail_fast: Stop checking at the first conflict
+
+        Returns:
+            Self for method chaining
+
+        Example:
+            >>> Merger().strict().merge({"port": 80}, {"port": 443})
+            Traceback (most recent call last):
+            ...
+            flexmerge.conflicts.MergeConflictError: Conflicting values at 'port' ...
+        """
+        self._strict = enabled
+        self._fail_fast = fail_fast
+
+        return self
+
+    def limits(
+        self,
+        max_nodes: int | None = None,
+        max_list_length: int | None = None,
+        max_depth: int | None = None,
+        max_output_nodes: int | None = None,
+        timeout: float | None = None,
+    ) -> Merger:
+        """
+        Bound the work of every merge, for inputs that cannot be trusted.
+
+        Merges that exceed a limit stop as soon as the engine reaches it and
+        raise ``MergeLimitError`` naming the limit and the path where it was
+        exceeded. Checking is cheap, but limited merges walk the values they
+        take from each layer, which unlimited merges share without looking
+        at them. Calling without arguments removes all limits. Limits apply
+        to ``merge``, ``merge_fingerprinted`` and ``merge_many``; ``merge``
+        also takes limits per call.
+
+        With the ``"deep"`` dict strategy limits are checked as the engine
+        walks the layers; with other dict strategies each layer is checked
+        before it is merged.
+
+        Args:
+            max_nodes: Values visited, including every item of merged lists
+            max_list_length: Length of any list, and combined length of two
+                lists merged together
+            max_depth: Nesting level of any mapping or list (1 for flat
+                layers)
+            max_output_nodes: Values in the result
+            timeout: Wall-clock seconds per merge
+
+        Returns:
+            Self for method chaining
+
+        Example:
+            >>> merger = Merger().lists("unique").limits(max_list_length=10_000)
+            >>> merger.merge(base, {"tags": [{"n": i} for i in range(10**6)]})
+            Traceback (most recent call last):
+            ...
+            flexmerge.limits.MergeLimitError: Merge exceeded max_list_length=...
+        """
+        limits = MergeLimits(
+            max_nodes, max_list_length, max_depth, max_output_nodes, timeout
+        )
+        self._limits = None if limits == MergeLimits() else limits
+
+        return self
+
+    def schema(self, schema: Schema | Mapping[Pattern, Any] | None) -> Merger:
+        """
+        Validate every merge result against a schema.
+
+        The schema is compiled once into a trie of its path patterns and
+        each result is checked by following the trie, so only the paths
+        the schema names are visited rather than the whole result. A result
+        with violations raises ``SchemaError`` listing all of them with
+        their paths. Schemas apply to ``merge`` (and so ``merge_files``),
+        ``merge3``, ``merge_fingerprinted``, ``merge_many`` and
+        ``merge_fanout``.
+
+        Args:
+            schema: Compiled schema, rules to compile (see ``Schema``), or
+                None to stop validating
+
+        Returns:
+            Self for method chaining
+
+        Raises:
+            ValueError: If a rule has an unknown key
+
+        Example:
+            >>> merger = Merger().schema({
+            ...     "database": {"type": dict, "required": ["host"]},
+            ...     "database.port": int,
+            ... })
+            >>> merger.merge({"database": {"host": "db"}}, {"database": {"port": "x"}})
+            Traceback (most recent call last):
+            ...
+            flexmerge.schema.SchemaError: Schema violation at 'database.port': ...
+        """
+        if schema is not None and not isinstance(schema, Schema):
+            schema = Schema(schema)
+        self._schema = schema
+
+        return self
+
+    def list_strategy(
+        self, name: str, context: bool = False
+    ) -> Callable[[ListStrategy], ListStrategy]:
         """
         Decorator for registering custom list strategies.
 
         Args:
             name: Name of the custom list strategy
+            context: Register a v2 strategy taking ``(left, right, ctx)``
 
         Returns:
             Decorator function
@@ -118,17 +391,28 @@ class Merger:
         """
 
         def decorator(func: ListStrategy) -> ListStrategy:
-            self._custom_list_strategies[name] = func
-            return func
+            strategy = ContextStrategy(func) if context else func
+            self._custom_list_strategies[name] = strategy
+            return strategy
 
         return decorator
 
-    def dict_strategy(self, name: str) -> Callable[[DictStrategy], DictStrategy]:
+    def dict_strategy(
+        self, name: str, context: bool = False
+    ) -> Callable[[DictStrategy], DictStrategy]:
         """
         Decorator for registering custom dictionary strategies.
 
+        A plain (v1) strategy takes ``(left, right)`` and replaces the whole
+        deep merge. With ``context=True`` the strategy takes
+        ``(left, right, ctx)`` and is called for every pair of nested
+        mappings in a single walk; ``ctx.path`` and ``ctx.depth`` tell where
+        it is, and ``ctx.recurse(left, right)`` merges the pair with the
+        default rules, handing nested mappings back to the strategy.
+
         Args:
             name: Name of the custom dictionary strategy
+            context: Register a v2 strategy taking ``(left, right, ctx)``
 
         Returns:
             Decorator function
@@ -138,51 +422,923 @@ class Merger:
             >>> @merger.dict_strategy("custom_merge")
             ... def custom_dict_merge(left, right):
             ...     return {**left, **right}
+
+            >>> @merger.dict_strategy("protect_secrets", context=True)
+            ... def protect_secrets(left, right, ctx):
+            ...     if ctx.path[-1:] == ("secrets",):
+            ...         return left
+            ...     return ctx.recurse(left, right)
         """
 
         def decorator(func: DictStrategy) -> DictStrategy:
-            self._custom_dict_strategies[name] = func
-            return func
+            strategy = ContextStrategy(func) if context else func
+            self._custom_dict_strategies[name] = strategy
+            return strategy
 
         return decorator
 
-    def merge(self, *dicts: dict[str, Any]) -> dict[str, Any]:
+    def merge(
+        self,
+        *dicts: Mapping[str, Any],
+        limits: MergeLimits | None = None,
+        include: Pattern | Iterable[Pattern] | PathTrie | None = None,
+        exclude: Pattern | Iterable[Pattern] | PathTrie | None = None,
+    ) -> dict[str, Any]:
         """
         Merge multiple dictionaries using configured strategies.
 
+        Any ``collections.abc.Mapping`` (``MappingProxyType``, ``ChainMap``,
+        lazily decoded mappings, ...) is accepted and read in place; only the
+        levels written by the merge are materialized into the result.
+
+        With ``include`` or ``exclude``, only the selected key paths of the
+        layers are copied and merged (see ``flexmerge.paths.project``).
+        The patterns are compiled into a trie that is followed into the
+        layers, so unselected subtrees are never walked and the cost
+        depends on the size of the selection. Patterns are dotted key
+        paths in which ``"*"`` matches any key, for example
+        ``["database", "services.*.port"]``.
+
         Args:
-            *dicts: Dictionaries to merge
+            *dicts: Dictionaries or other mappings to merge
+            limits: Resource limits for this call, replacing those set with
+                ``limits()``
+            include: Paths to merge, selecting the whole subtree below
+                them; None merges everything
+            exclude: Paths to leave out, taking precedence over include
 
         Returns:
             Merged dictionary
 
         Raises:
             TypeError: If any argument is not a dictionary
+            MergeConflictError: In strict mode, if layers set a value differently
+            MergeLimitError: If the merge exceeds a resource limit
+            SchemaError: If the result violates the schema
         """
         if not dicts:
             return {}
 
-        # Validate all arguments are dictionaries
+        # Validate all arguments are mappings
+        for i, d in enumerate(dicts):
+            if not isinstance(d, Mapping):
+                raise TypeError(f"Argument {i} is not a dictionary: {type(d)}")
+
+        if include is not None or exclude is not None:
+            include_trie = None if include is None else compile_patterns(include)
+            exclude_trie = None if exclude is None else compile_patterns(exclude)
+            dicts = tuple(project(d, include_trie, exclude_trie) for d in dicts)
+
+        if self._strict:
+            self._raise_on_conflicts(dicts)
+
+        engine = self._engine_for(dicts)
+        if limits is None:
+            limits = self._limits
+        result: dict[str, Any]
+        if limits is not None:
+            result = self._merge_limited(dicts, engine, limits)
+        else:
+            result = self._layer_copier()(dicts[0])
+            for dict_to_merge in dicts[1:]:
+                result = self._merge_dicts(result, dict_to_merge, engine)
+
+        if self._schema is not None:
+            self._check_schema(result)
+        if self._interner is not None:
+            result = self._interner.intern(result)
+        return result
+
+    def merge_to_stream(
+        self,
+        fp: IO[Any],
+        *dicts: Mapping[str, Any],
+        indent: int | str | None = None,
+        sort_keys: bool = False,
+    ) -> None:
+        """
+        Merge dictionaries and write the result to a stream as JSON.
+
+        The result is never built: the layers are walked together level by
+        level, in the key order ``merge`` gives, and every value is written
+        as soon as it is resolved, so only the levels on the current path
+        are held in memory on top of the inputs. Nested mappings are merged
+        member by member as they are written; lists and scalars set by
+        several layers are combined with the list and scalar strategies.
+        Output is collected into chunks of about 64 KiB before each write.
+        The output equals ``json.dump(merger.merge(*dicts), fp, ...)``.
+
+        Only the ``"deep"`` and ``"shallow"`` dict strategies can be
+        streamed. Strict mode applies; schemas, resource limits and
+        interning do not, since there is no result to check.
+
+        Args:
+            fp: Text stream, or binary stream receiving UTF-8
+            *dicts: Dictionaries or other mappings to merge
+            indent: Indentation as for ``json.dump``
+            sort_keys: Write the keys of every object in sorted order
+
+        Raises:
+            TypeError: If any argument is not a dictionary, or the result
+                cannot be encoded as JSON
+            ValueError: If the dict strategy cannot be streamed
+            MergeConflictError: In strict mode, if layers set a value differently
+
+        Example:
+            >>> with open("merged.json", "wb") as f:
+            ...     Merger().merge_to_stream(f, base, overlay, indent=2)
+        """
         for i, d in enumerate(dicts):
-            if not isinstance(d, dict):
+            if not isinstance(d, Mapping):
                 raise TypeError(f"Argument {i} is not a dictionary: {type(d)}")
 
-        result = deepcopy(dicts[0])
+        if self._strict:
+            self._raise_on_conflicts(dicts)
+
+        merge_to_stream(self, fp, dicts or ({},), indent, sort_keys)
+
+    def merge3(
+        self,
+        base: Mapping[str, Any],
+        ours: Mapping[str, Any],
+        theirs: Mapping[str, Any],
+        on_conflict: str = "raise",
+    ) -> dict[str, Any]:
+        """
+        Three-way merge two versions edited independently from a common base.
+
+        A value changed on only one side is taken from that side, and a key
+        deleted on one side and left unchanged on the other is dropped. Only
+        paths changed on both sides are merged: nested dicts key by key (with
+        the ``"deep"`` dict strategy, otherwise with the dict strategy), lists
+        with the list strategy. Any other value that the two sides changed
+        differently is a conflict.
+
+        Subtrees that either side left identical to the base (the same object
+        or an equal value) are resolved without being walked, so the cost is
+        proportional to the changes. Unchanged subtrees are shared with the
+        inputs rather than copied.
 
-        for dict_to_merge in dicts[1:]:
-            result = self._merge_dicts(result, dict_to_merge)
+        Args:
+            base: Common ancestor
+            ours: Local version
+            theirs: Upstream version
+            on_conflict: ``"raise"`` to raise ``MergeConflictError`` listing
+                every conflict (layers 1 and 2 are ours and theirs, a deleted
+                side is reported as ``flexmerge.merge3.DELETED``), or
+                ``"ours"``/``"theirs"`` to resolve conflicts for that side
+
+        Returns:
+            Merged dictionary
+
+        Raises:
+            TypeError: If any argument is not a dictionary
+            ValueError: If on_conflict is not a known policy
+            MergeConflictError: If both sides changed a value differently
+            SchemaError: If the result violates the schema
 
+        Example:
+            >>> Merger().merge3(
+            ...     {"port": 80, "host": "a"},
+            ...     {"port": 8080, "host": "a"},
+            ...     {"port": 80, "host": "b"},
+            ... )
+            {'port': 8080, 'host': 'b'}
+        """
+        for i, d in enumerate((base, ours, theirs)):
+            if not isinstance(d, Mapping):
+                raise TypeError(f"Argument {i} is not a dictionary: {type(d)}")
+
+        result = merge3(self, base, ours, theirs, on_conflict)
+
+        if self._schema is not None:
+            self._check_schema(result)
+        if self._interner is not None:
+            result = self._interner.intern(result)
         return result
 
+    def merge_fingerprinted(
+        self,
+        *dicts: Mapping[str, Any],
+        fingerprinter: Fingerprinter | None = None,
+    ) -> tuple[dict[str, Any], str]:
+        """
+        Merge dictionaries and return the result's structural fingerprint.
+
+        Subtrees that both sides set to identical content (the same object,
+        or equal Merkle fingerprints) are taken from the right side as-is
+        instead of being walked and copied, as long as this gives the same
+        result: the subtree contains no lists, or the list strategy is
+        ``"replace"`` or ``"keep"``. Fingerprints computed for these checks
+        are reused for the result's root fingerprint, so unchanged subtrees
+        are hashed only once.
+
+        Unlike ``merge``, the first layer is not deep copied: the result
+        shares every subtree the merge did not change with the inputs and
+        must be treated as read-only.
+
+        Args:
+            *dicts: Dictionaries or other mappings to merge
+            fingerprinter: Fingerprint cache for the inputs; pass the same
+                instance across merges of unchanging inputs to avoid
+                rehashing them (results are not added to it)
+
+        Returns:
+            Merged dictionary and its fingerprint as a hex string
+
+        Raises:
+            TypeError: If any argument is not a dictionary
+            MergeConflictError: In strict mode, if layers set a value differently
+            MergeLimitError: If the merge exceeds a resource limit
+            SchemaError: If the result violates the schema
+
+        Example:
+            >>> result, digest = Merger().merge_fingerprinted(base, overlay)
+            >>> if digest != last_digest:
+            ...     reload(result)
+        """
+        for i, d in enumerate(dicts):
+            if not isinstance(d, Mapping):
+                raise TypeError(f"Argument {i} is not a dictionary: {type(d)}")
+
+        if self._strict:
+            self._raise_on_conflicts(dicts)
+
+        if fingerprinter is None:
+            fingerprints = Fingerprinter()
+        else:
+            # Only the inputs are kept in the long-lived cache; intermediate
+            # and final results are fingerprinted in a throwaway overlay
+            for d in dicts:
+                fingerprinter.digest(d)
+            fingerprints = fingerprinter._overlay()
+
+        if (
+            dicts
+            and self._uses_engines()
+            # Reducers such as "sum" change a subtree merged with itself
+            and self._scalar_merge() is None
+        ):
+            list_strategy = self._list_strategy
+            lists_idempotent = any(
+                list_strategy == BUILTIN_LIST_STRATEGIES[name]
+                for name in ("replace", "keep")
+            )
+
+            def same(left: Any, right: Any) -> bool:
+                return fingerprints.same(left, right, lists_idempotent)
+
+            engine_merge = self._engine_for(dicts).merge
+            guard = None
+            if self._limits is not None:
+                guard = MergeGuard(self._limits)
+                guard.check_layer(dicts[0])
+            result = _materialize(dicts[0])
+            for dict_to_merge in dicts[1:]:
+                result = engine_merge(
+                    result, dict_to_merge, list_strategy, same, None, guard
+                )
+            if guard is not None:
+                guard.check_output(result)
+            if self._schema is not None:
+                self._check_schema(result)
+        else:
+            result = self.merge(*dicts)
+
+        if self._interner is not None:
+            result = self._interner.intern(result)
+        return result, fingerprints.hexdigest(result)
+
+    def merge_objects(self, *objects: T) -> T:
+        """
+        Merge dataclass or ``__slots__`` instances of the same class.
+
+        Fields are read directly from the instances, using field metadata
+        cached per class, and merged with the configured strategies: nested
+        objects of the same class field by field, dicts with the dict
+        strategy and lists with the list strategy. The result is a new
+        instance: dataclasses are built through their ``__init__`` (so
+        ``__post_init__`` runs and ``init=False`` fields are recomputed),
+        plain ``__slots__`` classes get their slots set directly. It equals
+        ``asdict()`` + ``merge`` + rebuilding the object, without the
+        intermediate dict copies.
+
+        Args:
+            *objects: Instances of one dataclass or ``__slots__`` class
+
+        Returns:
+            New merged instance
+
+        Raises:
+            TypeError: If the objects are not instances of one supported class
+
+        Example:
+            >>> @dataclass
+            ... class Config:
+            ...     name: str
+            ...     tags: list
+            >>> Merger().merge_objects(Config("a", ["x"]), Config("b", ["y"]))
+            Config(name='b', tags=['x', 'y'])
+        """
+        if not objects:
+            raise TypeError("merge_objects() requires at least one object")
+
+        return merge_objects(self, objects)
+
+    def explain(
+        self, *dicts: Mapping[str, Any], sample_size: int = 8, max_visits: int = 16
+    ) -> MergeEstimate:
+        """
+        Estimate the shape of merge inputs without merging them.
+
+        The inputs are sampled, not walked: large containers contribute a
+        few children whose counts are scaled up, so the cost depends on the
+        sample budget and the nesting depth rather than the input size.
+        Small inputs are counted exactly.
+
+        Args:
+            *dicts: Dictionaries or other mappings, in merge order
+            sample_size: Children sampled per container
+            max_visits: Containers visited before only one container child
+                per container is followed
+
+        Returns:
+            Estimated node count, depth, list sizes, share of hashable list
+            items and share of scalar-only levels, plus the engine that
+            ``engine("auto")`` uses for these inputs
+
+        Raises:
+            TypeError: If any argument is not a dictionary
+
+        Example:
+            >>> plan = Merger().explain({"a": 1, "b": [1, 2]}, {"a": 2})
+            >>> plan.nodes, plan.depth, plan.engine
+            (7, 2, 'union')
+        """
+        for i, d in enumerate(dicts):
+            if not isinstance(d, Mapping):
+                raise TypeError(f"Argument {i} is not a dictionary: {type(d)}")
+
+        return estimate(dicts, self._scalar_merge() is None, sample_size, max_visits)
+
+    def conflicts(
+        self, *dicts: Mapping[str, Any], fail_fast: bool = False
+    ) -> list[Conflict]:
+        """
+        List the paths that the given layers set to different values.
+
+        This runs the strict-mode check without merging, using the
+        configured strategies to decide what counts as a conflict.
+
+        Args:
+            *dicts: Dictionaries or other mappings, in merge order
+            fail_fast: Stop at the first conflict
+
+        Returns:
+            Conflicts with their path, layer indexes and both values
+
+        Raises:
+            TypeError: If any argument is not a dictionary
+
+        Example:
+            >>> Merger().conflicts({"a": {"b": 1}}, {"a": {"b": 2, "c": 3}})
+            [Conflict(path=('a', 'b'), layers=(0, 1), left=1, right=2)]
+        """
+        for i, d in enumerate(dicts):
+            if not isinstance(d, Mapping):
+                raise TypeError(f"Argument {i} is not a dictionary: {type(d)}")
+
+        return self._find_conflicts(dicts, fail_fast)
+
+    def merge_files(
+        self, *paths: PathLike | EnvSource, cache: ParseCache | None = None
+    ) -> dict[str, Any]:
+        """
+        Load JSON/TOML files and merge them in order.
+
+        Parsed documents are cached and keyed on path, inode, modification
+        time and size, so on reload only files that changed are parsed
+        again. ``EnvSource`` layers can be given among the paths to overlay
+        environment variables; their overlays are cached until the
+        variables change. Like ``merge``, the result may share subtrees of
+        later layers with the cached documents; copy it before mutating
+        nested values.
+
+        Args:
+            *paths: Paths to ``.json`` or ``.toml`` files, or environment
+                variable sources
+            cache: Parse cache to use (default: a process-wide shared cache)
+
+        Returns:
+            Merged dictionary
+
+        Raises:
+            ValueError: If a file extension is not supported
+            TypeError: If a file does not contain a table/object at top level
+
+        Example:
+            >>> Merger().merge_files("base.toml", "prod.toml", EnvSource("APP"))
+        """
+        if cache is None:
+            cache = DEFAULT_PARSE_CACHE
+        return self.merge(
+            *[
+                path.load() if isinstance(path, EnvSource) else cache.load(path)
+                for path in paths
+            ]
+        )
+
+    def merge_files_snapshot(
+        self,
+        snapshot: PathLike,
+        *paths: PathLike,
+        cache: ParseCache | None = None,
+    ) -> Mapping[str, Any]:
+        """
+        Merge files, reusing a binary snapshot of a previous identical merge.
+
+        The snapshot stores the merged result together with the inputs'
+        (path, inode, mtime, size) fingerprints and the strategy
+        configuration. If both still match, the snapshot is memory mapped
+        and returned without parsing or merging anything; subtrees are
+        decoded lazily on access. Otherwise the files are merged and the
+        snapshot is rewritten.
+
+        Strategies without a registered name are identified by their
+        qualified name, and ``sorted_merge``/``by_key`` strategies by their
+        parameters, so changing the body of a custom function does not
+        invalidate the snapshot. Resource limits and strict mode are part
+        of the configuration; a reused result is checked against the
+        schema like a merged one.
+
+        Args:
+            snapshot: Snapshot file to read and refresh
+            *paths: Paths to ``.json`` or ``.toml`` files
+            cache: Parse cache to use when the files have to be merged
+
+        Returns:
+            Merged mapping: a lazily decoded ``LazyDict`` when the snapshot
+            was reused, otherwise the freshly merged dictionary
+
+        Raises:
+            ValueError: If a strategy cannot be identified across runs
+                (a lambda, a nested function or another callable object
+                without a registered name)
+            SchemaError: If the result violates the schema
+        """
+        metadata = {
+            "inputs": [_file_fingerprint(path) for path in paths],
+            "config": self._config_key(),
+        }
+
+        if os.path.exists(snapshot):
+            try:
+                loaded = load_snapshot(snapshot)
+            except SnapshotError:
+                pass
+            else:
+                if loaded.metadata == metadata:
+                    try:
+                        # Only the paths the schema names are decoded
+                        self._check_schema(loaded.root)
+                    except SchemaError:
+                        loaded.close()
+                        raise
+                    return loaded.root
+                loaded.close()
+
+        result = self.merge_files(*paths, cache=cache)
+        save_snapshot(snapshot, result, metadata)
+        return result
+
+    def merge_many(
+        self, rows: Iterable[Sequence[Mapping[str, Any]]], trusted: bool = False
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Merge many small groups of dictionaries, one result per input row.
+
+        Strategy and engine resolution is done once for the whole batch
+        instead of once per call, and results are yielded as they are
+        produced so arbitrarily long inputs can be streamed.
+
+        Args:
+            rows: Iterable of tuples (or other sequences) of dictionaries
+            trusted: Skip per-row type validation for inputs known to be valid
+
+        Yields:
+            Merged dictionary for each row, in input order
+
+        Raises:
+            TypeError: If any argument in a row is not a dictionary
+            MergeLimitError: If a row exceeds a resource limit
+            SchemaError: If a result violates the schema
+
+        Example:
+            >>> merger = Merger()
+            >>> list(merger.merge_many([({"a": 1}, {"b": 2}), ({"a": 3},)]))
+            [{'a': 1, 'b': 2}, {'a': 3}]
+        """
+        copy = self._layer_copier()
+        interner = self._interner
+        limits = self._limits
+        engine = self._engine
+        if self._auto_engine:
+            # One engine for the whole batch, chosen from the first row
+            rows = iter(rows)
+            first = next(rows, None)
+            if first is None:
+                return
+            rows = chain((first,), rows)
+            engine = self._engine_for(first)
+        merge_pair = self._pair_merger(engine)
+
+        for row_index, row in enumerate(rows):
+            if not trusted:
+                for i, d in enumerate(row):
+                    if not isinstance(d, Mapping):
+                        raise TypeError(
+                            f"Row {row_index} argument {i} is not a dictionary: "
+                            f"{type(d)}"
+                        )
+
+            if not row:
+                yield {}
+                continue
+
+            if self._strict:
+                self._raise_on_conflicts(row)
+
+            if limits is not None:
+                result = self._merge_limited(row, engine, limits)
+            else:
+                result = copy(row[0])
+                for i in range(1, len(row)):
+                    result = merge_pair(result, row[i])
+            if self._schema is not None:
+                self._check_schema(result)
+            if interner is not None:
+                result = interner.intern(result)
+            yield result
+
+    def merge_fanout(
+        self,
+        base: Mapping[str, Any],
+        overlays: Iterable[Mapping[str, Any]],
+        copy: bool = False,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Merge one base with each of many overlays, one result per overlay.
+
+        The base is prepared once for the whole batch (validated, checked
+        against resource limits and, for scalar strategies with an initial
+        step such as ``"count"``, lifted) instead of being deep copied for
+        every result as ``merge(base, overlay)`` would. Each result copies
+        only the levels its overlay writes to and shares every other
+        subtree with the base, so the cost of a result depends on the size
+        of its overlay rather than of the base, and results must be
+        treated as read-only. With ``copy=True`` every result starts from a
+        fresh copy of the base instead, like ``merge``, and can be modified.
+
+        Dict strategies are given the base itself as their left argument
+        and must not modify it, as none of the built-in strategies do.
+
+        Args:
+            base: Mapping every overlay is merged onto
+            overlays: Iterable of mappings, consumed lazily
+            copy: Copy the base into every result instead of sharing it
+
+        Yields:
+            Merged dictionary for each overlay, in input order
+
+        Raises:
+            TypeError: If the base or an overlay is not a dictionary
+            MergeConflictError: In strict mode, if an overlay conflicts with
+                the base
+            MergeLimitError: If a merge exceeds a resource limit
+            SchemaError: If a result violates the schema
+
+        Example:
+            >>> merger = Merger()
+            >>> for tenant, config in zip(tenants, merger.merge_fanout(
+            ...     base, (tenant.overrides for tenant in tenants)
+            ... )):
+            ...     publish(tenant, config)
+        """
+        if not isinstance(base, Mapping):
+            raise TypeError(f"Base is not a dictionary: {type(base)}")
+
+        limits = self._limits
+        if limits is not None:
+            MergeGuard(limits).check_layer(base)
+        initial = getattr(self._scalar_merge(), "initial", None)
+        if initial is not None and (
+            self._dict_strategy == BUILTIN_DICT_STRATEGIES["deep"]
+            or accepts_context(self._dict_strategy)
+        ):
+            base = _lift_scalars(
+                base, initial, _list_lifter(self._list_strategy, initial)
+            )
+        elif not isinstance(base, dict):
+            base = _materialize(base)
+
+        engine = self._engine
+        if self._auto_engine:
+            # One engine for the whole batch, chosen from the first overlay
+            overlays = iter(overlays)
+            first = next(overlays, None)
+            if first is None:
+                return
+            overlays = chain((first,), overlays)
+            if isinstance(first, Mapping):
+                engine = self._engine_for((base, first))
+        merge_pair = self._pair_merger(engine)
+        copy_base = self._engine.copy
+        interner = self._interner
+
+        for index, overlay in enumerate(overlays):
+            if not isinstance(overlay, Mapping):
+                raise TypeError(f"Overlay {index} is not a dictionary: {type(overlay)}")
+
+            if self._strict:
+                self._raise_on_conflicts((base, overlay))
+
+            left = copy_base(base) if copy else base
+            if limits is not None:
+                # The base was checked once above
+                guard = MergeGuard(limits)
+                result = self._merge_dicts(left, overlay, engine, guard)
+                guard.check_output(result)
+            else:
+                result = merge_pair(left, overlay)
+            if self._schema is not None:
+                self._check_schema(result)
+            if interner is not None:
+                result = interner.intern(result)
+            yield result
+
+    def merge_external(
+        self,
+        *sources: ExternalSource,
+        db_path: PathLike | None = None,
+        memory_budget: int = 64 << 20,
+    ) -> Iterator[tuple[str, Any]]:
+        """
+        Merge layers larger than memory through an on-disk SQLite database.
+
+        Every layer is streamed into SQLite one top-level entry at a time
+        (JSON files are parsed incrementally), then each top-level key is
+        merged on its own with the configured strategies and yielded. Only
+        one key's values and a bounded insert buffer are held in memory.
+        The result is the same as ``merge`` would produce for the deep and
+        shallow dict strategies; other dict strategies are rejected.
+
+        Args:
+            *sources: JSON/TOML file paths, mappings or iterables of
+                ``(key, value)`` pairs, merged in order
+            db_path: SQLite file to spill into, replacing the tables of an
+                earlier merge; a temporary file is used and removed
+                afterwards when omitted
+            memory_budget: Approximate number of bytes buffered before
+                entries are written to the database
+
+        Yields:
+            Top-level keys and merged values, in the order ``merge`` uses
+
+        Raises:
+            ValueError: If the dict strategy cannot be applied key by key
+
+        Example:
+            >>> merger = Merger()
+            >>> dict(merger.merge_external({"a": {"x": 1}}, {"a": {"y": 2}}))
+            {'a': {'x': 1, 'y': 2}}
+        """
+        return merge_external(self, sources, db_path, memory_budget)
+
+    def group_merge(
+        self,
+        records: RecordSource,
+        key: GroupKey,
+        partitions: int = 64,
+        max_in_memory: int = 100_000,
+        jobs: int = 1,
+    ) -> Iterator[tuple[Any, dict[str, Any]]]:
+        """
+        Merge the records that share a key, one result per key.
+
+        Records are streamed once and the records of each key are merged in
+        input order with the configured strategies, as
+        ``merge(*records_of_key)`` would. Inputs of up to ``max_in_memory``
+        records are grouped in memory and yielded in first-seen key order.
+        Larger inputs are hash-partitioned by key into ``partitions``
+        temporary files, which are then merged one at a time (or by
+        ``jobs`` worker processes) and yielded partition by partition, so
+        memory holds the merged groups of a few partitions rather than of
+        the whole input. Worker processes need a picklable merger, with
+        built-in or module-level strategies; keys are computed in the
+        calling process only, so ``key`` can be any callable. With a scalar
+        reducer such as ``"sum"``, the field a key path names keeps the
+        value of the group's first record instead of being reduced.
+        Resource limits apply to each record merged into a group and to
+        each result.
+
+        Args:
+            records: Iterable of mappings, or the path of an NDJSON file
+            key: Dotted key path of the field to group by, a sequence of
+                keys, or a function of a record returning a hashable key
+            partitions: Number of hash partitions for inputs that spill
+            max_in_memory: Largest number of records grouped without
+                spilling to disk
+            jobs: Number of worker processes merging spilled partitions
+
+        Yields:
+            Keys and merged records
+
+        Raises:
+            ValueError: If a record has no value at the key path, or
+                partitions or jobs is less than 1
+            TypeError: If a record is not a dictionary or its key is not
+                hashable
+            MergeConflictError: In strict mode, if records of a group
+                conflict
+            MergeLimitError: If a merge exceeds a resource limit
+            SchemaError: If a merged record violates the schema
+
+        Example:
+            >>> merger = Merger().lists("unique")
+            >>> for user_id, profile in merger.group_merge(
+            ...     "events.ndjson", key="user_id", jobs=4
+            ... ):
+            ...     store(user_id, profile)
+        """
+        return group_merge(self, records, key, partitions, max_in_memory, jobs)
+
+    def _pair_merger(
+        self, engine: RecursiveEngine | IterativeEngine | None = None
+    ) -> Callable[[Mapping[str, Any], Mapping[str, Any]], dict[str, Any]]:
+        """Resolve the configured strategies into a two-argument merge function."""
+        if self._dict_context():
+            return self._context_root().merge_dicts
+
+        if self._dict_strategy != BUILTIN_DICT_STRATEGIES["deep"]:
+            strategy = self._dict_strategy
+
+            def merge_plain(
+                left: Mapping[str, Any], right: Mapping[str, Any]
+            ) -> dict[str, Any]:
+                return strategy(_as_dict(left), _as_dict(right))
+
+            return merge_plain
+
+        engine_merge = (engine or self._engine).merge
+        list_strategy = self._list_strategy
+        scalars = self._scalar_merge()
+
+        def merge_pair(
+            left: Mapping[str, Any], right: Mapping[str, Any]
+        ) -> dict[str, Any]:
+            return engine_merge(left, right, list_strategy, None, scalars)
+
+        return merge_pair
+
+    def _uses_engines(self) -> bool:
+        """Whether pairs of mappings are merged by the engines."""
+        deep = self._dict_strategy == BUILTIN_DICT_STRATEGIES["deep"]
+        return deep and not accepts_context(self._list_strategy)
+
+    def _dict_context(self) -> bool:
+        """Whether pairs of mappings are merged through a ``MergeContext``."""
+        return accepts_context(self._dict_strategy) or (
+            self._dict_strategy == BUILTIN_DICT_STRATEGIES["deep"]
+            and accepts_context(self._list_strategy)
+        )
+
+    def _takes_context(self) -> bool:
+        """Whether the dict or list strategy takes a ``MergeContext``."""
+        return accepts_context(self._dict_strategy) or accepts_context(
+            self._list_strategy
+        )
+
+    def _context_root(self) -> MergeContext:
+        """
+        Create the root context of a merge with the configured strategies.
+
+        The engines do not track paths, so a context-aware list strategy
+        under the deep dict strategy is run by a context walk instead.
+        """
+        deep = self._dict_strategy == BUILTIN_DICT_STRATEGIES["deep"]
+        return MergeContext.root(
+            self, None if deep else self._dict_strategy, self._list_strategy
+        )
+
+    def _scalar_merge(self) -> ScalarMerge | None:
+        """Return the scalar strategy for the engines, or None for replace."""
+        if self._scalar_strategy == BUILTIN_SCALAR_STRATEGIES["replace"]:
+            return None
+        return self._scalar_strategy
+
+    def _engine_for(
+        self, layers: Sequence[Mapping[str, Any]]
+    ) -> RecursiveEngine | IterativeEngine:
+        """Return the engine for merging the given layers."""
+        if not self._auto_engine:
+            return self._engine
+        return BUILTIN_ENGINES[choose_engine(layers, self._scalar_merge() is None)]
+
+    def _layer_copier(self, owned: bool = False) -> Callable[[Any], Any]:
+        """
+        Resolve how the first layer is copied into a new result.
+
+        Layers that are ``owned`` (freshly decoded, not shared with the
+        caller) become the result as they are, lifted if needed.
+        """
+        copy = self._engine.copy if not owned else _identity
+        initial = getattr(self._scalar_merge(), "initial", None)
+        deep = self._dict_strategy == BUILTIN_DICT_STRATEGIES["deep"]
+        if initial is None or not (deep or accepts_context(self._dict_strategy)):
+            return copy
+        lift_list = _list_lifter(self._list_strategy, initial)
+
+        def copy_and_lift(value: Any) -> Any:
+            return _lift_scalars(copy(value), initial, lift_list)
+
+        return copy_and_lift
+
+    def _merge_limited(
+        self,
+        layers: Sequence[Mapping[str, Any]],
+        engine: RecursiveEngine | IterativeEngine,
+        limits: MergeLimits,
+    ) -> dict[str, Any]:
+        """Merge layers under resource limits."""
+        guard = MergeGuard(limits)
+        if self._uses_engines():
+            # The engine checks the other layers as it walks them
+            guard.check_layer(layers[0])
+        else:
+            for layer in layers:
+                guard.check_layer(layer)
+
+        result: dict[str, Any] = self._layer_copier()(layers[0])
+        for i in range(1, len(layers)):
+            result = self._merge_dicts(result, layers[i], engine, guard)
+            guard.check_clock(())
+        guard.check_output(result)
+        return result
+
+    def _check_schema(self, result: Mapping[str, Any]) -> None:
+        """Raise SchemaError if a result violates the schema."""
+        if self._schema is None:
+            return
+        violations = self._schema.validate(result)
+        if violations:
+            raise SchemaError(violations)
+
+    def _find_conflicts(
+        self,
+        layers: Sequence[Mapping[str, Any]],
+        fail_fast: bool,
+        layer_ids: Sequence[int] | None = None,
+    ) -> list[Conflict]:
+        """Check layers for conflicts as the configured strategies see them."""
+        return find_conflicts(
+            layers,
+            deep=self._dict_strategy == BUILTIN_DICT_STRATEGIES["deep"],
+            compare_lists=any(
+                self._list_strategy == BUILTIN_LIST_STRATEGIES[name]
+                for name in ("replace", "keep")
+            ),
+            compare_scalars=self._scalar_merge() is None,
+            fail_fast=fail_fast,
+            layer_ids=layer_ids,
+        )
+
+    def _raise_on_conflicts(
+        self,
+        layers: Sequence[Mapping[str, Any]],
+        layer_ids: Sequence[int] | None = None,
+    ) -> None:
+        """Raise MergeConflictError if the layers conflict."""
+        conflicts = self._find_conflicts(layers, self._fail_fast, layer_ids)
+        if conflicts:
+            raise MergeConflictError(conflicts)
+
     def _merge_dicts(
-        self, left: dict[str, Any], right: dict[str, Any]
+        self,
+        left: Mapping[str, Any],
+        right: Mapping[str, Any],
+        engine: RecursiveEngine | IterativeEngine | None = None,
+        guard: MergeGuard | None = None,
     ) -> dict[str, Any]:
         """Internal method to merge two dictionaries."""
         # Special handling for deep merge to pass list strategy
-        if self._dict_strategy == BUILTIN_DICT_STRATEGIES["deep"]:
-            return _deep_merge_dicts_with_strategy(left, right, self._list_strategy)
+        if self._uses_engines():
+            return (engine or self._engine).merge(
+                left, right, self._list_strategy, None, self._scalar_merge(), guard
+            )
+        elif self._dict_context():
+            return self._context_root().merge_dicts(left, right)
         else:
-            return self._dict_strategy(left, right)
+            return self._dict_strategy(_as_dict(left), _as_dict(right))
 
     def _merge_lists(self, left: list[Any], right: list[Any]) -> list[Any]:
         """Internal method to merge two lists."""
@@ -214,6 +1370,44 @@ class Merger:
 
         return None
 
+    def _find_scalar_strategy_name(self) -> str | None:
+        """Find the name of the current scalar strategy."""
+        for name, strategy in BUILTIN_SCALAR_STRATEGIES.items():
+            if strategy is self._scalar_strategy:
+                return name
+        return None
+
+    def _config_key(self) -> str:
+        """
+        Describe the configured strategies, limits and strict mode for cache keys.
+
+        Raises:
+            ValueError: If a strategy has no stable identity
+        """
+        strategies = [
+            ("lists", self._list_strategy, self._find_list_strategy_name()),
+            ("dicts", self._dict_strategy, self._find_dict_strategy_name()),
+        ]
+        if self._scalar_merge() is not None:
+            strategies.append(
+                ("scalars", self._scalar_strategy, self._find_scalar_strategy_name())
+            )
+
+        parts = []
+        for kind, strategy, name in strategies:
+            key = _strategy_key(strategy, name)
+            if key is None:
+                raise ValueError(
+                    f"Cannot identify {kind} strategy {strategy!r} across runs; "
+                    "register it by name or use a module-level function"
+                )
+            parts.append(f"{kind}={key}")
+        if self._limits is not None:
+            parts.append(f"limits={tuple(self._limits)!r}")
+        if self._strict:
+            parts.append("strict")
+        return ";".join(parts)
+
     def copy(self) -> Merger:
         """
         Create a copy of this merger with the same strategies.
@@ -223,18 +1417,33 @@ class Merger:
         """
         new_merger = Merger()
 
+        # Copy custom strategies first so that their names resolve below
+        new_merger._custom_list_strategies = self._custom_list_strategies.copy()
+        new_merger._custom_dict_strategies = self._custom_dict_strategies.copy()
+
         # Copy strategies by finding their names and using public API
         list_strategy_name = self._find_list_strategy_name()
         dict_strategy_name = self._find_dict_strategy_name()
 
+        # Strategies without a registered name (functions, ``by_key(...)``)
+        # are shared as-is
         if list_strategy_name:
             new_merger.lists(list_strategy_name)
+        else:
+            new_merger._list_strategy = self._list_strategy
         if dict_strategy_name:
             new_merger.dicts(dict_strategy_name)
+        else:
+            new_merger._dict_strategy = self._dict_strategy
 
-        # Copy custom strategies
-        new_merger._custom_list_strategies = self._custom_list_strategies.copy()
-        new_merger._custom_dict_strategies = self._custom_dict_strategies.copy()
+        new_merger._scalar_strategy = self._scalar_strategy
+        new_merger._engine = self._engine
+        new_merger._auto_engine = self._auto_engine
+        new_merger._interner = self._interner
+        new_merger._strict = self._strict
+        new_merger._fail_fast = self._fail_fast
+        new_merger._limits = self._limits
+        new_merger._schema = self._schema
 
         return new_merger
 
@@ -243,7 +1452,58 @@ class Merger:
         list_strategy_name = self._find_list_strategy_name() or "custom"
         dict_strategy_name = self._find_dict_strategy_name() or "custom"
 
-        return f"Merger(lists='{list_strategy_name}', dicts='{dict_strategy_name}')"
+        if self._scalar_merge() is None:
+            return f"Merger(lists='{list_strategy_name}', dicts='{dict_strategy_name}')"
+        scalar_strategy_name = self._find_scalar_strategy_name() or "custom"
+        return (
+            f"Merger(lists='{list_strategy_name}', dicts='{dict_strategy_name}', "
+            f"scalars='{scalar_strategy_name}')"
+        )
+
+
+def _strategy_key(strategy: Any, name: str | None) -> str | None:
+    """
+    Identify a strategy by data that is the same in every process.
+
+    Registered strategies are identified by name, functions by their
+    qualified name and the parameterized strategies of this package by
+    their parameters. Returns None for lambdas, nested functions and other
+    callable objects, which have no stable identity.
+    """
+    if name:
+        return name
+    if isinstance(strategy, SortedListStrategy):
+        key = "None" if strategy.key is None else _strategy_key(strategy.key, None)
+        if key is None:
+            return None
+        return f"sorted(key={key},reverse={strategy.reverse},unique={strategy.unique})"
+    if isinstance(strategy, KeyedListStrategy):
+        return f"by_key({strategy.key!r})"
+    if isinstance(strategy, ContextStrategy):
+        func = _strategy_key(strategy.func, None)
+        return None if func is None else f"context({func})"
+    qualname = getattr(strategy, "__qualname__", None)
+    if not isinstance(qualname, str) or "<" in qualname:
+        return None
+    module = getattr(strategy, "__module__", None)
+    return f"{module}.{qualname}" if module else qualname
+
+
+def _file_fingerprint(path: PathLike) -> list[Any]:
+    """Identify the current state of a file by path, inode, mtime and size."""
+    path = os.path.abspath(os.fspath(path))
+    stat = os.stat(path)
+    return [path, stat.st_ino, stat.st_mtime_ns, stat.st_size]
+
+
+def _as_dict(value: Mapping[str, Any]) -> dict[str, Any]:
+    """Return a dict as it is and copy the top level of other mappings."""
+    return value if isinstance(value, dict) else dict(value)
+
+
+def _identity(value: Any) -> Any:
+    """Return a value unchanged."""
+    return value
 
 
 # Convenience functions for quick merging
@@ -0,0 +1,235 @@
+"""
+Merging of dataclass and ``__slots__`` instances without dict round-trips.
+
+Fields are read straight from the instances with ``getattr`` using field
+lists cached per class, merged with the configured strategies, and the
+result is built as a new instance of the same class. This gives the same
+result as ``asdict()`` + ``Merger.merge`` + rebuilding the object, without
+copying every field twice.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+from collections.abc import Mapping, Sequence
+from typing import TYPE_CHECKING, Any, NamedTuple, TypeVar
+
+from .engine import _is_scalar, _lift_scalars, _list_lifter
+from .strategies import BUILTIN_DICT_STRATEGIES
+
+if TYPE_CHECKING:
+    from .merger import Merger
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+
+class _Layout(NamedTuple):
+    """Cached field metadata of a mergeable class."""
+
+    is_dataclass: bool
+    # Fields passed to __init__ when the instance is rebuilt
+    init_fields: tuple[str, ...]
+    # Slots set on the new instance after construction
+    other_fields: tuple[str, ...]
+
+
+# Field metadata per class; None for classes that are not mergeable objects
+_LAYOUTS: dict[type, _Layout | None] = {}
+
+
+def _layout(cls: type) -> _Layout | None:
+    """Return the cached field metadata of a class."""
+    try:
+        return _LAYOUTS[cls]
+    except KeyError:
+        pass
+
+    layout: _Layout | None = None
+    if dataclasses.is_dataclass(cls):
+        # Fields with init=False are left to __init__/__post_init__ to set
+        init_fields = tuple(f.name for f in dataclasses.fields(cls) if f.init)
+        layout = _Layout(True, init_fields, ())
+    elif all("__slots__" in vars(klass) for klass in cls.__mro__[:-1]):
+        # Only classes whose whole hierarchy uses __slots__ have no __dict__
+        # (this also leaves out built-ins such as tuple subclasses)
+        names: list[str] = []
+        for klass in reversed(cls.__mro__[:-1]):
+            slots = vars(klass)["__slots__"]
+            for name in (slots,) if isinstance(slots, str) else slots:
+                if name not in ("__dict__", "__weakref__") and name not in names:
+                    names.append(name)
+        if names:
+            layout = _Layout(False, (), tuple(names))
+
+    _LAYOUTS[cls] = layout
+    return layout
+
+
+class _Draft:
+    """Field values of an object under construction, owned by the merge."""
+
+    __slots__ = ("cls", "layout", "values")
+
+    def __init__(self, cls: type, layout: _Layout, values: dict[str, Any]) -> None:
+        self.cls = cls
+        self.layout = layout
+        self.values = values
+
+
+def _field_values(obj: Any, layout: _Layout) -> dict[str, Any]:
+    """Read the fields of an instance; unset slots are left out."""
+    values = {}
+    for name in layout.init_fields + layout.other_fields:
+        value = getattr(obj, name, _MISSING)
+        if value is not _MISSING:
+            values[name] = value
+    return values
+
+
+def _construct(cls: Any, layout: _Layout, values: Mapping[str, Any]) -> Any:
+    """Create an instance from field values."""
+    if layout.is_dataclass:
+        instance = cls(
+            **{name: values[name] for name in layout.init_fields if name in values}
+        )
+    else:
+        instance = cls.__new__(cls)
+    for name in layout.other_fields:
+        if name in values:
+            object.__setattr__(instance, name, values[name])
+    return instance
+
+
+class _ObjectMerge:
+    """Deep merge of objects with the strategies of one merger."""
+
+    def __init__(self, merger: Merger) -> None:
+        # Copies the first layer's values, lifting scalars for reducers
+        self.copy = merger._layer_copier()
+        self.scalars = merger._scalar_merge()
+        self.initial = getattr(self.scalars, "initial", None)
+        self.lift_list = _list_lifter(merger._list_strategy, self.initial)
+        self.merge_pair = merger._pair_merger()
+        self.list_strategy = merger._list_strategy
+        # Context-aware list strategies are given the path of the field
+        self.root = merger._context_root() if merger._takes_context() else None
+
+    def take(self, value: Any) -> Any:
+        """Copy the first layer's value, turning objects into drafts."""
+        layout = _layout(type(value))
+        if layout is None:
+            return self.copy(value)
+        values = _field_values(value, layout)
+        for name, item in values.items():
+            values[name] = self.take(item)
+        return _Draft(type(value), layout, values)
+
+    def enter(self, value: Any) -> Any:
+        """Bring a value of a later layer into the result unmerged."""
+        if self.initial is None:
+            return value
+        if _layout(type(value)) is not None:
+            return self.take(value)
+        return _lift_scalars(value, self.initial, self.lift_list)
+
+    def merge_into(self, draft: _Draft, right: Any, path: tuple[Any, ...] = ()) -> None:
+        """Merge the fields of ``right`` into a draft of the same class."""
+        values = draft.values
+        root = self.root
+        for name, right_value in _field_values(right, draft.layout).items():
+            left_value = values.get(name, _MISSING)
+            if left_value is _MISSING:
+                values[name] = self.enter(right_value)
+            elif type(left_value) is _Draft:
+                if type(right_value) is left_value.cls:
+                    self.merge_into(left_value, right_value, path + (name,))
+                else:
+                    values[name] = self.enter(right_value)
+            elif (
+                type(left_value) is type(right_value)
+                and _layout(type(right_value)) is not None
+            ):
+                # The left value came from an earlier layer by reference
+                nested = self.take(left_value)
+                self.merge_into(nested, right_value, path + (name,))
+                values[name] = nested
+            elif isinstance(left_value, Mapping) and isinstance(right_value, Mapping):
+                if root is not None:
+                    values[name] = root.at(path + (name,)).merge_dicts(
+                        left_value, right_value
+                    )
+                else:
+                    values[name] = self.merge_pair(left_value, right_value)
+            elif isinstance(left_value, list) and isinstance(right_value, list):
+                if root is not None:
+                    values[name] = root.at(path + (name,)).merge_lists(
+                        left_value, right_value
+                    )
+                else:
+                    values[name] = self.list_strategy(left_value, right_value)
+            elif (
+                self.scalars is not None
+                and _is_scalar(left_value)
+                and _is_scalar(right_value)
+                and _layout(type(left_value)) is None
+                and _layout(type(right_value)) is None
+            ):
+                values[name] = self.scalars(left_value, right_value)
+            else:
+                values[name] = self.enter(right_value)
+
+    def build(self, draft: _Draft) -> Any:
+        """Create the final instances of a draft and its nested drafts."""
+        values = {
+            name: self.build(value) if type(value) is _Draft else value
+            for name, value in draft.values.items()
+        }
+        return _construct(draft.cls, draft.layout, values)
+
+
+def merge_objects(merger: Merger, objects: Sequence[T]) -> T:
+    """
+    Merge dataclass or ``__slots__`` instances of one class.
+
+    With the ``"deep"`` dict strategy, nested objects of the same class are
+    merged field by field, dict fields are deep merged, list fields use the
+    list strategy and two scalars the scalar strategy (whose ``initial``
+    step applies to scalars entering the result, as in ``Merger.merge``);
+    any other value from the right replaces the left one. Other dict
+    strategies are applied to the top-level fields.
+
+    Args:
+        merger: Merger whose strategies are used
+        objects: Instances of the same class, in merge order
+
+    Returns:
+        New instance of the objects' class
+
+    Raises:
+        TypeError: If the objects are not instances of one supported class
+    """
+    first = objects[0]
+    cls = type(first)
+    layout = _layout(cls)
+    if layout is None:
+        raise TypeError(f"Argument 0 is not a dataclass or __slots__ instance: {cls}")
+    for i, obj in enumerate(objects):
+        if type(obj) is not cls:
+            raise TypeError(f"Argument {i} is not a {cls.__name__}: {type(obj)}")
+
+    if merger._dict_strategy != BUILTIN_DICT_STRATEGIES["deep"]:
+        merge_pair = merger._pair_merger()
+        values = _field_values(first, layout)
+        for obj in objects[1:]:
+            values = merge_pair(values, _field_values(obj, layout))
+        result: T = _construct(cls, layout, values)
+        return result
+
+    walker = _ObjectMerge(merger)
+    draft = walker.take(first)
+    for obj in objects[1:]:
+        walker.merge_into(draft, obj)
+    result = walker.build(draft)
+    return result
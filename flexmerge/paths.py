@@ -0,0 +1,222 @@
+"""
+Key path patterns compiled into a trie, and projection of layers onto them.
+
+A pattern is a dotted string such as ``"database.host"`` or a sequence of
+keys (for keys that are not strings or contain dots). The key ``"*"``
+matches any single key. Patterns are compiled into a ``PathTrie`` that maps
+each of them to a value, so the same structure serves path filters and
+per-path configuration. Walks follow several trie nodes at once, since a
+key can match both a literal child and a wildcard.
+
+``project`` keeps only the parts of a layer selected by include and
+exclude patterns. It follows the trie rather than the layer: keys named
+in the patterns are looked up directly, so only levels with a wildcard or
+an exclusion are iterated, and subtrees selected as a whole are shared
+without being walked. Its cost depends on the size of the projection, not
+of the layer.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+from functools import lru_cache
+from typing import Any, Union
+
+WILDCARD = "*"
+
+Pattern = Union[str, Sequence[Any]]
+
+_MISSING = object()
+
+
+def parse_path(pattern: Pattern) -> tuple[Any, ...]:
+    """Split a pattern into its keys; the empty string is the root."""
+    if isinstance(pattern, str):
+        return tuple(pattern.split(".")) if pattern else ()
+    return tuple(pattern)
+
+
+class PathTrie:
+    """
+    Trie of key path patterns, each mapped to a value.
+
+    Example:
+        >>> trie = PathTrie.compile(["database.*", "cache"])
+        >>> nodes = trie.step((trie,), "cache")
+        >>> trie.matched(nodes)
+        True
+    """
+
+    __slots__ = ("children", "wildcard", "value")
+
+    def __init__(self) -> None:
+        """Create an empty trie."""
+        self.children: dict[Any, PathTrie] = {}
+        self.wildcard: PathTrie | None = None
+        self.value: Any = _MISSING
+
+    @classmethod
+    def compile(cls, patterns: Iterable[Pattern] | Mapping[Pattern, Any]) -> PathTrie:
+        """
+        Build a trie from patterns.
+
+        Args:
+            patterns: Patterns mapped to True, or a mapping of patterns to
+                their values
+
+        Returns:
+            Root of the trie
+        """
+        trie = cls()
+        if isinstance(patterns, Mapping):
+            for pattern, value in patterns.items():
+                trie.add(pattern, value)
+        else:
+            for pattern in patterns:
+                trie.add(pattern)
+        return trie
+
+    def add(self, pattern: Pattern, value: Any = True) -> None:
+        """Add a pattern, replacing the value of an equal pattern."""
+        node = self
+        for key in parse_path(pattern):
+            if key == WILDCARD:
+                if node.wildcard is None:
+                    node.wildcard = PathTrie()
+                node = node.wildcard
+            else:
+                child = node.children.get(key)
+                if child is None:
+                    child = node.children[key] = PathTrie()
+                node = child
+        node.value = value
+
+    @property
+    def terminal(self) -> bool:
+        """Whether a pattern ends at this node."""
+        return self.value is not _MISSING
+
+    @staticmethod
+    def step(nodes: Sequence[PathTrie], key: Any) -> tuple[PathTrie, ...]:
+        """Follow ``key`` from each of ``nodes``; no nodes means no match."""
+        following = []
+        for node in nodes:
+            child = node.children.get(key)
+            if child is not None:
+                following.append(child)
+            if node.wildcard is not None:
+                following.append(node.wildcard)
+        return tuple(following)
+
+    @staticmethod
+    def matched(nodes: Sequence[PathTrie]) -> bool:
+        """Check whether a pattern ends at any of ``nodes``."""
+        for node in nodes:
+            if node.value is not _MISSING:
+                return True
+        return False
+
+    @staticmethod
+    def values(nodes: Sequence[PathTrie]) -> list[Any]:
+        """Return the values of the patterns ending at ``nodes``."""
+        return [node.value for node in nodes if node.value is not _MISSING]
+
+
+@lru_cache(maxsize=256)
+def _compile_cached(patterns: tuple[Pattern, ...]) -> PathTrie:
+    """Compile a hashable tuple of patterns, reusing earlier tries."""
+    return PathTrie.compile(patterns)
+
+
+def compile_patterns(patterns: Pattern | Iterable[Pattern] | PathTrie) -> PathTrie:
+    """
+    Compile filter patterns, caching the trie for repeated pattern lists.
+
+    Args:
+        patterns: A pattern, an iterable of patterns or a compiled trie
+
+    Returns:
+        Compiled trie
+    """
+    if isinstance(patterns, PathTrie):
+        return patterns
+    if isinstance(patterns, str):
+        patterns = (patterns,)
+    patterns = tuple(
+        pattern if isinstance(pattern, str) else tuple(pattern) for pattern in patterns
+    )
+    return _compile_cached(patterns)
+
+
+def project(
+    layer: Mapping[str, Any],
+    include: PathTrie | None = None,
+    exclude: PathTrie | None = None,
+) -> dict[str, Any]:
+    """
+    Select the parts of a layer matching include patterns and no exclude pattern.
+
+    A matching pattern selects the whole subtree below it. Mappings on the
+    way to a selected path are rebuilt holding only the selected keys and
+    are left out when nothing below them is selected; patterns do not
+    descend into lists. Keys selected by name appear in pattern order,
+    keys matched by a wildcard in layer order.
+
+    Args:
+        layer: Mapping to project
+        include: Patterns to keep; None keeps everything
+        exclude: Patterns to drop, overriding include
+
+    Returns:
+        New dict sharing the selected subtrees with the layer
+    """
+    including = None if include is None or include.terminal else (include,)
+    if exclude is not None and exclude.terminal:
+        return {}
+    excluding = () if exclude is None else (exclude,)
+    if including is None and not excluding:
+        return dict(layer)
+    return _project(layer, including, excluding) or {}
+
+
+def _project(
+    mapping: Mapping[str, Any],
+    including: tuple[PathTrie, ...] | None,
+    excluding: tuple[PathTrie, ...],
+) -> dict[str, Any] | None:
+    """Project one mapping level; None when a partial include selects nothing."""
+    keys: Iterable[Any]
+    if including is None or any(node.wildcard is not None for node in including):
+        keys = mapping.keys()
+    else:
+        keys = dict.fromkeys(key for node in including for key in node.children)
+
+    result = {}
+    for key in keys:
+        value = mapping.get(key, _MISSING)
+        if value is _MISSING:
+            continue
+        next_including = including
+        if including is not None:
+            next_including = PathTrie.step(including, key)
+            if not next_including:
+                continue
+            if PathTrie.matched(next_including):
+                next_including = None
+        next_excluding = PathTrie.step(excluding, key) if excluding else ()
+        if next_excluding and PathTrie.matched(next_excluding):
+            continue
+
+        if next_including is None and not next_excluding:
+            result[key] = value
+        elif isinstance(value, Mapping):
+            projected = _project(value, next_including, next_excluding)
+            if projected is not None:
+                result[key] = projected
+        elif next_including is None:
+            # Exclusions below a value that is not a mapping cannot apply
+            result[key] = value
+
+    if including is not None and not result:
+        return None
+    return result
@@ -0,0 +1,216 @@
+"""
+Lightweight schemas checked against merge results.
+
+A schema maps key path patterns (see ``flexmerge.paths``) to rules on the
+values found there: their type, the keys a mapping must have, the values
+allowed and the type of list items. The patterns are compiled into a
+``PathTrie`` with the rules as values, and validation follows the trie
+into the result: keys named in the schema are looked up directly and
+only levels under a wildcard are iterated, so only the paths the schema
+covers are visited, not the whole result. All violations are collected
+with their paths.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from typing import Any, NamedTuple, Union
+
+from .conflicts import format_path
+from .paths import PathTrie, Pattern
+
+TypeSpec = Union[type, tuple[type, ...]]
+# Spelled out before Rule, whose ``type`` field shadows the builtin there
+_Types = tuple[type, ...]
+
+_RULE_KEYS = frozenset({"type", "required", "enum", "items"})
+_MISSING = object()
+
+
+class Rule(NamedTuple):
+    """Checks applied to the values at one path pattern."""
+
+    type: _Types | None = None
+    required: tuple[Any, ...] = ()
+    enum: tuple[Any, ...] | None = None
+    items: _Types | None = None
+
+
+class SchemaViolation(NamedTuple):
+    """A value of a merge result that does not satisfy the schema."""
+
+    path: tuple[Any, ...]
+    message: str
+
+
+class SchemaError(ValueError):
+    """Raised when a merge result does not satisfy the merger's schema."""
+
+    def __init__(self, violations: Sequence[SchemaViolation]) -> None:
+        """
+        Initialize the error.
+
+        Args:
+            violations: Violations found, at least one
+        """
+        self.violations = list(violations)
+        first = self.violations[0]
+        where = f"'{format_path(first.path)}'" if first.path else "the top level"
+        message = f"Schema violation at {where}: {first.message}"
+        if len(self.violations) > 1:
+            message += f" (and {len(self.violations) - 1} more)"
+        super().__init__(message)
+
+
+def _types(spec: TypeSpec) -> tuple[type, ...]:
+    """Normalize a type or tuple of types."""
+    return spec if isinstance(spec, tuple) else (spec,)
+
+
+def _type_names(types: tuple[type, ...]) -> str:
+    """Describe a tuple of types for messages."""
+    return " or ".join(t.__name__ for t in types)
+
+
+def _is_instance(value: Any, types: tuple[type, ...]) -> bool:
+    """Check a type, not counting booleans as integers unless bool is listed."""
+    if type(value) is bool and bool not in types:
+        return False
+    return isinstance(value, types)
+
+
+def _compile_rule(spec: TypeSpec | Mapping[str, Any]) -> Rule:
+    """Build a rule from a type or a mapping of rule keys."""
+    if not isinstance(spec, Mapping):
+        return Rule(type=_types(spec))
+    unknown = set(spec) - _RULE_KEYS
+    if unknown:
+        raise ValueError(f"Unknown schema rule key: {sorted(unknown)[0]}")
+    enum = spec.get("enum")
+    items = spec.get("items")
+    return Rule(
+        type=None if spec.get("type") is None else _types(spec["type"]),
+        required=tuple(spec.get("required", ())),
+        enum=None if enum is None else tuple(enum),
+        items=None if items is None else _types(items),
+    )
+
+
+class Schema:
+    """
+    Rules on the values at key path patterns of a merge result.
+
+    Each rule is either a type (or tuple of types) or a mapping with any
+    of the keys ``type``, ``required`` (keys the mapping at the path must
+    have), ``enum`` (allowed values) and ``items`` (type of list items).
+    The empty pattern ``""`` is the root of the result. Rules apply to
+    every value whose path matches; a missing value only violates the
+    ``required`` rule of its parent. Booleans do not count as ``int``
+    unless ``bool`` is listed too.
+
+    Example:
+        >>> schema = Schema({
+        ...     "": {"required": ["database"]},
+        ...     "database": {"type": dict, "required": ["host", "port"]},
+        ...     "database.port": int,
+        ...     "database.mode": {"enum": ["ro", "rw"]},
+        ...     "services.*.tags": {"type": list, "items": str},
+        ... })
+        >>> schema.validate({"database": {"host": "db", "port": "5432"}})
+        [SchemaViolation(path=('database', 'port'), message='expected int, got str')]
+    """
+
+    def __init__(self, rules: Mapping[Pattern, TypeSpec | Mapping[str, Any]]) -> None:
+        """
+        Compile a schema.
+
+        Args:
+            rules: Rules keyed by path pattern
+
+        Raises:
+            ValueError: If a rule has an unknown key
+        """
+        self.rules = dict(rules)
+        self.trie = PathTrie.compile(
+            {pattern: _compile_rule(spec) for pattern, spec in self.rules.items()}
+        )
+
+    def validate(self, value: Any) -> list[SchemaViolation]:
+        """
+        Check a value against the schema.
+
+        Args:
+            value: Merge result to check
+
+        Returns:
+            All violations, in the order of the result's keys
+        """
+        violations: list[SchemaViolation] = []
+        self._validate(value, (self.trie,), (), violations)
+        return violations
+
+    def _validate(
+        self,
+        value: Any,
+        nodes: tuple[PathTrie, ...],
+        path: tuple[Any, ...],
+        violations: list[SchemaViolation],
+    ) -> None:
+        """Check the rules matching at ``path`` and descend into mappings."""
+        for rule in PathTrie.values(nodes):
+            _check_rule(rule, value, path, violations)
+
+        if not isinstance(value, Mapping):
+            return
+        if any(node.wildcard is not None for node in nodes):
+            keys: Any = value.keys()
+        else:
+            keys = dict.fromkeys(key for node in nodes for key in node.children)
+        for key in keys:
+            child = value.get(key, _MISSING)
+            if child is _MISSING:
+                continue
+            following = PathTrie.step(nodes, key)
+            if following:
+                self._validate(child, following, path + (key,), violations)
+
+    def __repr__(self) -> str:
+        """String representation of the schema."""
+        return f"Schema({len(self.rules)} rules)"
+
+
+def _check_rule(
+    rule: Rule, value: Any, path: tuple[Any, ...], violations: list[SchemaViolation]
+) -> None:
+    """Append the violations of one rule by one value."""
+    if rule.type is not None and not _is_instance(value, rule.type):
+        violations.append(
+            SchemaViolation(
+                path,
+                f"expected {_type_names(rule.type)}, got {type(value).__name__}",
+            )
+        )
+        return
+    if rule.required:
+        if isinstance(value, Mapping):
+            for key in rule.required:
+                if key not in value:
+                    violations.append(
+                        SchemaViolation(path + (key,), "required key is missing")
+                    )
+        else:
+            message = f"expected a mapping, got {type(value).__name__}"
+            violations.append(SchemaViolation(path, message))
+    if rule.enum is not None and value not in rule.enum:
+        allowed = ", ".join(repr(option) for option in rule.enum)
+        violations.append(SchemaViolation(path, f"{value!r} is not one of {allowed}"))
+    if rule.items is not None and isinstance(value, list):
+        for index, item in enumerate(value):
+            if not _is_instance(item, rule.items):
+                violations.append(
+                    SchemaViolation(
+                        path + (index,),
+                        f"expected {_type_names(rule.items)} item, got "
+                        f"{type(item).__name__}",
+                    )
+                )
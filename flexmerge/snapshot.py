@@ -0,0 +1,402 @@
+"""
+Binary snapshots of merged results with lazy, memory-mapped loading.
+
+A snapshot stores one merged tree together with a metadata header (input
+fingerprints and merger configuration). Loading maps the file into memory
+and decodes nothing up front: each dict level is decoded only when it is
+first accessed, so a service can start from a large precomputed result
+without parsing or merging its layers again.
+
+File layout (all integers little-endian)::
+
+    magic        8 bytes  b"FMSNAP\x00\x03"
+    meta_length  u32      length of the JSON metadata
+    metadata     bytes    UTF-8 JSON object
+    key_count    u32      number of entries in the key table
+    keys         ...      u32 length + UTF-8 bytes for every dict key
+    root         slot     slot of the root dict
+    values       ...      out-of-line value data
+
+Every value is referenced through a 5-byte slot: a tag (``_TAG_*``) and a
+u32 payload. ``None``, booleans, 32-bit ints and strings of up to four UTF-8
+bytes are stored inline in the payload; for everything else the payload is
+the offset of the value's data relative to the start of the value section.
+Dicts are a count followed by ``(key id, slot)`` entries, with keys stored
+once in the key table, and lists are a count followed by slots, so any
+subtree can be decoded without touching its siblings. A snapshot holds at
+most 4 GiB of values. Only JSON-compatible values can be stored: ``None``,
+``bool``, ``int``, ``float``, ``str``, lists and dicts with string keys.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+from .sources import PathLike
+
+_MAGIC = b"FMSNAP\x00\x03"
+
+_TAG_NONE = 0
+_TAG_FALSE = 1
+_TAG_TRUE = 2
+_TAG_INT32 = 3
+_TAG_INT64 = 4
+_TAG_BIGINT = 5
+_TAG_FLOAT = 6
+_TAG_STR = 7
+_TAG_LIST = 8
+_TAG_DICT = 9
+# Inline strings use tags _TAG_SHORT_STR + length, for lengths 0 to 4
+_TAG_SHORT_STR = 10
+
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+_SLOT = struct.Struct("<BI")
+_ENTRY = struct.Struct("<IBI")
+_INT32_MIN = -(1 << 31)
+_INT32_MAX = (1 << 31) - 1
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+_MAX_OFFSET = (1 << 32) - 1
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot file is invalid or a value cannot be stored."""
+
+
+def _encode(value: Any) -> tuple[list[str], bytearray]:
+    """Encode a value tree into a key table and a value section."""
+    buf = bytearray(_SLOT.size)
+    key_ids: dict[str, int] = {}
+    # Entries are (value, position of the slot that references it)
+    stack: list[tuple[Any, int]] = [(value, 0)]
+
+    while stack:
+        item, slot = stack.pop()
+        offset = len(buf)
+        if offset > _MAX_OFFSET:
+            raise SnapshotError("Snapshot value section exceeds 4 GiB")
+
+        if item is None:
+            _SLOT.pack_into(buf, slot, _TAG_NONE, 0)
+        elif item is True:
+            _SLOT.pack_into(buf, slot, _TAG_TRUE, 0)
+        elif item is False:
+            _SLOT.pack_into(buf, slot, _TAG_FALSE, 0)
+        elif isinstance(item, int):
+            if _INT32_MIN <= item <= _INT32_MAX:
+                _SLOT.pack_into(buf, slot, _TAG_INT32, item & 0xFFFFFFFF)
+            elif _INT64_MIN <= item <= _INT64_MAX:
+                _SLOT.pack_into(buf, slot, _TAG_INT64, offset)
+                buf += _I64.pack(item)
+            else:
+                data = str(item).encode("ascii")
+                _SLOT.pack_into(buf, slot, _TAG_BIGINT, offset)
+                buf += _U32.pack(len(data)) + data
+        elif isinstance(item, float):
+            _SLOT.pack_into(buf, slot, _TAG_FLOAT, offset)
+            buf += _F64.pack(item)
+        elif isinstance(item, str):
+            data = item.encode("utf-8")
+            if len(data) <= 4:
+                payload = int.from_bytes(data, "little")
+                _SLOT.pack_into(buf, slot, _TAG_SHORT_STR + len(data), payload)
+            else:
+                _SLOT.pack_into(buf, slot, _TAG_STR, offset)
+                buf += _U32.pack(len(data)) + data
+        elif isinstance(item, list):
+            _SLOT.pack_into(buf, slot, _TAG_LIST, offset)
+            buf += _U32.pack(len(item))
+            slots = len(buf)
+            buf += bytes(_SLOT.size * len(item))
+            for i in range(len(item) - 1, -1, -1):
+                stack.append((item[i], slots + _SLOT.size * i))
+        elif isinstance(item, Mapping):
+            _SLOT.pack_into(buf, slot, _TAG_DICT, offset)
+            buf += _U32.pack(len(item))
+            entries = len(buf)
+            buf += bytes(_ENTRY.size * len(item))
+            children = []
+            for i, (key, child) in enumerate(item.items()):
+                if not isinstance(key, str):
+                    raise SnapshotError(f"Snapshot keys must be strings: {key!r}")
+                entry = entries + _ENTRY.size * i
+                _U32.pack_into(buf, entry, key_ids.setdefault(key, len(key_ids)))
+                children.append((child, entry + 4))
+            stack.extend(reversed(children))
+        else:
+            raise SnapshotError(f"Cannot store value of type {type(item)}")
+
+    return list(key_ids), buf
+
+
+def save_snapshot(
+    path: PathLike, value: Mapping[str, Any], metadata: dict[str, Any] | None = None
+) -> None:
+    """
+    Write a merged result to a snapshot file.
+
+    The file is written to a temporary name and renamed into place, so
+    readers never observe a partially written snapshot.
+
+    Args:
+        path: Destination file
+        value: Merged dictionary to store
+        metadata: JSON-serializable information stored in the header
+
+    Raises:
+        SnapshotError: If the tree contains values that cannot be stored
+    """
+    meta = json.dumps(metadata or {}, sort_keys=True).encode("utf-8")
+    keys, body = _encode(value)
+
+    path = os.fspath(path)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(_MAGIC)
+        f.write(_U32.pack(len(meta)))
+        f.write(meta)
+        f.write(_U32.pack(len(keys)))
+        for key in keys:
+            data = key.encode("utf-8")
+            f.write(_U32.pack(len(data)))
+            f.write(data)
+        f.write(body)
+    os.replace(tmp_path, path)
+
+
+class _Reader:
+    """Decodes values from a mapped snapshot."""
+
+    def __init__(self, data: mmap.mmap, keys: list[str], base: int) -> None:
+        self.data = data
+        self.keys = keys
+        self.base = base
+
+    def _str(self, offset: int) -> str:
+        """Decode a length-prefixed UTF-8 string."""
+        position = self.base + offset
+        (length,) = _U32.unpack_from(self.data, position)
+        return str(self.data[position + 4 : position + 4 + length], "utf-8")
+
+    def scalar(self, tag: int, payload: int) -> Any:
+        """Decode a non-container value from its slot."""
+        if tag >= _TAG_SHORT_STR:
+            return payload.to_bytes(4, "little")[: tag - _TAG_SHORT_STR].decode()
+        if tag == _TAG_INT32:
+            return payload - (1 << 32) if payload > _INT32_MAX else payload
+        if tag == _TAG_STR:
+            return self._str(payload)
+        if tag == _TAG_NONE:
+            return None
+        if tag == _TAG_TRUE:
+            return True
+        if tag == _TAG_FALSE:
+            return False
+        if tag == _TAG_FLOAT:
+            return _F64.unpack_from(self.data, self.base + payload)[0]
+        if tag == _TAG_INT64:
+            return _I64.unpack_from(self.data, self.base + payload)[0]
+        if tag == _TAG_BIGINT:
+            return int(self._str(payload))
+        raise SnapshotError(f"Invalid value tag {tag}")
+
+    def entries(self, offset: int) -> list[tuple[int, int, int]]:
+        """Decode the ``(key id, tag, payload)`` entries of a dict."""
+        position = self.base + offset
+        (count,) = _U32.unpack_from(self.data, position)
+        start = position + 4
+        return list(_ENTRY.iter_unpack(self.data[start : start + _ENTRY.size * count]))
+
+    def elements(self, offset: int) -> list[tuple[int, int]]:
+        """Decode the ``(tag, payload)`` slots of a list."""
+        position = self.base + offset
+        (count,) = _U32.unpack_from(self.data, position)
+        start = position + 4
+        return list(_SLOT.iter_unpack(self.data[start : start + _SLOT.size * count]))
+
+    def decode(self, tag: int, payload: int) -> Any:
+        """Decode a value; dicts are returned as lazy mappings."""
+        if tag == _TAG_DICT:
+            return LazyDict(self, payload)
+        if tag == _TAG_LIST:
+            return [self.decode(*slot) for slot in self.elements(payload)]
+        return self.scalar(tag, payload)
+
+    def materialize(self, tag: int, payload: int) -> Any:
+        """Decode a value completely into plain dicts and lists."""
+        keys = self.keys
+        scalar = self.scalar
+        holder: list[Any] = [None]
+        # Entries are (container, key or index, tag, payload) to decode
+        stack: list[tuple[Any, Any, int, int]] = [(holder, 0, tag, payload)]
+
+        while stack:
+            target, key, tag, payload = stack.pop()
+            if tag == _TAG_DICT:
+                result: dict[str, Any] = {}
+                for key_id, child_tag, child_payload in self.entries(payload):
+                    child_key = keys[key_id]
+                    if child_tag == _TAG_DICT or child_tag == _TAG_LIST:
+                        result[child_key] = None
+                        stack.append((result, child_key, child_tag, child_payload))
+                    else:
+                        result[child_key] = scalar(child_tag, child_payload)
+                target[key] = result
+            elif tag == _TAG_LIST:
+                elements = self.elements(payload)
+                items: list[Any] = [None] * len(elements)
+                for i, (child_tag, child_payload) in enumerate(elements):
+                    if child_tag == _TAG_DICT or child_tag == _TAG_LIST:
+                        stack.append((items, i, child_tag, child_payload))
+                    else:
+                        items[i] = scalar(child_tag, child_payload)
+                target[key] = items
+            else:
+                target[key] = scalar(tag, payload)
+
+        return holder[0]
+
+
+class LazyDict(Mapping):
+    """
+    Read-only mapping over a dict stored in a snapshot.
+
+    The key table of a level is decoded on first access and each value is
+    decoded when it is first read, then cached.
+    """
+
+    __slots__ = ("_reader", "_offset", "_index", "_values")
+
+    def __init__(self, reader: _Reader, offset: int) -> None:
+        self._reader = reader
+        self._offset = offset
+        self._index: dict[str, tuple[int, int]] | None = None
+        self._values: dict[str, Any] = {}
+
+    def _load_index(self) -> dict[str, tuple[int, int]]:
+        """Decode the entry table of this level."""
+        if self._index is None:
+            keys = self._reader.keys
+            self._index = {
+                keys[key_id]: (tag, payload)
+                for key_id, tag, payload in self._reader.entries(self._offset)
+            }
+        return self._index
+
+    def __getitem__(self, key: str) -> Any:
+        values = self._values
+        if key in values:
+            return values[key]
+        value = self._reader.decode(*self._load_index()[key])
+        values[key] = value
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._load_index())
+
+    def __len__(self) -> int:
+        return len(self._load_index())
+
+    def __repr__(self) -> str:
+        return f"LazyDict({len(self)} keys)"
+
+    def to_dict(self) -> dict[str, Any]:
+        """Decode this subtree completely into plain dicts and lists."""
+        result: dict[str, Any] = self._reader.materialize(_TAG_DICT, self._offset)
+        return result
+
+
+def _read_header(data: mmap.mmap, path: PathLike) -> tuple[dict[str, Any], LazyDict]:
+    """Decode the metadata and key table of a mapped snapshot and its root."""
+    if data[: len(_MAGIC)] != _MAGIC:
+        raise SnapshotError(f"Not a snapshot file: {path}")
+
+    position = len(_MAGIC)
+    (meta_length,) = _U32.unpack_from(data, position)
+    position += 4
+    metadata = json.loads(str(data[position : position + meta_length], "utf-8"))
+    if not isinstance(metadata, dict):
+        raise SnapshotError(f"Snapshot metadata is not an object: {path}")
+    position += meta_length
+
+    (key_count,) = _U32.unpack_from(data, position)
+    position += 4
+    keys = []
+    for _ in range(key_count):
+        (length,) = _U32.unpack_from(data, position)
+        keys.append(str(data[position + 4 : position + 4 + length], "utf-8"))
+        position += 4 + length
+
+    tag, payload = _SLOT.unpack_from(data, position)
+    if tag != _TAG_DICT:
+        raise SnapshotError(f"Snapshot root is not a dict: {path}")
+    return metadata, _Reader(data, keys, position).decode(tag, payload)
+
+
+class Snapshot:
+    """
+    An open snapshot file.
+
+    Attributes:
+        metadata: Header metadata stored with the snapshot
+        root: Lazily decoded merged result
+    """
+
+    def __init__(self, path: PathLike) -> None:
+        """
+        Open and map a snapshot file.
+
+        Args:
+            path: Snapshot file to open
+
+        Raises:
+            SnapshotError: If the file is not a valid snapshot
+        """
+        with open(path, "rb") as f:
+            try:
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                raise SnapshotError(f"Not a snapshot file: {path}") from e
+
+        data = self._data
+        try:
+            self.metadata, self.root = _read_header(data, path)
+        except (struct.error, UnicodeDecodeError, json.JSONDecodeError) as e:
+            data.close()
+            raise SnapshotError(f"Corrupt snapshot file {path}: {e}") from e
+        except BaseException:
+            data.close()
+            raise
+
+    def close(self) -> None:
+        """Close the underlying memory map."""
+        self._data.close()
+
+    def __enter__(self) -> Snapshot:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def load_snapshot(path: PathLike) -> Snapshot:
+    """
+    Open a snapshot file for lazy reading.
+
+    Args:
+        path: Snapshot file to open
+
+    Returns:
+        Open snapshot; its ``root`` decodes subtrees on access
+
+    Raises:
+        SnapshotError: If the file is not a valid snapshot
+    """
+    return Snapshot(path)
@@ -0,0 +1,385 @@
+"""
+Layer sources that load dictionaries to merge from outside the program.
+
+Configuration files are parsed with the standard library (``json`` and
+``tomllib``) and kept in a bounded cache keyed on path, inode, modification
+time and size, so reloading a set of files only parses the ones that
+changed. Environment variables such as ``APP__DATABASE__HOST`` are turned
+into a sparse overlay by ``EnvSource``, which caches it until the
+variables change.
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import mmap
+import os
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Callable, Union
+
+from .conflicts import format_path
+from .paths import PathTrie, Pattern
+
+# Imported by name: which module exists depends on the Python version
+tomllib: Any
+try:
+    tomllib = importlib.import_module("tomllib")
+except ImportError:  # pragma: no cover - Python < 3.11
+    try:
+        tomllib = importlib.import_module("tomli")
+    except ImportError:
+        tomllib = None
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+_MISSING = object()
+
+
+def _parse_json(text: str) -> Any:
+    """Parse a JSON document."""
+    return json.loads(text)
+
+
+def _parse_toml(text: str) -> Any:
+    """Parse a TOML document."""
+    if tomllib is None:  # pragma: no cover - Python < 3.11
+        raise ImportError("TOML support requires Python 3.11+ or the 'tomli' package")
+    return tomllib.loads(text)
+
+
+FILE_PARSERS: dict[str, Callable[[str], Any]] = {
+    ".json": _parse_json,
+    ".toml": _parse_toml,
+}
+
+
+def _parser_for(path: str) -> Callable[[str], Any]:
+    """Return the parser for a file based on its extension."""
+    suffix = os.path.splitext(path)[1].lower()
+    parser = FILE_PARSERS.get(suffix)
+    if parser is None:
+        raise ValueError(f"Unsupported file format: {suffix or path}")
+    return parser
+
+
+def _read_text(path: str, size: int, mmap_threshold: int) -> str:
+    """
+    Read a UTF-8 file, memory mapping it when it is large.
+
+    Decoding straight from the mapped pages avoids building an intermediate
+    bytes object the size of the file.
+    """
+    with open(path, "rb") as f:
+        if size >= mmap_threshold and size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return str(mapped, "utf-8")
+        return f.read().decode("utf-8")
+
+
+def load_file(path: PathLike, mmap_threshold: int = 1 << 20) -> Any:
+    """
+    Parse a JSON or TOML file without caching it.
+
+    Args:
+        path: Path to a ``.json`` or ``.toml`` file
+        mmap_threshold: File size in bytes from which the file is read
+            through ``mmap``
+
+    Returns:
+        Parsed document
+
+    Raises:
+        ValueError: If the file extension is not supported
+        OSError: If the file cannot be read
+    """
+    path = os.fspath(path)
+    parser = _parser_for(path)
+    return parser(_read_text(path, os.stat(path).st_size, mmap_threshold))
+
+
+class ParseCache:
+    """
+    Bounded cache of parsed configuration files.
+
+    Entries are looked up by path and reused only while the file's inode,
+    modification time and size are unchanged; otherwise the file is parsed
+    again. The least recently used entry is evicted once ``max_entries`` is
+    reached. The cache is safe to share between threads.
+
+    Cached documents are returned as-is and are shared by every caller, so
+    they must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 128, mmap_threshold: int = 1 << 20) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of parsed documents kept
+            mmap_threshold: File size in bytes from which files are read
+                through ``mmap``
+
+        Raises:
+            ValueError: If max_entries is less than 1
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.mmap_threshold = mmap_threshold
+        self._entries: OrderedDict[str, tuple[tuple[int, int, int], Any]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def load(self, path: PathLike) -> Any:
+        """
+        Return the parsed document for a file, parsing it only if it changed.
+
+        Args:
+            path: Path to a ``.json`` or ``.toml`` file
+
+        Returns:
+            Parsed document
+
+        Raises:
+            ValueError: If the file extension is not supported
+            OSError: If the file cannot be read
+        """
+        path = os.path.abspath(os.fspath(path))
+        parser = _parser_for(path)
+
+        stat = os.stat(path)
+        signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(path)
+                return entry[1]
+
+        document = parser(_read_text(path, stat.st_size, self.mmap_threshold))
+
+        with self._lock:
+            self._entries[path] = (signature, document)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return document
+
+    def invalidate(self, path: PathLike | None = None) -> None:
+        """
+        Drop cached documents.
+
+        Args:
+            path: File to forget; all entries are dropped when omitted
+        """
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(os.fspath(path)), None)
+
+    def __contains__(self, path: object) -> bool:
+        """Check whether a file currently has a cached entry."""
+        if not isinstance(path, (str, os.PathLike)):
+            return False
+        with self._lock:
+            return os.path.abspath(os.fspath(path)) in self._entries
+
+    def __len__(self) -> int:
+        """Number of cached documents."""
+        return len(self._entries)
+
+
+# Cache shared by Merger.merge_files when no cache is given
+DEFAULT_PARSE_CACHE = ParseCache()
+
+
+# Numbers as JSON spells them, with ASCII digits only: no leading zeros,
+# signs other than a leading minus, underscores or bare decimal points
+_JSON_NUMBER = re.compile(r"-?(?:0|[1-9][0-9]*)(\.[0-9]+)?([eE][+-]?[0-9]+)?")
+
+
+def coerce_env_value(value: str) -> Any:
+    """
+    Convert an environment variable to the JSON value it spells, if any.
+
+    ``true``/``false``/``null`` (in any case) and JSON numbers become
+    booleans, None and numbers; values starting with ``[`` or ``{`` are
+    parsed as JSON. Anything else, including malformed JSON and numbers
+    JSON would reject (``01234``, ``1_000``, ``+5``), stays a string.
+    """
+    lowered = value.lower()
+    if lowered == "true":
+        return True
+    if lowered == "false":
+        return False
+    if lowered == "null":
+        return None
+    first = value[:1]
+    if first == "[" or first == "{":
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    number = _JSON_NUMBER.fullmatch(value)
+    if number is not None:
+        fraction, exponent = number.groups()
+        if fraction is None and exponent is None:
+            return int(value)
+        return float(value)
+    return value
+
+
+class EnvSource:
+    """
+    Layer built from environment variables with a common prefix.
+
+    Variable names are split on ``separator`` after the prefix, so with
+    the prefix ``"APP"`` the variable ``APP__DATABASE__PORT=5432`` becomes
+    ``{"database": {"port": 5432}}``. The key path of every variable name
+    is computed once and kept, and the overlay is rebuilt only when a
+    prefixed variable was added, removed or changed since the last
+    ``load``; otherwise the same overlay is returned, so it must be treated
+    as read-only. Variables without keys after the prefix, or with an empty
+    key, are ignored.
+
+    Example:
+        >>> env = EnvSource("APP", environ={"APP__DB__PORT": "5432"})
+        >>> env.load()
+        {'db': {'port': 5432}}
+        >>> Merger().merge_files("base.toml", EnvSource("APP"))
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        separator: str = "__",
+        coerce: Callable[[str], Any] | None = coerce_env_value,
+        types: Mapping[Pattern, Callable[[str], Any]] | None = None,
+        lowercase: bool = True,
+        environ: Mapping[str, str] | None = None,
+    ) -> None:
+        """
+        Initialize the source.
+
+        Args:
+            prefix: Name prefix of the variables to read, without the
+                separator; an empty prefix reads every variable
+            separator: String separating the keys in variable names
+            coerce: Conversion applied to values, or None to keep strings
+            types: Conversions for particular key paths, overriding
+                ``coerce``; patterns use the keys as they appear in the
+                overlay and may contain ``"*"``
+            lowercase: Lowercase the keys taken from variable names
+            environ: Variables to read (default: ``os.environ``)
+
+        Raises:
+            ValueError: If separator is empty
+        """
+        if not separator:
+            raise ValueError("separator must not be empty")
+        self.prefix = prefix
+        self.separator = separator
+        self.coerce = coerce
+        self.lowercase = lowercase
+        self.environ = os.environ if environ is None else environ
+        self._name_prefix = prefix + separator if prefix else ""
+        self._types = None if types is None else PathTrie.compile(types)
+        # Variable name -> (key path, conversion), or None for ignored names
+        self._compiled: dict[
+            str, tuple[tuple[str, ...], Callable[[str], Any] | None] | None
+        ] = {}
+        self._cached: tuple[tuple[tuple[str, str], ...], dict[str, Any]] | None
+        self._cached = None
+
+    def load(self) -> dict[str, Any]:
+        """
+        Return the overlay for the current environment.
+
+        Returns:
+            Nested dict of the prefixed variables
+
+        Raises:
+            ValueError: If one variable sets a value and another sets keys
+                below it
+        """
+        name_prefix = self._name_prefix
+        variables = tuple(
+            (name, value)
+            for name, value in self.environ.items()
+            if name.startswith(name_prefix)
+        )
+        cached = self._cached
+        if cached is not None and cached[0] == variables:
+            return cached[1]
+
+        overlay = self._build(variables)
+        self._cached = (variables, overlay)
+        return overlay
+
+    def _compile(
+        self, name: str
+    ) -> tuple[tuple[str, ...], Callable[[str], Any] | None] | None:
+        """Compute the key path and conversion for a variable name."""
+        rest = name[len(self._name_prefix) :]
+        if self.lowercase:
+            rest = rest.lower()
+        path = tuple(rest.split(self.separator))
+        if not all(path):
+            return None
+
+        convert = self.coerce
+        if self._types is not None:
+            nodes: tuple[PathTrie, ...] = (self._types,)
+            for key in path:
+                nodes = PathTrie.step(nodes, key)
+            values = PathTrie.values(nodes)
+            if values:
+                # Literal keys are followed before wildcards
+                convert = values[0]
+        return path, convert
+
+    def _build(self, variables: tuple[tuple[str, str], ...]) -> dict[str, Any]:
+        """Build the overlay from prefixed variables."""
+        compiled = self._compiled
+        overlay: dict[str, Any] = {}
+        # Dicts created for intermediate keys, as opposed to values
+        created = {id(overlay)}
+
+        for name, raw in variables:
+            if name in compiled:
+                entry = compiled[name]
+            else:
+                entry = compiled[name] = self._compile(name)
+            if entry is None:
+                continue
+            path, convert = entry
+
+            node = overlay
+            for depth, key in enumerate(path):
+                child = node.get(key, _MISSING)
+                if child is not _MISSING and (
+                    depth == len(path) - 1 or id(child) not in created
+                ):
+                    raise ValueError(
+                        f"Environment variable {name} conflicts with another "
+                        f"variable at '{format_path(path[: depth + 1])}'"
+                    )
+                if depth == len(path) - 1:
+                    node[key] = raw if convert is None else convert(raw)
+                elif child is _MISSING:
+                    child = node[key] = {}
+                    created.add(id(child))
+                node = child
+
+        return overlay
+
+    def __repr__(self) -> str:
+        """String representation of the source."""
+        return f"EnvSource(prefix={self.prefix!r}, separator={self.separator!r})"
@@ -5,8 +5,16 @@ This module defines the strategy protocols and provides built-in strategies
 for common merge operations.
 """
 
+from __future__ import annotations
+
+import operator
+from collections.abc import Mapping
 from enum import Enum
-from typing import Any, Protocol
+from typing import Any, Callable, Protocol
+
+from .context import MergeContext
+from .dedupe import unique_approx, unique_partitioned
+from .engine import IterativeEngine, _lift_scalars
 
 
 class ListStrategy(Protocol):
@@ -25,6 +33,78 @@ class DictStrategy(Protocol):
         ...
 
 
+class ScalarStrategy(Protocol):
+    """Protocol for scalar merge strategies."""
+
+    def __call__(self, left: Any, right: Any) -> Any:
+        """Combine two scalar values set at the same path."""
+        ...
+
+
+class ContextStrategy:
+    """
+    Wrapper marking a strategy that takes a ``MergeContext`` (protocol v2).
+
+    The wrapped function is called as ``func(left, right, ctx)``. It works
+    as a dict or list strategy; as a dict strategy it is called for every
+    pair of nested mappings the walk meets, and it can delegate to the
+    default deep merge with ``ctx.recurse(left, right)``. When called with
+    only two arguments (as v1 strategies are), a top-level context without
+    a merger is created.
+    """
+
+    accepts_context = True
+
+    def __init__(self, func: Callable[..., Any]) -> None:
+        """
+        Initialize the wrapper.
+
+        Args:
+            func: Strategy taking ``(left, right, ctx)``
+        """
+        self.func = func
+        self.__name__ = getattr(func, "__name__", type(func).__name__)
+        self.__doc__ = getattr(func, "__doc__", None)
+
+    def __call__(self, left: Any, right: Any, ctx: MergeContext | None = None) -> Any:
+        """Run the strategy, creating a context if none is given."""
+        if ctx is None:
+            if isinstance(left, Mapping) and isinstance(right, Mapping):
+                ctx = MergeContext.root(None, self, _append_lists)
+            else:
+                ctx = MergeContext.root(None, None, self)
+        return self.func(left, right, ctx)
+
+    def __repr__(self) -> str:
+        """String representation of the strategy."""
+        return f"context_strategy({self.__name__})"
+
+
+def context_strategy(func: Callable[[Any, Any, MergeContext], Any]) -> ContextStrategy:
+    """
+    Mark a function taking ``(left, right, ctx)`` as a v2 strategy.
+
+    Args:
+        func: Strategy function receiving a ``MergeContext``
+
+    Returns:
+        Strategy usable with ``Merger.dicts`` or ``Merger.lists``
+
+    Example:
+        >>> @context_strategy
+        ... def keep_secrets(left, right, ctx):
+        ...     if ctx.path[-1:] == ("secrets",):
+        ...         return left
+        ...     return ctx.recurse(left, right)
+        >>> Merger().dicts(keep_secrets).merge(
+        ...     {"secrets": {"key": "a"}, "n": {"x": 1}},
+        ...     {"secrets": {"key": "b"}, "n": {"y": 2}},
+        ... )
+        {'secrets': {'key': 'a'}, 'n': {'x': 1, 'y': 2}}
+    """
+    return ContextStrategy(func)
+
+
 class BuiltinListStrategies(Enum):
     """Enumeration of built-in list merge strategies."""
 
@@ -33,6 +113,10 @@ class BuiltinListStrategies(Enum):
     UNIQUE = "unique"
     REPLACE = "replace"
     KEEP = "keep"
+    SORTED_MERGE = "sorted_merge"
+    SORTED_UNIQUE = "sorted_unique"
+    UNIQUE_APPROX = "unique_approx"
+    UNIQUE_PARTITIONED = "unique_partitioned"
 
 
 class BuiltinDictStrategies(Enum):
@@ -44,6 +128,18 @@ class BuiltinDictStrategies(Enum):
     KEEP = "keep"
 
 
+class BuiltinScalarStrategies(Enum):
+    """Enumeration of built-in scalar merge strategies."""
+
+    REPLACE = "replace"
+    SUM = "sum"
+    MIN = "min"
+    MAX = "max"
+    COUNT = "count"
+    FIRST_NON_NULL = "first_non_null"
+    LAST_NON_NULL = "last_non_null"
+
+
 def _append_lists(left: list[Any], right: list[Any]) -> list[Any]:
     """Append right list to left list."""
     return left + right
@@ -95,30 +191,130 @@ def _keep_lists(left: list[Any], right: list[Any]) -> list[Any]:
     return left
 
 
+class SortedListStrategy:
+    """
+    List strategy for lists that are already sorted.
+
+    Both inputs must be sorted by the same key and order. The two runs are
+    merged with a single two-pointer pass, computing each item's key once,
+    so the cost is O(n + m) without concatenating and re-sorting the
+    lists. When the runs do not overlap the lists are simply concatenated.
+    Equal items keep left before right. With ``unique`` set, items whose
+    key equals the previous item's key are dropped while merging, which
+    gives the same result as ``sorted(set(left + right))`` without hashing
+    or a full sort.
+    """
+
+    def __init__(
+        self,
+        key: Callable[[Any], Any] | None = None,
+        reverse: bool = False,
+        unique: bool = False,
+    ) -> None:
+        """
+        Initialize the strategy.
+
+        Args:
+            key: Function extracting the sort key from each item
+            reverse: Whether the inputs are sorted in descending order
+            unique: Whether to drop items with equal keys
+        """
+        self.key = key
+        self.reverse = reverse
+        self.unique = unique
+
+    def __call__(self, left: list[Any], right: list[Any]) -> list[Any]:
+        """Merge two sorted lists into one sorted list."""
+        key = self.key
+        left_keys = left if key is None else [key(item) for item in left]
+        right_keys = right if key is None else [key(item) for item in right]
+        # Whether a key sorts strictly before another in the lists' order
+        before = operator.gt if self.reverse else operator.lt
+        unique = self.unique
+
+        if not unique and (
+            not left or not right or not before(right_keys[0], left_keys[-1])
+        ):
+            return left + right
+
+        result: list[Any] = []
+        append = result.append
+        last: Any = None
+        i = j = 0
+        left_length = len(left)
+        right_length = len(right)
+        while i < left_length and j < right_length:
+            # Right goes first only when strictly before, keeping ties stable
+            if before(right_keys[j], left_keys[i]):
+                item, item_key = right[j], right_keys[j]
+                j += 1
+            else:
+                item, item_key = left[i], left_keys[i]
+                i += 1
+            if not unique:
+                append(item)
+            elif not result or item_key != last:
+                append(item)
+                last = item_key
+
+        if not unique:
+            result.extend(left[i:])
+            result.extend(right[j:])
+            return result
+        for items, keys, start in ((left, left_keys, i), (right, right_keys, j)):
+            for index in range(start, len(items)):
+                item_key = keys[index]
+                if not result or item_key != last:
+                    append(items[index])
+                    last = item_key
+        return result
+
+    def __repr__(self) -> str:
+        """String representation of the strategy."""
+        name = "sorted_unique" if self.unique else "sorted_merge"
+        return f"{name}(key={self.key!r}, reverse={self.reverse!r})"
+
+
+def sorted_merge(
+    key: Callable[[Any], Any] | None = None, reverse: bool = False
+) -> SortedListStrategy:
+    """
+    Create a list strategy that merges two pre-sorted lists in linear time.
+
+    Args:
+        key: Function extracting the sort key from each item
+        reverse: Whether the inputs are sorted in descending order
+
+    Returns:
+        List strategy usable with ``Merger.lists``
+    """
+    return SortedListStrategy(key=key, reverse=reverse)
+
+
+def sorted_unique(
+    key: Callable[[Any], Any] | None = None, reverse: bool = False
+) -> SortedListStrategy:
+    """
+    Create a list strategy that merges pre-sorted lists and drops duplicates.
+
+    Args:
+        key: Function extracting the sort key from each item
+        reverse: Whether the inputs are sorted in descending order
+
+    Returns:
+        List strategy usable with ``Merger.lists``
+    """
+    return SortedListStrategy(key=key, reverse=reverse, unique=True)
+
+
+_ITERATIVE_ENGINE = IterativeEngine()
+
+
 def _deep_merge_dicts_with_strategy(
     left: dict[str, Any], right: dict[str, Any], list_strategy: ListStrategy
 ) -> dict[str, Any]:
     """Deep merge two dictionaries with optional list strategy."""
-    result = left.copy()
-
-    for key, right_value in right.items():
-        if key in result:
-            left_value = result[key]
-            if isinstance(left_value, dict) and isinstance(right_value, dict):
-                # Recursively merge nested dictionaries
-                result[key] = _deep_merge_dicts_with_strategy(
-                    left_value, right_value, list_strategy
-                )
-            elif isinstance(left_value, list) and isinstance(right_value, list):
-                # Use the provided list strategy
-                result[key] = list_strategy(left_value, right_value)
-            else:
-                # Replace with right value
-                result[key] = right_value
-        else:
-            result[key] = right_value
-
-    return result
+    return _ITERATIVE_ENGINE.merge(left, right, list_strategy)
 
 
 def _deep_merge_dicts(left: dict[str, Any], right: dict[str, Any]) -> dict[str, Any]:
@@ -143,6 +339,242 @@ def _keep_dicts(left: dict[str, Any], right: dict[str, Any]) -> dict[str, Any]:
     return left
 
 
+def _replace_scalars(left: Any, right: Any) -> Any:
+    """Replace left value with right value."""
+    return right
+
+
+def _sum_scalars(left: Any, right: Any) -> Any:
+    """Add two values; None counts as missing."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    return left + right
+
+
+def _min_scalars(left: Any, right: Any) -> Any:
+    """Keep the smaller value; None counts as missing."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    return right if right < left else left
+
+
+def _max_scalars(left: Any, right: Any) -> Any:
+    """Keep the larger value; None counts as missing."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    return right if right > left else left
+
+
+def _first_non_null_scalars(left: Any, right: Any) -> Any:
+    """Keep the left value unless it is None."""
+    return right if left is None else left
+
+
+def _last_non_null_scalars(left: Any, right: Any) -> Any:
+    """Take the right value unless it is None."""
+    return left if right is None else right
+
+
+class CountScalarStrategy:
+    """
+    Scalar strategy counting the layers that set each scalar value.
+
+    A scalar entering the result starts the count at 1 (``initial``), and
+    each later layer setting the same path adds one, whatever its value.
+    """
+
+    @staticmethod
+    def initial(value: Any) -> int:
+        """Start the count for a scalar set by one layer."""
+        return 1
+
+    def __call__(self, left: int, right: Any) -> int:
+        """Count one more layer setting the value."""
+        return left + 1
+
+    def __repr__(self) -> str:
+        """String representation of the strategy."""
+        return "count"
+
+
+_NO_KEY = object()
+
+
+class KeyedListStrategy:
+    """
+    List strategy that merges dict records sharing the same key value.
+
+    A hash index is built over the right list, so matching is O(n + m)
+    instead of a nested loop. Matched records are merged through
+    ``ctx.recurse``, so the merger's scalar, list and dict strategies apply
+    inside them; the key field is left out of that merge and keeps the left
+    record's value. Left order is preserved and unmatched right records are
+    appended in their original order. Items that are not dicts, lack the key
+    or have an unhashable key value are never matched.
+
+    When called directly without a context, matched records are deep merged
+    with this strategy used for nested lists.
+    """
+
+    accepts_context = True
+
+    def __init__(self, key: str) -> None:
+        """
+        Initialize the strategy.
+
+        Args:
+            key: Record field used to match items of both lists
+        """
+        self.key = key
+
+    def _record_key(self, item: Any) -> Any:
+        """Return the hashable key value of a record, or ``_NO_KEY``."""
+        if not isinstance(item, dict) or self.key not in item:
+            return _NO_KEY
+        value = item[self.key]
+        try:
+            hash(value)
+        except TypeError:
+            return _NO_KEY
+        return value
+
+    def lift_items(self, items: list[Any], initial: Callable[[Any], Any]) -> list[Any]:
+        """
+        Lift the records of a list entering the result for a scalar reducer.
+
+        Record fields are merged by the scalar strategy, so they start from
+        its ``initial`` value like the fields of a mapping. Key fields and
+        items that are not records are kept as they are.
+
+        Args:
+            items: List taken from one layer
+            initial: ``initial`` step of the scalar strategy
+
+        Returns:
+            New list with lifted records
+        """
+
+        def lift_list(nested: list[Any]) -> list[Any]:
+            return self.lift_items(nested, initial)
+
+        return [
+            (
+                self._keep_key(item, _lift_scalars(item, initial, lift_list))
+                if isinstance(item, Mapping)
+                else item
+            )
+            for item in items
+        ]
+
+    def _keep_key(self, record: Mapping[str, Any], lifted: Any) -> Any:
+        """Restore the key field of a record after its fields were lifted."""
+        if self.key in record:
+            lifted[self.key] = record[self.key]
+        return lifted
+
+    def _merge_records(
+        self,
+        left: dict[str, Any],
+        right: dict[str, Any],
+        ctx: MergeContext,
+    ) -> Any:
+        """Merge two matching records, leaving the key field out of the merge."""
+        key = self.key
+        merged = ctx.recurse(
+            {name: value for name, value in left.items() if name != key},
+            {name: value for name, value in right.items() if name != key},
+        )
+        # Fields keep the left record's order, the key included
+        result = dict.fromkeys(left)
+        result.update(merged)
+        result[key] = left[key]
+        return result
+
+    def _enter(self, item: Any, ctx: MergeContext) -> Any:
+        """Prepare a right item that is appended without a match."""
+        if not isinstance(item, Mapping):
+            return item
+        return self._keep_key(item, ctx.lift(item))
+
+    def __call__(
+        self, left: list[Any], right: list[Any], ctx: MergeContext | None = None
+    ) -> list[Any]:
+        """Merge two lists of records by key."""
+        if ctx is None:
+            ctx = MergeContext.root(None, None, self)
+        # Right records by key, duplicates kept in order so that each one
+        # is merged in as a later layer would be
+        index: dict[Any, list[Any]] = {}
+        # Right items in order; keyed records are stored by key so that
+        # duplicates are appended only once
+        pending: list[tuple[bool, Any]] = []
+
+        for item in right:
+            record_key = self._record_key(item)
+            if record_key is _NO_KEY:
+                pending.append((False, item))
+            elif record_key in index:
+                index[record_key].append(item)
+            else:
+                index[record_key] = [item]
+                pending.append((True, record_key))
+
+        result = []
+        matched = set()
+        for item in left:
+            record_key = self._record_key(item)
+            if record_key is not _NO_KEY and record_key in index:
+                for record in index[record_key]:
+                    item = self._merge_records(item, record, ctx)
+                result.append(item)
+                matched.add(record_key)
+            else:
+                result.append(item)
+
+        for is_keyed, value in pending:
+            if not is_keyed:
+                result.append(self._enter(value, ctx))
+            elif value not in matched:
+                first, *rest = index[value]
+                merged = self._enter(first, ctx)
+                for record in rest:
+                    merged = self._merge_records(merged, record, ctx)
+                result.append(merged)
+
+        return result
+
+    def __repr__(self) -> str:
+        """String representation of the strategy."""
+        return f"by_key({self.key!r})"
+
+
+def by_key(key: str) -> KeyedListStrategy:
+    """
+    Create a list strategy that merges lists of dict records by a key field.
+
+    Args:
+        key: Record field used to match items, e.g. ``"name"`` or ``"id"``
+
+    Returns:
+        List strategy usable with ``Merger.lists``
+
+    Example:
+        >>> merger = Merger().lists(by_key("name"))
+        >>> merger.merge(
+        ...     {"services": [{"name": "web", "port": 80}]},
+        ...     {"services": [{"name": "web", "tls": True}, {"name": "db"}]},
+        ... )
+        {'services': [{'name': 'web', 'port': 80, 'tls': True}, {'name': 'db'}]}
+    """
+    return KeyedListStrategy(key)
+
+
 # Built-in strategy implementations
 BUILTIN_LIST_STRATEGIES: dict[str, ListStrategy] = {
     BuiltinListStrategies.APPEND.value: _append_lists,
@@ -150,6 +582,10 @@ BUILTIN_LIST_STRATEGIES: dict[str, ListStrategy] = {
     BuiltinListStrategies.UNIQUE.value: _unique_lists,
     BuiltinListStrategies.REPLACE.value: _replace_lists,
     BuiltinListStrategies.KEEP.value: _keep_lists,
+    BuiltinListStrategies.SORTED_MERGE.value: sorted_merge(),
+    BuiltinListStrategies.SORTED_UNIQUE.value: sorted_unique(),
+    BuiltinListStrategies.UNIQUE_APPROX.value: unique_approx(),
+    BuiltinListStrategies.UNIQUE_PARTITIONED.value: unique_partitioned(),
 }
 
 BUILTIN_DICT_STRATEGIES: dict[str, DictStrategy] = {
@@ -158,3 +594,13 @@ BUILTIN_DICT_STRATEGIES: dict[str, DictStrategy] = {
     BuiltinDictStrategies.REPLACE.value: _replace_dicts,
     BuiltinDictStrategies.KEEP.value: _keep_dicts,
 }
+
+BUILTIN_SCALAR_STRATEGIES: dict[str, ScalarStrategy] = {
+    BuiltinScalarStrategies.REPLACE.value: _replace_scalars,
+    BuiltinScalarStrategies.SUM.value: _sum_scalars,
+    BuiltinScalarStrategies.MIN.value: _min_scalars,
+    BuiltinScalarStrategies.MAX.value: _max_scalars,
+    BuiltinScalarStrategies.COUNT.value: CountScalarStrategy(),
+    BuiltinScalarStrategies.FIRST_NON_NULL.value: _first_non_null_scalars,
+    BuiltinScalarStrategies.LAST_NON_NULL.value: _last_non_null_scalars,
+}
@@ -0,0 +1,282 @@
+"""
+Merging straight into a JSON stream without building the result.
+
+The layers are walked together one level at a time. At each level the keys
+of all layers are taken in the order ``merge`` would give them, and for
+every key the values the layers set are resolved the way the engines
+would: a trailing run of mappings is descended into and written member by
+member, anything else is folded into its final value with the list and
+scalar strategies and encoded on its own. Only the key lists of the levels
+on the current path and the value being written are held in memory, and
+the output is collected into chunks before being written. Containers
+holding only scalars are encoded in one call to the JSON encoder.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import IO, TYPE_CHECKING, Any, Callable
+
+from .context import accepts_context
+from .engine import (
+    _ATOMIC_TYPES,
+    _MISSING,
+    _is_scalar,
+    _lift_scalars,
+    _list_lifter,
+)
+from .strategies import BUILTIN_DICT_STRATEGIES
+
+if TYPE_CHECKING:
+    from .merger import Merger
+
+# Output pieces collected before each write; pieces are mostly short
+# tokens, so chunks come to some tens of kilobytes
+_CHUNK_PIECES = 4096
+
+
+class _ChunkWriter:
+    """Collect text pieces and write them to a text or binary stream in chunks."""
+
+    def __init__(self, fp: IO[Any]) -> None:
+        self.fp = fp
+        self.binary = isinstance(fp, (io.RawIOBase, io.BufferedIOBase)) or (
+            "b" in getattr(fp, "mode", "")
+        )
+        self.buffer: list[str] = []
+
+    def flush(self) -> None:
+        """Write the collected pieces as one chunk."""
+        data = "".join(self.buffer)
+        self.buffer.clear()
+        if data:
+            self.fp.write(data.encode("utf-8") if self.binary else data)
+
+
+def _key_string(key: Any) -> str:
+    """Convert a key to a JSON object key as ``json.dumps`` does."""
+    if isinstance(key, str):
+        return key
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, int):
+        return int.__repr__(key)
+    if isinstance(key, float):
+        return json.dumps(key)
+    raise TypeError(
+        f"keys must be str, int, float, bool or None, not {type(key).__name__}"
+    )
+
+
+def _is_flat(values: Iterable[Any]) -> bool:
+    """Check whether container values are all immutable scalars."""
+    for value in values:
+        if type(value) not in _ATOMIC_TYPES:
+            return False
+    return True
+
+
+def _encode_flat(
+    value: dict[Any, Any] | list[Any],
+    encode_scalar: Callable[[Any], str],
+    indent: str,
+    level: int,
+    sort_keys: bool,
+) -> str:
+    """Encode a container of scalars with indentation, as ``json.dumps`` would."""
+    if not value:
+        return "{}" if isinstance(value, dict) else "[]"
+    if isinstance(value, dict):
+        items = sorted(value.items()) if sort_keys else value.items()
+        parts = [
+            f"{encode_scalar(_key_string(key))}: {encode_scalar(item)}"
+            for key, item in items
+        ]
+        opening, closing = "{", "}"
+    else:
+        parts = [encode_scalar(item) for item in value]
+        opening, closing = "[", "]"
+    inner = "\n" + indent * (level + 1)
+    return opening + inner + ("," + inner).join(parts) + "\n" + indent * level + closing
+
+
+def _fold(
+    values: Sequence[Any],
+    merge_lists: Callable[[list[Any], list[Any]], list[Any]],
+    scalars: Any,
+    initial: Any,
+    lift_list: Callable[[list[Any]], list[Any]] | None = None,
+) -> Any:
+    """Combine values that are not all mappings the way the engines would."""
+    result = values[0]
+    if initial is not None:
+        result = _lift_scalars(result, initial, lift_list)
+    for value in values[1:]:
+        if isinstance(result, list) and isinstance(value, list):
+            result = merge_lists(result, value)
+        elif scalars is None:
+            result = value
+        elif _is_scalar(result) and _is_scalar(value):
+            result = scalars(result, value)
+        elif initial is not None:
+            result = _lift_scalars(value, initial, lift_list)
+        else:
+            result = value
+    return result
+
+
+def merge_to_stream(
+    merger: Merger,
+    fp: IO[Any],
+    layers: Sequence[Mapping[str, Any]],
+    indent: int | str | None = None,
+    sort_keys: bool = False,
+) -> None:
+    """
+    Merge layers and write the result to a stream as JSON.
+
+    The output is the same as ``json.dump(merger.merge(*layers), fp,
+    indent=indent, sort_keys=sort_keys)``.
+
+    Args:
+        merger: Merger whose strategies are applied
+        fp: Text or binary stream; binary streams receive UTF-8
+        layers: Mappings in merge order
+        indent: Indentation as for ``json.dump``
+        sort_keys: Write the keys of every object in sorted order
+
+    Raises:
+        ValueError: If the dict strategy cannot be applied while streaming
+        TypeError: If a key or value cannot be encoded as JSON
+    """
+    strategy = merger._dict_strategy
+    if strategy is BUILTIN_DICT_STRATEGIES["deep"]:
+        deep = True
+    elif strategy is BUILTIN_DICT_STRATEGIES["shallow"]:
+        deep = False
+    else:
+        raise ValueError(
+            "Streaming merge requires the 'deep' or 'shallow' dict strategy"
+        )
+
+    if isinstance(indent, int):
+        indent = " " * indent
+    encoder = json.JSONEncoder(
+        indent=indent,
+        sort_keys=sort_keys,
+        separators=(",", ": ") if indent is not None else (", ", ": "),
+    )
+    item_separator = encoder.item_separator
+    # Scalars encode the same with any indentation; without it the C
+    # encoder is used
+    encode_scalar = json.JSONEncoder().encode
+    scalars = merger._scalar_merge()
+    initial = getattr(scalars, "initial", None) if deep else None
+    list_strategy = merger._list_strategy
+    lift_list = _list_lifter(list_strategy, initial)
+    # Context-aware list strategies are given the path of the list
+    root = merger._context_root() if accepts_context(list_strategy) else None
+    out = _ChunkWriter(fp)
+    buffer = out.buffer
+    write = buffer.append
+
+    def keys_of(run: Sequence[Mapping[str, Any]]) -> Iterator[Any]:
+        if len(run) == 1:
+            keys: Any = run[0].keys()
+        else:
+            keys = dict.fromkeys(key for mapping in run for key in mapping)
+        return iter(sorted(keys) if sort_keys else keys)
+
+    # Each entry is a level being written: the run of mappings merged into
+    # it, its remaining keys, its nesting level, how many members were
+    # written so far and its path
+    stack: list[list[Any]] = [[layers, keys_of(layers), 0, 0, ()]]
+    write("{")
+    while stack:
+        frame = stack[-1]
+        run, keys, level, written, path = frame
+        if len(buffer) >= _CHUNK_PIECES:
+            out.flush()
+        key = next(keys, _MISSING)
+        if key is _MISSING:
+            stack.pop()
+            if written and indent is not None:
+                write("\n" + indent * level)
+            write("}")
+            continue
+
+        if len(run) == 1:
+            values = [run[0][key]]
+        else:
+            values = [
+                value
+                for value in (mapping.get(key, _MISSING) for mapping in run)
+                if value is not _MISSING
+            ]
+
+        if written:
+            write(item_separator)
+        if indent is not None:
+            write("\n" + indent * (level + 1))
+        frame[3] = written + 1
+        write(encode_scalar(_key_string(key)))
+        write(": ")
+
+        last = values[-1]
+        if not deep:
+            value = last
+        elif isinstance(last, Mapping):
+            # Only the trailing run of mappings is merged; anything before
+            # it was replaced
+            start = len(values) - 1
+            while start and isinstance(values[start - 1], Mapping):
+                start -= 1
+            nested = values[start:]
+            if len(nested) > 1 or initial is not None or not _is_flat(last.values()):
+                write("{")
+                stack.append([nested, keys_of(nested), level + 1, 0, path + (key,)])
+                continue
+            # Set by one layer only, and holding only scalars
+            value = last
+        else:
+            # Values up to the last mapping were replaced
+            start = len(values) - 1
+            while start and not isinstance(values[start - 1], Mapping):
+                start -= 1
+            merge_lists = list_strategy
+            if root is not None:
+                merge_lists = root.at(path + (key,)).merge_lists
+            value = _fold(values[start:], merge_lists, scalars, initial, lift_list)
+
+        if type(value) in _ATOMIC_TYPES:
+            write(encode_scalar(value))
+            continue
+        if isinstance(value, (dict, list)) and _is_flat(
+            value.values() if isinstance(value, dict) else value
+        ):
+            if indent is None:
+                # One call, in C
+                write(encoder.encode(value))
+            else:
+                write(_encode_flat(value, encode_scalar, indent, level + 1, sort_keys))
+            continue
+        chunks = encoder.iterencode(value)
+        if indent is not None and value:
+            nested_indent = "\n" + indent * (level + 1)
+            for chunk in chunks:
+                write(chunk.replace("\n", nested_indent))
+                if len(buffer) >= _CHUNK_PIECES:
+                    out.flush()
+        else:
+            for chunk in chunks:
+                write(chunk)
+                if len(buffer) >= _CHUNK_PIECES:
+                    out.flush()
+
+    out.flush()
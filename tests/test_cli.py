@@ -0,0 +1,117 @@
+"""Tests for the command-line interface."""
+
+import json
+
+import pytest
+
+from flexmerge.cli import main
+
+
+@pytest.fixture
+def files(tmp_path):
+    """A JSON base and a TOML overlay."""
+    base = tmp_path / "base.json"
+    base.write_text(
+        json.dumps(
+            {
+                "tags": ["a", "b"],
+                "db": {"host": "localhost", "port": 5432},
+                "services": [{"name": "web", "port": 80}],
+            }
+        )
+    )
+    overlay = tmp_path / "prod.toml"
+    overlay.write_text(
+        'tags = ["b", "c"]\n\n[db]\nhost = "prod"\n\n'
+        '[[services]]\nname = "web"\ntls = true\n'
+    )
+    return str(base), str(overlay)
+
+
+class TestCli:
+    """Test the flexmerge console script."""
+
+    def test_default_merge(self, files, capsys):
+        """Test merging files with default strategies."""
+        assert main(list(files)) == 0
+        result = json.loads(capsys.readouterr().out)
+        assert result["tags"] == ["a", "b", "b", "c"]
+        assert result["db"] == {"host": "prod", "port": 5432}
+
+    def test_strategy_flags(self, files, capsys):
+        """Test selecting list and dict strategies."""
+        assert main([*files, "--lists", "unique"]) == 0
+        assert json.loads(capsys.readouterr().out)["tags"] == ["a", "b", "c"]
+
+        assert main([*files, "--dicts", "shallow"]) == 0
+        assert json.loads(capsys.readouterr().out)["db"] == {"host": "prod"}
+
+        assert main([*files, "--scalars", "count"]) == 0
+        assert json.loads(capsys.readouterr().out)["db"] == {"host": 2, "port": 1}
+
+    def test_by_key(self, files, capsys):
+        """Test merging record lists by key."""
+        assert main([*files, "--by-key", "name"]) == 0
+        result = json.loads(capsys.readouterr().out)
+        assert result["services"] == [{"name": "web", "port": 80, "tls": True}]
+
+    def test_include_exclude(self, files, capsys):
+        """Test selecting key paths to merge."""
+        assert main([*files, "--include", "db", "--exclude", "db.port"]) == 0
+        assert json.loads(capsys.readouterr().out) == {"db": {"host": "prod"}}
+
+    def test_parallel_parsing(self, files, capsys):
+        """Test that parsing in worker processes gives the same result."""
+        assert main([*files, "--jobs", "2", "--sort-keys"]) == 0
+        parallel = capsys.readouterr().out
+        assert main([*files, "--sort-keys"]) == 0
+        assert capsys.readouterr().out == parallel
+
+    def test_output_file_and_indent(self, files, tmp_path, capsys):
+        """Test writing indented output to a file."""
+        output = tmp_path / "out.json"
+        assert main([*files, "--output", str(output), "--indent", "2"]) == 0
+        assert capsys.readouterr().out == ""
+        text = output.read_text()
+        assert text.endswith("}\n")
+        assert '\n  "tags"' in text
+        assert json.loads(text)["db"]["port"] == 5432
+
+    def test_stats(self, files, capsys):
+        """Test that --stats reports timing and node counts on stderr."""
+        assert main([*files, "--stats"]) == 0
+        err = capsys.readouterr().err
+        assert "parse" in err
+        assert "merge" in err
+        assert "nodes (dicts=4, lists=2, scalars=" in err
+        assert "depth=4" in err
+        assert "engine=iterative" in err
+
+        assert main([*files, "--engine", "auto", "--stats"]) == 0
+        assert "engine=auto:union" in capsys.readouterr().err
+
+    def test_stats_engine_after_projection(self, tmp_path, capsys):
+        """Test that the auto engine is reported for the projected documents."""
+        path = tmp_path / "wide.json"
+        path.write_text(
+            json.dumps({f"k{i}": {"a": {"b": [i]}} for i in range(100)} | {"db": {}})
+        )
+
+        assert main([str(path), str(path), "--engine", "auto", "--stats"]) == 0
+        assert "engine=auto:iterative" in capsys.readouterr().err
+
+        args = [str(path), str(path), "--include", "db", "--engine", "auto"]
+        assert main([*args, "--stats"]) == 0
+        captured = capsys.readouterr()
+        assert json.loads(captured.out) == {"db": {}}
+        assert "engine=auto:union" in captured.err
+
+    def test_missing_file(self, tmp_path, capsys):
+        """Test that unreadable inputs are reported with exit code 1."""
+        assert main([str(tmp_path / "missing.json")]) == 1
+        assert "flexmerge: error:" in capsys.readouterr().err
+
+    def test_invalid_jobs(self, files):
+        """Test that --jobs must be positive."""
+        with pytest.raises(SystemExit):
+            main([*files, "--jobs", "0"])
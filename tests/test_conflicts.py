@@ -0,0 +1,115 @@
+"""Tests for conflict detection and strict merges."""
+
+import pytest
+
+from flexmerge import Conflict, MergeConflictError, Merger
+from flexmerge.conflicts import find_conflicts
+
+
+class TestFindConflicts:
+    """Test find_conflicts."""
+
+    def test_nested_scalar_conflict(self):
+        """Test that differing nested scalars are reported with their path."""
+        conflicts = find_conflicts(
+            [{"db": {"host": "a", "port": 1}}, {"db": {"host": "b", "user": "u"}}]
+        )
+
+        assert conflicts == [Conflict(("db", "host"), (0, 1), "a", "b")]
+
+    def test_no_conflict_for_equal_or_disjoint_values(self):
+        """Test that equal values and disjoint keys do not conflict."""
+        shared = {"big": list(range(10))}
+        layers = [{"a": 1, "s": shared}, {"a": 1, "b": 2, "s": shared}]
+
+        assert find_conflicts(layers) == []
+
+    def test_type_mismatch(self):
+        """Test that a dict replaced by a scalar is a conflict."""
+        conflicts = find_conflicts([{"a": {"x": 1}}, {"a": 5}])
+
+        assert conflicts == [Conflict(("a",), (0, 1), {"x": 1}, 5)]
+
+    def test_every_layer_pair(self):
+        """Test that conflicts are reported for each pair of layers."""
+        layers = [{"v": 1}, {"v": 2}, {"v": 1}]
+
+        pairs = [conflict.layers for conflict in find_conflicts(layers)]
+
+        assert pairs == [(0, 1), (1, 2)]
+
+    def test_lists(self):
+        """Test that lists only conflict when compare_lists is set."""
+        layers = [{"l": [1]}, {"l": [2]}]
+
+        assert find_conflicts(layers) == []
+        assert len(find_conflicts(layers, compare_lists=True)) == 1
+
+    def test_shallow_compares_whole_values(self):
+        """Test that deep=False compares nested dicts as a whole."""
+        layers = [{"a": {"x": 1}}, {"a": {"y": 2}}]
+
+        assert find_conflicts(layers) == []
+        assert find_conflicts(layers, deep=False)[0].path == ("a",)
+
+    def test_fail_fast(self):
+        """Test that fail_fast stops at the first conflict."""
+        layers = [{f"k{i}": i for i in range(10)}, {f"k{i}": -i for i in range(10)}]
+
+        assert len(find_conflicts(layers)) == 9
+        assert len(find_conflicts(layers, fail_fast=True)) == 1
+
+
+class TestStrictMerge:
+    """Test Merger.strict and Merger.conflicts."""
+
+    def test_strict_merge_raises(self):
+        """Test that strict merges raise with every conflict attached."""
+        merger = Merger().strict()
+
+        layers = [{"tls": {"enabled": True}, "x": 1}, {"x": 2}, {"tls": {"enabled": 0}}]
+
+        with pytest.raises(MergeConflictError, match="'x' in layers 0 and 1") as info:
+            merger.merge(*layers)
+
+        assert {c.path for c in info.value.conflicts} == {("x",), ("tls", "enabled")}
+        assert isinstance(info.value, ValueError)
+
+    def test_strict_merge_without_conflicts(self):
+        """Test that strict merges behave normally when nothing conflicts."""
+        layers = [{"a": {"x": 1}, "l": [1]}, {"a": {"y": 2}, "l": [2]}]
+
+        assert Merger().strict().merge(*layers) == Merger().merge(*layers)
+
+    def test_fail_fast_reports_one_conflict(self):
+        """Test that fail_fast raises with a single conflict."""
+        merger = Merger().strict(fail_fast=True)
+
+        with pytest.raises(MergeConflictError) as info:
+            merger.merge({"a": 1, "b": 1}, {"a": 2, "b": 2})
+
+        assert len(info.value.conflicts) == 1
+
+    def test_replace_lists_conflict(self):
+        """Test that lists conflict when the list strategy drops one side."""
+        layers = [{"l": [1]}, {"l": [2]}]
+
+        assert Merger().conflicts(*layers) == []
+        assert Merger().lists("replace").conflicts(*layers)[0].path == ("l",)
+
+    def test_strict_can_be_disabled_and_is_copied(self):
+        """Test that strict mode is copied and can be turned off."""
+        merger = Merger().strict().copy()
+
+        with pytest.raises(MergeConflictError):
+            merger.merge({"a": 1}, {"a": 2})
+        assert merger.strict(False).merge({"a": 1}, {"a": 2}) == {"a": 2}
+
+    def test_merge_many_and_external(self):
+        """Test that batch and external merges honour strict mode."""
+        merger = Merger().strict()
+
+        with pytest.raises(MergeConflictError):
+            list(merger.merge_many([({"a": 1}, {"a": 1}), ({"a": 1}, {"a": 2})]))
+        with pytest.raises(MergeConflictError, match="layers 0 and 2"):
+            list(merger.merge_external({"a": 1}, {"b": 1}, {"a": 2}))
@@ -0,0 +1,190 @@
+"""Tests for context-aware (v2) strategies."""
+
+import io
+import json
+from dataclasses import dataclass
+
+import pytest
+
+from flexmerge import MergeContext, Merger, by_key, context_strategy
+
+
+class TestContextDictStrategies:
+    """Test dict strategies that take a MergeContext."""
+
+    def test_handles_one_key_and_delegates(self):
+        """Test custom logic for one path with the rest deep merged."""
+        merger = Merger()
+
+        @merger.dict_strategy("protect_secrets", context=True)
+        def protect_secrets(left, right, ctx):
+            if ctx.path[-1:] == ("secrets",):
+                return left
+            return ctx.recurse(left, right)
+
+        result = merger.dicts("protect_secrets").merge(
+            {"app": {"secrets": {"key": "a"}, "port": 80}, "tags": [1]},
+            {"app": {"secrets": {"key": "b"}, "debug": True}, "tags": [2]},
+        )
+
+        assert result == {
+            "app": {"secrets": {"key": "a"}, "port": 80, "debug": True},
+            "tags": [1, 2],
+        }
+
+    def test_context_attributes(self):
+        """Test path, depth and merger seen by the strategy."""
+        seen = []
+        merger = Merger()
+
+        @context_strategy
+        def record(left, right, ctx):
+            seen.append((ctx.path, ctx.depth, ctx.merger is merger))
+            return ctx.recurse(left, right)
+
+        merger.dicts(record).merge({"a": {"b": {"c": 1}}}, {"a": {"b": {"d": 2}}})
+
+        assert seen == [
+            ((), 0, True),
+            (("a",), 1, True),
+            (("a", "b"), 2, True),
+        ]
+
+    def test_single_walk(self):
+        """Test that each pair of mappings is visited exactly once."""
+        calls = []
+
+        @context_strategy
+        def count(left, right, ctx):
+            calls.append(ctx.path)
+            return ctx.recurse(left, right)
+
+        left = {f"k{i}": {"x": {"y": i}} for i in range(10)}
+        right = {f"k{i}": {"x": {"z": i}} for i in range(10)}
+        result = Merger().dicts(count).merge(left, right)
+
+        assert result == Merger().merge(left, right)
+        assert len(calls) == len(set(calls)) == 1 + 10 + 10
+
+    def test_uses_list_strategy_and_copy(self):
+        """Test that the configured list strategy is used and copied."""
+        merger = Merger().lists("unique")
+
+        @merger.dict_strategy("plain", context=True)
+        def plain(left, right, ctx):
+            return ctx.recurse(left, right)
+
+        copied = merger.dicts("plain").copy()
+
+        assert copied.merge({"l": [1, 2]}, {"l": [2, 3]}) == {"l": [1, 2, 3]}
+
+    def test_v1_strategies_keep_working(self):
+        """Test that two-argument strategies are unchanged."""
+        merger = Merger()
+
+        @merger.dict_strategy("right_wins")
+        def right_wins(left, right):
+            return {**left, **right}
+
+        assert merger.dicts("right_wins").merge({"a": {"x": 1}}, {"a": {"y": 2}}) == {
+            "a": {"y": 2}
+        }
+
+    def test_called_without_context(self):
+        """Test that a v2 strategy can be called like a v1 strategy."""
+
+        @context_strategy
+        def plain(left, right, ctx):
+            assert isinstance(ctx, MergeContext)
+            assert ctx.merger is None
+            return ctx.recurse(left, right)
+
+        assert plain({"a": {"b": [1]}}, {"a": {"b": [2]}}) == {"a": {"b": [1, 2]}}
+
+
+class TestContextListStrategies:
+    """Test list strategies that take a MergeContext."""
+
+    def test_list_strategy_receives_path(self):
+        """Test that list strategies get the path of the list."""
+        merger = Merger()
+
+        @merger.list_strategy("by_path", context=True)
+        def by_path(left, right, ctx):
+            return right if ctx.path == ("replace_me",) else left + right
+
+        @context_strategy
+        def plain(left, right, ctx):
+            return ctx.recurse(left, right)
+
+        result = (
+            merger.lists("by_path")
+            .dicts(plain)
+            .merge(
+                {"replace_me": [1], "append_me": [1]},
+                {"replace_me": [2], "append_me": [2]},
+            )
+        )
+
+        assert result == {"replace_me": [2], "append_me": [1, 2]}
+
+    def test_list_strategy_under_deep_dicts(self):
+        """Test that the default deep merge passes a full context to lists."""
+        seen = []
+
+        @context_strategy
+        def record(left, right, ctx):
+            seen.append((ctx.path, ctx.merger is merger))
+            return left + right
+
+        merger = Merger().lists(record)
+        layers = ({"a": {"b": [1]}, "c": [1]}, {"a": {"b": [2]}, "c": [2]})
+
+        assert merger.merge(*layers) == {"a": {"b": [1, 2]}, "c": [1, 2]}
+        assert sorted(seen) == [(("a", "b"), True), (("c",), True)]
+
+        seen.clear()
+        stream = io.StringIO()
+        merger.merge_to_stream(stream, *layers)
+        assert json.loads(stream.getvalue()) == {"a": {"b": [1, 2]}, "c": [1, 2]}
+        assert sorted(seen) == [(("a", "b"), True), (("c",), True)]
+
+    def test_list_strategy_in_objects_and_merge3(self):
+        """Test that object fields and three-way merges pass the path too."""
+        paths = []
+
+        @context_strategy
+        def record(left, right, ctx):
+            paths.append(ctx.path)
+            return left + right
+
+        @dataclass
+        class Config:
+            tags: list
+
+        merger = Merger().lists(record)
+        merger.merge_objects(Config([1]), Config([2]))
+        merger.merge3({"x": {"l": [0]}}, {"x": {"l": [1]}}, {"x": {"l": [2]}})
+
+        assert paths == [("tags",), ("x", "l")]
+
+    @pytest.mark.parametrize("use_context", [False, True])
+    def test_by_key_records_use_dict_strategy(self, use_context):
+        """Test that by_key merges records through ctx.recurse."""
+
+        @context_strategy
+        def keep_locked(left, right, ctx):
+            if ctx.path[-1:] == ("locked",):
+                return left
+            return ctx.recurse(left, right)
+
+        merger = Merger().lists(by_key("name"))
+        if use_context:
+            merger.dicts(keep_locked)
+        result = merger.merge(
+            {"svc": [{"name": "web", "locked": {"port": 80}}]},
+            {"svc": [{"name": "web", "locked": {"port": 81}}]},
+        )
+
+        port = result["svc"][0]["locked"]["port"]
+        assert port == (80 if use_context else 81)
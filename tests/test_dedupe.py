@@ -0,0 +1,113 @@
+"""Tests for the memory-bounded dedupe list strategies."""
+
+import pytest
+
+from flexmerge import Merger, unique_approx, unique_partitioned
+from flexmerge.strategies import _unique_lists
+
+
+class TestUniqueApprox:
+    """Test the Bloom-filter dedupe strategy."""
+
+    def test_drops_duplicates_in_order(self):
+        """Test that duplicates are dropped and first occurrences kept."""
+        strategy = unique_approx()
+        assert strategy([3, 1, 3, 2], [2, 4, 1, 5]) == [3, 1, 2, 4, 5]
+
+    def test_never_keeps_duplicates(self):
+        """Test that the result has no duplicates for a large input."""
+        left = list(range(20000))
+        right = list(range(10000, 30000))
+
+        result = unique_approx(error_rate=0.01)(left, right)
+
+        assert len(result) == len(set(result))
+        assert result == sorted(result)
+
+    def test_false_positive_rate_near_target(self):
+        """Test that only about error_rate of unique items are dropped."""
+        items = [f"item-{i}" for i in range(50000)]
+
+        result = unique_approx(error_rate=0.01)(items, [])
+
+        dropped = len(items) - len(result)
+        # Filling the filter as it goes keeps the rate below the target
+        assert dropped < 0.01 * len(items)
+
+    def test_unhashable_items(self):
+        """Test that unhashable items are deduplicated exactly."""
+        strategy = unique_approx()
+        left = [{"a": 1}, 1, [2]]
+        right = [{"a": 1}, [2], {"b": 2}, 1]
+
+        assert strategy(left, right) == [{"a": 1}, 1, [2], {"b": 2}]
+
+    def test_filter_size(self):
+        """Test that the filter grows with the item count and precision."""
+        words, k = unique_approx(error_rate=0.01).filter_size(100000)
+        precise_words, _ = unique_approx(error_rate=0.001).filter_size(100000)
+
+        assert 1 <= k <= 16
+        assert words * 64 / 100000 < 16
+        assert precise_words > words
+
+    def test_invalid_arguments(self):
+        """Test that out-of-range parameters are rejected."""
+        with pytest.raises(ValueError, match="error_rate"):
+            unique_approx(error_rate=0)
+        with pytest.raises(ValueError, match="error_rate"):
+            unique_approx(error_rate=1.5)
+        with pytest.raises(ValueError, match="capacity"):
+            unique_approx(capacity=0)
+
+    def test_repr(self):
+        """Test the strategy representation."""
+        expected = "unique_approx(error_rate=0.01, capacity=None)"
+        assert repr(unique_approx(0.01)) == expected
+
+
+class TestUniquePartitioned:
+    """Test the exact partitioned dedupe strategy."""
+
+    @pytest.mark.parametrize("max_in_memory", [0, 10, 1_000_000])
+    def test_matches_unique(self, max_in_memory):
+        """Test that results match the unique strategy with and without spilling."""
+        left = [i % 997 for i in range(5000)] + [{"a": 1}, "x", None]
+        right = [str(i % 13) for i in range(200)] + [{"a": 1}, ["l"], 4.5, 3]
+
+        strategy = unique_partitioned(partitions=8, max_in_memory=max_in_memory)
+
+        assert strategy(left, right) == _unique_lists(left, right)
+
+    def test_single_partition(self):
+        """Test that one partition deduplicates in memory."""
+        strategy = unique_partitioned(partitions=1, max_in_memory=0)
+        assert strategy([1, 2, 2], [3, 1]) == [1, 2, 3]
+
+    def test_invalid_partitions(self):
+        """Test that a partition count below one is rejected."""
+        with pytest.raises(ValueError, match="partitions"):
+            unique_partitioned(partitions=0)
+
+
+class TestMergerIntegration:
+    """Test the dedupe strategies through Merger."""
+
+    @pytest.mark.parametrize("name", ["unique_approx", "unique_partitioned"])
+    def test_by_name(self, name):
+        """Test selecting the strategies by name."""
+        result = (
+            Merger()
+            .lists(name)
+            .merge(
+                {"ids": [1, 2, 3], "nested": {"tags": ["a"]}},
+                {"ids": [3, 4], "nested": {"tags": ["a", "b"]}},
+            )
+        )
+        assert result == {"ids": [1, 2, 3, 4], "nested": {"tags": ["a", "b"]}}
+
+    def test_factory_instance(self):
+        """Test passing a configured strategy instance."""
+        merger = Merger().lists(unique_partitioned(partitions=4, max_in_memory=0))
+        result = merger.merge({"ids": [1, 1, 2]}, {"ids": [2, 3]})
+        assert result == {"ids": [1, 2, 3]}
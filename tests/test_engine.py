@@ -0,0 +1,237 @@
+"""Tests for the merge engines."""
+
+from collections import ChainMap, OrderedDict
+from collections.abc import Mapping
+from types import MappingProxyType
+
+import pytest
+
+from flexmerge import BuiltinEngines, Merger
+from flexmerge.engine import BUILTIN_ENGINES, _copy_tree
+
+
+def deep_tree(depth, leaf):
+    """Build a tree nested ``depth`` levels deep."""
+    root = node = {}
+    for level in range(depth):
+        node["value"] = leaf + level
+        node["items"] = [leaf]
+        node["child"] = {}
+        node = node["child"]
+    return root
+
+
+class TestEngineSelection:
+    """Test selecting engines on the Merger."""
+
+    @pytest.mark.parametrize("engine", ["recursive", "iterative", "union"])
+    def test_engine_by_name(self, engine):
+        """Test that both engines produce the same result."""
+        merger = Merger().lists("unique").engine(engine)
+        result = merger.merge(
+            {"a": {"b": [1, 2], "c": 1}, "d": 1},
+            {"a": {"b": [2, 3], "e": {"f": 1}}},
+            {"a": {"e": {"g": 2}}, "d": {"x": 1}},
+        )
+        assert result == {
+            "a": {"b": [1, 2, 3], "c": 1, "e": {"f": 1, "g": 2}},
+            "d": {"x": 1},
+        }
+
+    def test_engine_by_enum(self):
+        """Test selecting an engine with the enum."""
+        merger = Merger().engine(BuiltinEngines.RECURSIVE)
+        assert merger._engine is BUILTIN_ENGINES["recursive"]
+
+    def test_unknown_engine(self):
+        """Test error for unknown engine."""
+        with pytest.raises(ValueError, match="Unknown engine: nonexistent"):
+            Merger().engine("nonexistent")
+
+    def test_copy_preserves_engine(self):
+        """Test that copy keeps the selected engine."""
+        merger = Merger().engine("recursive")
+        assert merger.copy()._engine is merger._engine
+
+        auto = Merger().engine("auto").copy()
+        assert auto._engine_for([{"a": 1}]) is BUILTIN_ENGINES["union"]
+
+
+class TestUnionEngine:
+    """Test the engine that merges scalar-only levels in bulk."""
+
+    def test_matches_iterative(self):
+        """Test that results and key order equal the iterative engine."""
+        left = {"x": {"b": 1, "a": {"z": 1}}, "y": 1, "l": [1], "s": {"k": {}}}
+        right = {"y": {"k": 1}, "x": {"a": {"y": 1}, "c": 1}, "w": 1, "l": [2]}
+        iterative = BUILTIN_ENGINES["iterative"].merge(left, right, list.__add__)
+        union = BUILTIN_ENGINES["union"].merge(left, right, list.__add__)
+        assert union == iterative
+        assert list(union) == list(iterative)
+        assert list(union["x"]) == list(iterative["x"])
+
+    def test_scalars_replace_containers(self):
+        """Test that a scalar-only level overwrites nested values."""
+        left = {"a": {"b": {"c": 1}}, "d": [1]}
+        result = BUILTIN_ENGINES["union"].merge(left, {"a": 1, "d": None}, list.__add__)
+        assert result == {"a": 1, "d": None}
+        assert left == {"a": {"b": {"c": 1}}, "d": [1]}
+
+
+class TestAutoEngine:
+    """Test engine selection from a sample of the inputs."""
+
+    def test_small_inputs_use_union(self):
+        """Test that small layers are merged with the union engine."""
+        merger = Merger().engine("auto")
+        assert merger._engine_for([{"a": 1}, {"a": {"b": 2}}]).name == "union"
+        assert merger.merge({"a": 1}, {"a": {"b": 2}}) == {"a": {"b": 2}}
+
+    def test_list_heavy_inputs_use_iterative(self):
+        """Test that levels holding only containers use the iterative engine."""
+        layer = {f"k{i}": [{"id": i}] for i in range(100)}
+        merger = Merger().engine(BuiltinEngines.AUTO)
+        assert merger._engine_for([layer, layer]).name == "iterative"
+        assert merger.merge(layer, layer) == Merger().merge(layer, layer)
+
+    def test_scalar_strategy_uses_iterative(self):
+        """Test that the bulk path is not chosen when scalars are combined."""
+        merger = Merger().engine("auto").scalars("sum")
+        assert merger._engine_for([{"a": 1}]).name == "iterative"
+        assert merger.merge({"a": 1}, {"a": 2}) == {"a": 3}
+
+    def test_merge_many_and_fingerprinted(self):
+        """Test that batch and fingerprinted merges resolve the engine too."""
+        merger = Merger().engine("auto")
+        rows = [({"a": {"x": 1}}, {"a": {"y": 2}}), ({"b": 1},)]
+        assert list(merger.merge_many(rows)) == [{"a": {"x": 1, "y": 2}}, {"b": 1}]
+        assert list(merger.merge_many([])) == []
+        result, _ = merger.merge_fingerprinted({"a": {"x": 1}}, {"a": {"y": 2}})
+        assert result == {"a": {"x": 1, "y": 2}}
+
+
+class TestIterativeEngine:
+    """Test the explicit-stack engine."""
+
+    def test_no_depth_limit(self):
+        """Test merging trees much deeper than the recursion limit."""
+        depth = 5000
+        result = Merger().merge(deep_tree(depth, 0), deep_tree(depth, 1))
+
+        node = result
+        for level in range(depth):
+            assert node["value"] == 1 + level
+            assert node["items"] == [0, 1]
+            node = node["child"]
+        assert node == {}
+
+    def test_inputs_are_not_mutated(self):
+        """Test that nested input dicts are copied before merging."""
+        left = {"a": {"b": {"c": 1}}}
+        right = {"a": {"b": {"d": 2}}}
+        result = BUILTIN_ENGINES["iterative"].merge(left, right, list.__add__)
+        assert result == {"a": {"b": {"c": 1, "d": 2}}}
+        assert left == {"a": {"b": {"c": 1}}}
+        assert right == {"a": {"b": {"d": 2}}}
+
+    def test_key_order_matches_recursive(self):
+        """Test that key order is identical to the recursive engine."""
+        left = {"x": {"b": 1, "a": {"z": 1}}, "y": 1}
+        right = {"y": {"k": 1}, "x": {"a": {"y": 1}, "c": 1}, "w": 1}
+        recursive = BUILTIN_ENGINES["recursive"].merge(left, right, list.__add__)
+        iterative = BUILTIN_ENGINES["iterative"].merge(left, right, list.__add__)
+        assert list(recursive) == list(iterative)
+        assert list(recursive["x"]) == list(iterative["x"])
+
+
+class TestCopyTree:
+    """Test the non-recursive tree copy."""
+
+    def test_copies_containers(self):
+        """Test that nested dicts and lists are copied."""
+        value = {"a": [{"b": 1}], "c": {"d": (1, 2)}}
+        copied = _copy_tree(value)
+        assert copied == value
+        assert copied["a"] is not value["a"]
+        assert copied["a"][0] is not value["a"][0]
+        assert copied["c"] is not value["c"]
+
+    def test_preserves_shared_references(self):
+        """Test that shared and cyclic references are preserved."""
+        shared = {"x": 1}
+        value = {"a": shared, "b": shared}
+        value["self"] = value
+        copied = _copy_tree(value)
+        assert copied["a"] is copied["b"]
+        assert copied["a"] is not shared
+        assert copied["self"] is copied
+
+    def test_deepcopies_other_objects(self):
+        """Test that non-container objects are deep copied."""
+        value = {"s": {1, 2}}
+        copied = _copy_tree(value)
+        assert copied["s"] == {1, 2}
+        assert copied["s"] is not value["s"]
+
+    def test_deep_tree(self):
+        """Test copying a tree deeper than the recursion limit."""
+        copied = _copy_tree(deep_tree(5000, 0))
+        assert copied["child"]["child"]["value"] == 2
+
+
+class TestMappingInputs:
+    """Test merging mappings that are not dicts."""
+
+    @pytest.mark.parametrize("engine", ["recursive", "iterative", "union"])
+    def test_mappingproxy_and_chainmap(self, engine):
+        """Test that read-only and chained mappings are merged like dicts."""
+        base = MappingProxyType({"db": MappingProxyType({"host": "a", "port": 1})})
+        overlay = ChainMap({"db": {"host": "b"}}, {"debug": True})
+        result = Merger().engine(engine).merge(base, overlay)
+        assert result == {"db": {"host": "b", "port": 1}, "debug": True}
+        assert type(result) is dict
+        assert type(result["db"]) is dict
+
+    def test_untouched_mappings_are_shared(self):
+        """Test that subtrees the merge does not write to are not copied."""
+        lazy = MappingProxyType({"x": 1})
+        result = Merger().merge({"lazy": lazy, "a": 1}, {"a": 2})
+        assert result["lazy"] is lazy
+
+    def test_only_written_levels_are_read(self):
+        """Test that a mapping is only iterated when the merge writes into it."""
+
+        class CountingMapping(Mapping):
+            def __init__(self, data):
+                self._data = data
+                self.iterations = 0
+
+            def __getitem__(self, key):
+                return self._data[key]
+
+            def __iter__(self):
+                self.iterations += 1
+                return iter(self._data)
+
+            def __len__(self):
+                return len(self._data)
+
+        untouched = CountingMapping({"x": 1})
+        written = CountingMapping({"y": 1})
+        base = {"untouched": untouched, "written": written}
+        result = Merger().merge(base, {"written": {"z": 2}})
+        assert result["written"] == {"y": 1, "z": 2}
+        assert untouched.iterations == 0
+        assert written.iterations == 1
+
+    def test_dict_subclasses_are_still_copied(self):
+        """Test that dict subclasses keep their type and are not shared."""
+        nested = OrderedDict(a=1)
+        result = Merger().merge({"n": nested})
+        assert type(result["n"]) is OrderedDict
+        assert result["n"] is not nested
+
+    def test_non_mapping_rejected(self):
+        """Test that sequences are still rejected as top-level inputs."""
+        with pytest.raises(TypeError, match="Argument 1 is not a dictionary"):
+            Merger().merge({}, [("a", 1)])
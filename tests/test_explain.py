@@ -0,0 +1,64 @@
+"""Tests for input shape estimates."""
+
+import pytest
+
+from flexmerge import MergeEstimate, Merger
+
+
+def tree(depth, width):
+    """Build a tree of nested dicts with integer leaves."""
+    if not depth:
+        return 1
+    return {f"k{i}": tree(depth - 1, width) for i in range(width)}
+
+
+class TestExplain:
+    """Test Merger.explain."""
+
+    def test_small_inputs_are_exact(self):
+        """Test that small inputs are counted exactly."""
+        plan = Merger().explain({"a": 1, "b": {"c": [1, {"d": 2}, [3]]}}, {"a": 2})
+
+        assert isinstance(plan, MergeEstimate)
+        assert plan.exact
+        assert plan.layers == 2
+        # 4 mappings, 2 lists and 5 scalars
+        assert plan.nodes == 11
+        assert plan.mappings == 4
+        assert plan.lists == 2
+        assert plan.list_items == 4
+        assert plan.max_list_length == 3
+        assert plan.depth == 4
+        assert plan.hashable_ratio == 0.5
+
+    def test_large_inputs_are_sampled(self):
+        """Test that counts of uniform trees are scaled up accurately."""
+        plan = Merger().explain(tree(5, 10))
+
+        assert not plan.exact
+        assert plan.mappings == 11111
+        assert plan.nodes == 111111
+        assert plan.depth == 5
+        assert plan.scalar_level_ratio == pytest.approx(100000 / 111110)
+
+    def test_long_lists(self):
+        """Test list statistics for a list too long to visit."""
+        items = [{"id": i} if i % 4 else i for i in range(100000)]
+        plan = Merger().explain({"items": items})
+
+        assert plan.max_list_length == 100000
+        assert plan.list_items == 100000
+        assert plan.hashable_ratio == pytest.approx(0.25, abs=0.15)
+
+    def test_engine_choice(self):
+        """Test the engine reported for leaf-heavy and list-heavy inputs."""
+        lists = {f"k{i}": [i] for i in range(100)}
+
+        assert Merger().explain(tree(4, 6)).engine == "union"
+        assert Merger().explain(lists, lists).engine == "iterative"
+        assert Merger().scalars("sum").explain(tree(4, 6)).engine == "iterative"
+
+    def test_rejects_non_mappings(self):
+        """Test that every argument must be a mapping."""
+        with pytest.raises(TypeError, match="Argument 1 is not a dictionary"):
+            Merger().explain({}, [1])
@@ -0,0 +1,116 @@
+"""Tests for out-of-core merging through SQLite."""
+
+import json
+
+import pytest
+
+from flexmerge import Merger
+from flexmerge.external import iter_json_items
+
+
+@pytest.fixture
+def layers():
+    """Layers with nested dicts, lists and keys unique to one layer."""
+    return [
+        {"a": {"x": 1, "tags": ["p"]}, "b": [1, 2], "c": "base"},
+        {"d": 1.5, "a": {"y": {"deep": True}, "tags": ["q"]}, "b": [3]},
+        {"c": None, "a": {"x": 2}, "e": {"s": 'brace } and "quote"'}},
+    ]
+
+
+class TestIterJsonItems:
+    """Test incremental parsing of top-level JSON entries."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 1 << 20])
+    def test_matches_json_load(self, tmp_path, layers, chunk_size):
+        """Test that streaming gives the same entries for any chunk size."""
+        path = tmp_path / "data.json"
+        document = {**layers[2], "n": 123456789, "t": [True, False, None]}
+        path.write_text(json.dumps(document, indent=2))
+
+        items = list(iter_json_items(path, chunk_size=chunk_size))
+
+        assert items == list(document.items())
+
+    def test_empty_object(self, tmp_path):
+        """Test an empty object."""
+        path = tmp_path / "empty.json"
+        path.write_text(" { } ")
+
+        assert list(iter_json_items(path, chunk_size=1)) == []
+
+    @pytest.mark.parametrize("text", ["[1, 2]", '{"a": 1', '{"a" 1}', '{"a": }'])
+    def test_invalid_input(self, tmp_path, text):
+        """Test that malformed documents raise ValueError."""
+        path = tmp_path / "bad.json"
+        path.write_text(text)
+
+        with pytest.raises(ValueError):
+            list(iter_json_items(path, chunk_size=2))
+
+
+class TestMergeExternal:
+    """Test Merger.merge_external."""
+
+    @pytest.mark.parametrize("lists", ["append", "unique", "replace"])
+    def test_matches_in_memory_merge(self, layers, lists):
+        """Test that the result and key order match merge."""
+        merger = Merger().lists(lists)
+
+        result = list(merger.merge_external(*layers))
+
+        assert result == list(merger.merge(*layers).items())
+
+    def test_file_sources(self, tmp_path, layers):
+        """Test JSON files, TOML files and pair iterables as sources."""
+        json_path = tmp_path / "base.json"
+        json_path.write_text(json.dumps(layers[0]))
+        toml_path = tmp_path / "over.toml"
+        toml_path.write_text('c = "toml"\n[a]\nz = 3\n')
+        pairs = iter([("b", [9])])
+
+        result = dict(Merger().merge_external(json_path, str(toml_path), pairs))
+
+        assert result == Merger().merge(
+            layers[0], {"c": "toml", "a": {"z": 3}}, {"b": [9]}
+        )
+
+    def test_small_budget_and_db_path(self, tmp_path):
+        """Test many keys spilled in tiny batches into a named database."""
+        left = {f"k{i}": {"v": i} for i in range(500)}
+        right = {f"k{i}": {"w": i} for i in range(250, 750)}
+        db_path = tmp_path / "spill.sqlite3"
+
+        result = list(
+            Merger().merge_external(left, right, db_path=db_path, memory_budget=256)
+        )
+
+        assert result == list(Merger().merge(left, right).items())
+        assert db_path.exists()
+
+    def test_reused_db_path(self, tmp_path):
+        """Test that a database left by an earlier merge is replaced."""
+        db_path = tmp_path / "spill.sqlite3"
+        merger = Merger()
+
+        first = list(merger.merge_external({"a": 1, "b": [1]}, db_path=db_path))
+        second = list(merger.merge_external({"b": [2]}, {"c": 3}, db_path=db_path))
+
+        assert first == [("a", 1), ("b", [1])]
+        assert second == [("b", [2]), ("c", 3)]
+
+    def test_shallow_dict_strategy(self, layers):
+        """Test that the shallow strategy replaces whole values."""
+        merger = Merger().dicts("shallow")
+
+        assert dict(merger.merge_external(*layers)) == merger.merge(*layers)
+
+    def test_unsupported_dict_strategy(self, layers):
+        """Test that strategies that cannot be split by key are rejected."""
+        with pytest.raises(ValueError, match="deep"):
+            Merger().dicts("keep").merge_external(*layers)
+
+    def test_non_string_key(self):
+        """Test that non-string top-level keys are rejected."""
+        with pytest.raises(TypeError, match="Layer 1"):
+            list(Merger().merge_external({"a": 1}, {2: "b"}))
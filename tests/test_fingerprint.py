@@ -0,0 +1,135 @@
+"""Tests for structural fingerprints and fingerprinted merges."""
+
+import pytest
+
+from flexmerge import Fingerprinter, Merger, fingerprint
+
+
+class TestFingerprint:
+    """Test fingerprint and Fingerprinter."""
+
+    def test_equal_trees(self):
+        """Test that equal trees get equal fingerprints."""
+        tree = {"a": [1, {"b": "x"}], "c": None, "d": 1.5}
+
+        assert fingerprint(tree) == fingerprint({**tree, "a": [1, {"b": "x"}]})
+
+    @pytest.mark.parametrize(
+        "left, right",
+        [
+            ({"a": 1}, {"a": True}),
+            ({"a": 1}, {"a": 1.0}),
+            ({"a": 0.0}, {"a": -0.0}),
+            ({"a": 1, "b": 2}, {"b": 2, "a": 1}),
+            ({"a": []}, {"a": {}}),
+            (["ab", "c"], ["a", "bc"]),
+            ({"a": "1"}, {"a": 1}),
+        ],
+    )
+    def test_different_trees(self, left, right):
+        """Test that different types, values and key orders are told apart."""
+        assert fingerprint(left) != fingerprint(right)
+
+    def test_cache_is_reused(self):
+        """Test that shared subtrees are hashed once and cached."""
+        shared = {"x": list(range(5))}
+        fingerprints = Fingerprinter()
+
+        fingerprints.digest({"a": shared, "b": shared})
+
+        assert len(fingerprints) == 3
+        fingerprints.clear()
+        assert len(fingerprints) == 0
+
+    def test_cycle(self):
+        """Test that cyclic structures are rejected."""
+        tree = {}
+        tree["self"] = tree
+
+        with pytest.raises(ValueError, match="cyclic"):
+            fingerprint(tree)
+
+
+class TestMergeFingerprinted:
+    """Test Merger.merge_fingerprinted."""
+
+    @pytest.mark.parametrize("lists", ["append", "unique", "replace", "keep"])
+    def test_matches_merge(self, lists):
+        """Test that the result and fingerprint match a normal merge."""
+        shared = {"list": [1, 1], "n": {"x": 1}}
+        layers = [
+            {"a": shared, "b": {"c": [1]}, "same": {"k": {"v": 1}}},
+            {"a": shared, "b": {"c": [2]}, "same": {"k": {"v": 1}}},
+        ]
+        merger = Merger().lists(lists)
+
+        result, digest = merger.merge_fingerprinted(*layers)
+
+        assert result == merger.merge(*layers)
+        assert digest == fingerprint(result)
+
+    def test_identical_subtrees_are_shared(self):
+        """Test that identical subtrees without lists are not walked."""
+        base = {"big": {f"k{i}": {"v": i} for i in range(100)}, "x": 1}
+        overlay = {"big": {f"k{i}": {"v": i} for i in range(100)}, "x": 2}
+
+        result, _ = Merger().merge_fingerprinted(base, overlay)
+
+        assert result["big"] is overlay["big"]
+        assert result["x"] == 2
+
+    def test_subtrees_with_lists_are_merged(self):
+        """Test that identical subtrees are still merged with append lists."""
+        shared = {"items": [1]}
+
+        result, _ = Merger().merge_fingerprinted({"s": shared}, {"s": shared})
+
+        assert result == {"s": {"items": [1, 1]}}
+
+    def test_fingerprint_as_change_detection(self):
+        """Test that the fingerprint changes only when the result changes."""
+        fingerprints = Fingerprinter()
+        base = {"a": {"b": 1}}
+        merger = Merger()
+
+        def digest(overlay):
+            return merger.merge_fingerprinted(
+                base, overlay, fingerprinter=fingerprints
+            )[1]
+
+        first = digest({"c": 1})
+        again = digest({"c": 1})
+        changed = digest({"c": 2})
+
+        assert first == again != changed
+
+    @pytest.mark.parametrize("engine", ["recursive", "iterative", "union"])
+    def test_engines(self, engine):
+        """Test that both engines honour the identical-subtree check."""
+        right = {"d": {"e": 1}}
+
+        merger = Merger().engine(engine)
+
+        result, _ = merger.merge_fingerprinted({"d": {"e": 1}}, right)
+
+        assert result["d"] is right["d"]
+
+    def test_other_dict_strategies_and_empty_input(self):
+        """Test non-deep strategies and merging nothing."""
+        merger = Merger().dicts("shallow")
+
+        result, digest = merger.merge_fingerprinted({"a": {"x": 1}}, {"a": {"y": 2}})
+
+        assert result == {"a": {"y": 2}}
+        assert digest == fingerprint(result)
+        assert Merger().merge_fingerprinted() == ({}, fingerprint({}))
+
+    def test_results_are_not_cached(self):
+        """Test that only the inputs are kept in a shared fingerprinter."""
+        fingerprints = Fingerprinter()
+        base = {"a": {"b": 1}}
+
+        for i in range(5):
+            Merger().merge_fingerprinted(base, {"c": i}, fingerprinter=fingerprints)
+
+        assert len(fingerprints) == 2 + 5
@@ -0,0 +1,189 @@
+"""Tests for merging records grouped by key."""
+
+import json
+
+import pytest
+
+from flexmerge import Interner, MergeConflictError, MergeLimitError, Merger
+from flexmerge.group import iter_ndjson
+
+
+def _user_key(record):
+    """Module-level key function, picklable for worker processes."""
+    return record["user"]["id"]
+
+
+@pytest.fixture
+def records():
+    """Events of a few users, interleaved."""
+    return [
+        {
+            "user": {"id": i % 7},
+            "tags": [f"t{i % 3}"],
+            "last": {"seq": i},
+            "visits": 1,
+        }
+        for i in range(200)
+    ]
+
+
+def _expected(merger, records, key):
+    """Merge each group with Merger.merge, in first-seen key order."""
+    groups = {}
+    for record in records:
+        groups.setdefault(key(record), []).append(record)
+    return {group: merger.merge(*layers) for group, layers in groups.items()}
+
+
+class TestGroupMerge:
+    """Test Merger.group_merge."""
+
+    def test_in_memory(self, records):
+        """Test that groups match merge and come in first-seen order."""
+        merger = Merger().lists("unique")
+
+        result = list(merger.group_merge(records, key="user.id"))
+
+        expected = _expected(merger, records, _user_key)
+        assert result == list(expected.items())
+        assert result[0][1]["tags"] == ["t0", "t1", "t2"]
+
+    @pytest.mark.parametrize("partitions", [1, 3, 16])
+    def test_spilled(self, records, partitions):
+        """Test that spilling to partitions gives the same groups."""
+        merger = Merger().lists("unique").scalars("sum")
+
+        result = dict(
+            merger.group_merge(
+                records, key=_user_key, partitions=partitions, max_in_memory=10
+            )
+        )
+
+        assert result == _expected(merger, records, _user_key)
+        assert result[0]["visits"] == 29
+
+    @pytest.mark.parametrize("max_in_memory", [100, 1])
+    @pytest.mark.parametrize(
+        "scalars, expected",
+        [
+            ("sum", {1: {"u": 1, "n": 3}, 2: {"u": 2, "n": 5}}),
+            ("count", {1: {"u": 1, "n": 2}, 2: {"u": 2, "n": 1}}),
+        ],
+    )
+    def test_reducers_keep_key_field(self, scalars, expected, max_in_memory):
+        """Test that the key field is not reduced with the other fields."""
+        merger = Merger().scalars(scalars)
+        records = [{"u": 1, "n": 1}, {"u": 2, "n": 5}, {"u": 1, "n": 2}]
+
+        result = dict(
+            merger.group_merge(
+                records, key="u", partitions=2, max_in_memory=max_in_memory
+            )
+        )
+        nested = dict(
+            merger.group_merge(
+                [{"user": {"id": 1, "n": 1}}, {"user": {"id": 1, "n": 2}}],
+                key="user.id",
+            )
+        )
+
+        assert result == expected
+        assert nested[1]["user"]["id"] == 1
+
+    def test_worker_processes(self, records):
+        """Test that partitions merged in worker processes give the same groups."""
+        merger = Merger().lists("append")
+
+        result = dict(
+            merger.group_merge(
+                records, key=_user_key, partitions=4, max_in_memory=10, jobs=2
+            )
+        )
+
+        assert result == _expected(merger, records, _user_key)
+
+    def test_worker_processes_with_interner(self, records):
+        """Test that results from worker processes are interned here."""
+        interner = Interner()
+        merger = Merger().lists("unique").interner(interner)
+
+        result = dict(
+            merger.group_merge(
+                records, key=_user_key, partitions=4, max_in_memory=10, jobs=2
+            )
+        )
+
+        assert result == _expected(Merger().lists("unique"), records, _user_key)
+        assert result[0]["tags"] is result[3]["tags"]
+        assert interner.stats["hits"] > 0
+
+    def test_ndjson_file(self, tmp_path, records):
+        """Test reading records from an NDJSON file."""
+        path = tmp_path / "events.ndjson"
+        path.write_text("\n".join(json.dumps(record) for record in records) + "\n\n")
+        merger = Merger()
+
+        result = dict(merger.group_merge(path, key=("user", "id"), max_in_memory=50))
+
+        assert result == _expected(merger, records, _user_key)
+
+    def test_empty_input(self):
+        """Test that no records give no groups."""
+        assert list(Merger().group_merge([], key="id")) == []
+
+    def test_missing_key(self):
+        """Test that a record without the key field is rejected."""
+        records = [{"user": {"id": 1}}, {"user": 2}]
+
+        with pytest.raises(ValueError, match="Record 1 has no key at 'user.id'"):
+            list(Merger().group_merge(records, key="user.id"))
+
+    def test_unhashable_key(self):
+        """Test that keys must be hashable."""
+        with pytest.raises(TypeError, match="Record 0 has an unhashable group key"):
+            list(Merger().group_merge([{"id": [1]}], key="id"))
+
+    def test_invalid_arguments(self):
+        """Test that invalid arguments are rejected when called."""
+        merger = Merger()
+
+        with pytest.raises(ValueError, match="partitions"):
+            merger.group_merge([], key="id", partitions=0)
+        with pytest.raises(ValueError, match="jobs"):
+            merger.group_merge([], key="id", jobs=0)
+        with pytest.raises(ValueError, match="at least one field"):
+            merger.group_merge([], key="")
+        with pytest.raises(TypeError, match="Record 0 is not a dictionary"):
+            list(merger.group_merge([1], key="id"))
+
+    def test_strict_mode_in_worker(self):
+        """Test that conflicts found in worker processes are raised."""
+        records = [{"id": i % 2, "v": i} for i in range(20)]
+        merger = Merger().strict()
+
+        with pytest.raises(MergeConflictError, match="'v'"):
+            list(merger.group_merge(records, key="id", max_in_memory=5, jobs=2))
+
+    def test_limits_and_schema(self):
+        """Test that limits apply per record and the schema per result."""
+        records = [{"id": 1, "items": [1, 2]}, {"id": 1, "items": [3]}]
+
+        merger = Merger().limits(max_list_length=2)
+        with pytest.raises(MergeLimitError, match="max_list_length"):
+            list(merger.group_merge(records, key="id"))
+
+        merger = Merger().schema({"items": {"type": list, "items": str}})
+        with pytest.raises(ValueError, match="expected str item"):
+            list(merger.group_merge(records, key="id"))
+
+
+class TestIterNdjson:
+    """Test iter_ndjson."""
+
+    def test_invalid_line(self, tmp_path):
+        """Test that the line number of invalid JSON is reported."""
+        path = tmp_path / "bad.ndjson"
+        path.write_text('{"a": 1}\n{"a": \n')
+
+        with pytest.raises(ValueError, match="line 2"):
+            list(iter_ndjson(path))
@@ -0,0 +1,157 @@
+"""Tests for interning of identical subtrees."""
+
+import pytest
+
+from flexmerge import Interner, Merger
+
+
+class TestInterner:
+    """Test Interner.intern."""
+
+    def test_shares_equal_subtrees(self):
+        """Test that equal subtrees of separate trees become one object."""
+        interner = Interner()
+        first = interner.intern({"flags": {"beta": True, "ids": [1, 2]}, "n": 1})
+        second = interner.intern({"flags": {"beta": True, "ids": [1, 2]}, "n": 2})
+
+        assert first["flags"] is second["flags"]
+        assert first["flags"]["ids"] is second["flags"]["ids"]
+        assert first == {"flags": {"beta": True, "ids": [1, 2]}, "n": 1}
+        assert second["n"] == 2
+
+    def test_shares_within_one_tree(self):
+        """Test that duplicates inside a single tree are shared."""
+        tree = {"a": [{"x": 1}, {"x": 1}], "b": {"x": 1}}
+
+        result = Interner().intern(tree)
+
+        assert result["a"][0] is result["a"][1] is result["b"]
+
+    @pytest.mark.parametrize(
+        "left, right",
+        [
+            ({"v": 1}, {"v": True}),
+            ({"v": 1}, {"v": 1.0}),
+            ({"v": 0.0}, {"v": -0.0}),
+            ({"v": []}, {"v": {}}),
+            ([1, [2]], [1, 2]),
+        ],
+    )
+    def test_distinguishes_equal_but_different_values(self, left, right):
+        """Test that values that compare equal but differ are not merged."""
+        interner = Interner()
+
+        a = interner.intern(left)
+        b = interner.intern(right)
+
+        assert a is not b
+        assert repr(b) == repr(right)
+
+    def test_interns_keys(self):
+        """Test that string keys of canonical dicts are interned."""
+        key = "".join(["dyn", "amic_key"])
+        result = Interner().intern({key: 1})
+
+        assert next(iter(result)) is "dynamic_key"  # noqa: F632
+
+    def test_input_is_not_modified_or_kept(self):
+        """Test that interning copies the tree instead of rewriting it."""
+        interner = Interner()
+        first = interner.intern({"a": {"x": 1}})
+        tree = {"a": {"x": 1}, "b": [{"x": 1}]}
+        inner = tree["a"]
+
+        result = interner.intern(tree)
+
+        assert tree["a"] is inner and tree["b"][0] is not first["a"]
+        assert result["a"] is result["b"][0] is first["a"]
+        assert result is not tree and result["b"] is not tree["b"]
+        inner["x"] = 2
+        assert first["a"] == result["b"][0] == {"x": 1}
+
+    def test_unsupported_leaves_are_kept(self):
+        """Test that containers with non-scalar leaves are not shared."""
+        interner = Interner()
+        a = interner.intern({"inner": {"t": (1, 2)}})
+        b = interner.intern({"inner": {"t": (1, 2)}})
+
+        assert a["inner"] is not b["inner"]
+
+    def test_cycles(self):
+        """Test that cyclic trees are handled without sharing the cycle."""
+        tree = {"leaf": {"x": 1}}
+        tree["self"] = tree
+
+        result = Interner().intern(tree)
+
+        assert result is tree
+        assert result["self"] is tree
+
+    def test_bounded_table_and_stats(self):
+        """Test LRU eviction and the reported statistics."""
+        interner = Interner(max_entries=2)
+        for i in range(5):
+            interner.intern({"v": i})
+        interner.intern({"v": 4})
+
+        assert len(interner) == 2
+        assert interner.stats["hits"] == 1
+        assert interner.stats["misses"] == 5
+        assert interner.stats["saved_bytes"] > 0
+
+        interner.clear()
+        assert interner.stats == {
+            "entries": 0,
+            "hits": 0,
+            "misses": 0,
+            "saved_bytes": 0,
+        }
+
+    def test_invalid_max_entries(self):
+        """Test that the table must hold at least one entry."""
+        with pytest.raises(ValueError):
+            Interner(max_entries=0)
+
+
+class TestMergerInterning:
+    """Test interning of merge results through Merger."""
+
+    def test_tenant_overlays_share_blocks(self):
+        """Test that results merged onto one base share identical blocks."""
+        interner = Interner()
+        merger = Merger().interner(interner)
+        base = {"features": {"search": True, "export": ["csv"]}}
+
+        results = [merger.merge(base, {"tenant": f"t{i}"}) for i in range(100)]
+
+        assert all(r["features"] is results[0]["features"] for r in results)
+        assert [r["tenant"] for r in results[:2]] == ["t0", "t1"]
+        assert interner.stats["hits"] >= 99
+
+    def test_inputs_are_not_aliased(self):
+        """Test that later changes to the inputs do not reach the results."""
+        merger = Merger().interner(Interner())
+        overlay = {"flags": {"x": {"a": 1}}, "ids": [1, 2]}
+
+        result = merger.merge({"t": 2}, overlay)
+        overlay["flags"]["x"]["a"] = 999
+        overlay["ids"].append(3)
+
+        assert result == {"t": 2, "flags": {"x": {"a": 1}}, "ids": [1, 2]}
+        assert merger.merge({"t": 2}, {"flags": {"x": {"a": 1}}}) == {
+            "t": 2,
+            "flags": {"x": {"a": 1}},
+        }
+
+    def test_merge_many_and_copy(self):
+        """Test that merge_many interns and copies share the interner."""
+        interner = Interner()
+        merger = Merger().interner(interner).copy()
+        rows = [({"a": {"b": [1]}}, {"c": i}) for i in range(3)]
+
+        results = list(merger.merge_many(rows))
+
+        assert results[0]["a"] is results[2]["a"]
+        assert merger.interner(None).merge({"a": {"b": [1]}})["a"] is not (
+            results[0]["a"]
+        )
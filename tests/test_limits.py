@@ -0,0 +1,156 @@
+"""Tests for merge resource limits."""
+
+import pickle
+
+import pytest
+
+from flexmerge import MergeLimitError, MergeLimits, Merger
+from flexmerge.limits import MergeGuard
+
+
+@pytest.fixture(params=["recursive", "iterative", "union"])
+def merger(request):
+    """Merger using each engine."""
+    return Merger().engine(request.param)
+
+
+class TestLimits:
+    """Test each limit through Merger.merge."""
+
+    def test_within_limits(self, merger):
+        """Test that merges within the limits give the usual result."""
+        left = {"a": {"x": 1, "l": [1, 2]}, "b": [{"k": 1}]}
+        right = {"a": {"y": 2, "l": [3]}, "c": {"d": {"e": 1}}}
+
+        merger.limits(max_nodes=100, max_list_length=10, max_depth=3, timeout=10)
+
+        assert merger.merge(left, right) == Merger().merge(left, right)
+
+    def test_max_nodes(self, merger):
+        """Test that the node budget covers values taken from a layer."""
+        right = {"a": {"b": {f"k{i}": i for i in range(100)}}}
+
+        with pytest.raises(MergeLimitError) as info:
+            merger.limits(max_nodes=50).merge({"a": {"x": 1}}, right)
+
+        assert info.value.limit == "max_nodes"
+        assert info.value.maximum == 50
+        assert info.value.path[:2] == ("a", "b")
+
+    def test_max_list_length_before_strategy(self, merger):
+        """Test that oversized lists are rejected before they are merged."""
+        calls = []
+
+        def strategy(left, right):
+            calls.append(len(right))
+            return left + right
+
+        merger.lists(strategy).limits(max_list_length=100)
+        left = {"cfg": {"items": [{"n": i} for i in range(60)]}}
+        right = {"cfg": {"items": [{"n": i} for i in range(60)]}}
+
+        with pytest.raises(MergeLimitError, match="max_list_length=100 at 'cfg.items'"):
+            merger.merge(left, right)
+        assert calls == []
+
+    def test_max_list_length_in_first_layer(self, merger):
+        """Test that lists of the first layer are checked too."""
+        with pytest.raises(MergeLimitError) as info:
+            merger.limits(max_list_length=2).merge({"a": [{"b": [1, 2, 3]}]}, {})
+
+        assert info.value.path == ("a", 0, "b")
+
+    def test_max_depth(self, merger):
+        """Test that nesting deeper than the limit is rejected."""
+        merger.limits(max_depth=3)
+        assert merger.merge({"a": {"b": {}}}, {"a": {"b": {"c": 1}}})
+
+        with pytest.raises(MergeLimitError) as info:
+            merger.merge({"a": {"b": {}}}, {"a": {"b": {"c": {"d": 1}}}})
+
+        assert info.value.limit == "max_depth"
+        assert info.value.path == ("a", "b", "c")
+
+    def test_max_output_nodes(self, merger):
+        """Test that the size of the result is limited."""
+        merger.limits(max_output_nodes=3)
+        assert merger.merge({"a": 1}, {"b": 2}) == {"a": 1, "b": 2}
+
+        with pytest.raises(MergeLimitError, match="max_output_nodes"):
+            merger.merge({"a": 1, "b": 2}, {"c": [1, 2]})
+
+    def test_timeout(self, merger):
+        """Test that the merge stops once the time is up."""
+        right = {f"k{i}": {"v": i} for i in range(5000)}
+
+        with pytest.raises(MergeLimitError, match="timeout=0"):
+            merger.limits(timeout=0).merge({}, right)
+
+    def test_per_call_limits(self, merger):
+        """Test that per-call limits replace the merger's limits."""
+        merger.limits(max_nodes=1)
+
+        result = merger.merge({"a": 1}, {"b": 2}, limits=MergeLimits(max_nodes=10))
+        assert result == {"a": 1, "b": 2}
+        with pytest.raises(MergeLimitError):
+            Merger().merge({"a": 1}, {"b": 2}, limits=MergeLimits(max_nodes=1))
+
+    def test_clear_limits(self):
+        """Test that calling limits() without arguments removes them."""
+        merger = Merger().limits(max_nodes=1)
+        assert merger.copy()._limits == MergeLimits(max_nodes=1)
+
+        assert merger.limits().merge({"a": 1}, {"b": 2}) == {"a": 1, "b": 2}
+
+    def test_shallow_strategy(self):
+        """Test that layers are checked up front with other dict strategies."""
+        merger = Merger().dicts("shallow").limits(max_depth=2)
+
+        with pytest.raises(MergeLimitError) as info:
+            merger.merge({"a": 1}, {"b": {"c": {"d": 1}}})
+
+        assert info.value.path == ("b", "c")
+
+    def test_merge_many(self):
+        """Test that every row is merged under its own limits."""
+        merger = Merger().limits(max_nodes=3)
+        rows = [({"a": 1}, {"b": 2}), ({"a": 1, "b": 2}, {"c": 3, "d": 4})]
+
+        results = merger.merge_many(rows)
+
+        assert next(results) == {"a": 1, "b": 2}
+        with pytest.raises(MergeLimitError):
+            next(results)
+
+    def test_merge_fingerprinted(self):
+        """Test that the fingerprinted fast path is limited too."""
+        merger = Merger().limits(max_list_length=2)
+
+        with pytest.raises(MergeLimitError):
+            merger.merge_fingerprinted({"a": [1]}, {"a": [2, 3]})
+
+
+class TestMergeGuard:
+    """Test the guard directly."""
+
+    def test_cyclic_layer(self):
+        """Test that cyclic values are walked once."""
+        layer = {"a": {}}
+        layer["a"]["self"] = layer["a"]
+
+        guard = MergeGuard(MergeLimits(max_nodes=10))
+        guard.check_layer(layer)
+
+        assert guard.nodes == 2
+
+    def test_error_message_at_top_level(self):
+        """Test the message of an error at the top level."""
+        error = MergeLimitError("timeout", 1.0, ())
+        assert str(error) == "Merge exceeded timeout=1.0 at the top level"
+
+    def test_error_pickles(self):
+        """Test that errors keep their fields through pickling."""
+        error = pickle.loads(pickle.dumps(MergeLimitError("max_nodes", 5, ("a",))))
+
+        assert (error.limit, error.maximum, error.path) == ("max_nodes", 5, ("a",))
+        assert str(error) == "Merge exceeded max_nodes=5 at 'a'"
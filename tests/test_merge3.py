@@ -0,0 +1,136 @@
+"""Tests for three-way merges."""
+
+import pytest
+
+from flexmerge import MergeConflictError, Merger
+from flexmerge.merge3 import DELETED
+
+
+@pytest.fixture
+def base():
+    """Common ancestor."""
+    return {
+        "server": {"host": "localhost", "port": 80, "tls": {"enabled": False}},
+        "features": ["a"],
+        "owner": "ops",
+        "legacy": True,
+    }
+
+
+class TestMerge3:
+    """Test Merger.merge3."""
+
+    def test_one_sided_changes(self, base):
+        """Test that changes from either side are combined."""
+        ours = {**base, "server": {**base["server"], "port": 8080}, "local": 1}
+        theirs = {**base, "owner": "platform"}
+        del theirs["legacy"]
+
+        result = Merger().merge3(base, ours, theirs)
+
+        assert result == {
+            "server": {"host": "localhost", "port": 8080, "tls": {"enabled": False}},
+            "features": ["a"],
+            "owner": "platform",
+            "local": 1,
+        }
+
+    def test_local_override_is_kept(self, base):
+        """Test that a local override survives when upstream did not touch it."""
+        ours = {**base, "owner": "me"}
+
+        assert Merger().merge3(base, ours, base)["owner"] == "me"
+
+    def test_both_sides_change_nested_dicts(self, base):
+        """Test that nested dicts changed on both sides are merged per key."""
+        ours = {**base, "server": {**base["server"], "port": 443}}
+        theirs = {**base, "server": {**base["server"], "tls": {"enabled": True}}}
+
+        result = Merger().merge3(base, ours, theirs)
+
+        assert result["server"] == {
+            "host": "localhost",
+            "port": 443,
+            "tls": {"enabled": True},
+        }
+
+    def test_both_sides_change_lists(self, base):
+        """Test that lists changed on both sides use the list strategy."""
+        ours = {**base, "features": ["a", "b"]}
+        theirs = {**base, "features": ["a", "c"]}
+
+        result = Merger().lists("unique").merge3(base, ours, theirs)
+
+        assert result["features"] == ["a", "b", "c"]
+
+    def test_same_change_on_both_sides(self, base):
+        """Test that identical edits do not conflict."""
+        ours = {**base, "owner": "x", "new": {"k": 1}}
+        theirs = {**base, "owner": "x", "new": {"k": 1}}
+
+        result = Merger().merge3(base, ours, theirs)
+
+        assert result["owner"] == "x"
+        assert result["new"] == {"k": 1}
+
+    def test_conflicts_are_reported(self, base):
+        """Test that every true conflict is reported."""
+        ours = {**base, "owner": "a", "server": {**base["server"], "port": 1}}
+        theirs = {**base, "owner": "b", "server": {**base["server"], "port": 2}}
+        del ours["legacy"]
+        theirs["legacy"] = False
+
+        with pytest.raises(MergeConflictError) as info:
+            Merger().merge3(base, ours, theirs)
+
+        conflicts = {c.path: (c.left, c.right) for c in info.value.conflicts}
+        assert conflicts == {
+            ("owner",): ("a", "b"),
+            ("server", "port"): (1, 2),
+            ("legacy",): (DELETED, False),
+        }
+        assert {c.layers for c in info.value.conflicts} == {(1, 2)}
+
+    @pytest.mark.parametrize("side, expected", [("ours", "a"), ("theirs", "b")])
+    def test_conflict_policies(self, base, side, expected):
+        """Test resolving conflicts for one side."""
+        ours = {**base, "owner": "a"}
+        theirs = {**base, "owner": "b"}
+
+        result = Merger().merge3(base, ours, theirs, on_conflict=side)
+
+        assert result["owner"] == expected
+
+    def test_unchanged_subtrees_are_not_walked(self):
+        """Test that subtrees unchanged on one side are taken as-is."""
+
+        class Exploding(dict):
+            def items(self):
+                raise AssertionError("walked")
+
+            def __iter__(self):
+                raise AssertionError("walked")
+
+        big = Exploding(a=1)
+        base = {"big": big, "x": 1}
+
+        result = Merger().merge3(base, {"big": big, "x": 2}, {"big": big, "x": 1})
+
+        assert result["big"] is big
+        assert result["x"] == 2
+
+    def test_shallow_dict_strategy(self, base):
+        """Test that other dict strategies merge changed dicts as a whole."""
+        ours = {**base, "server": {"host": "a"}}
+        theirs = {**base, "server": {"port": 1}}
+
+        result = Merger().dicts("shallow").merge3(base, ours, theirs)
+
+        assert result["server"] == {"host": "a", "port": 1}
+
+    def test_invalid_arguments(self, base):
+        """Test argument validation."""
+        with pytest.raises(TypeError, match="Argument 2"):
+            Merger().merge3(base, base, [])
+        with pytest.raises(ValueError, match="Unknown conflict policy"):
+            Merger().merge3(base, base, base, on_conflict="left")
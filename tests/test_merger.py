@@ -4,7 +4,16 @@ from typing import Any
 
 import pytest
 
-from flexmerge import BuiltinDictStrategies, BuiltinListStrategies, Merger
+from flexmerge import (
+    BuiltinDictStrategies,
+    BuiltinListStrategies,
+    BuiltinScalarStrategies,
+    MergeConflictError,
+    MergeLimitError,
+    Merger,
+    by_key,
+    context_strategy,
+)
 
 
 class TestMergerBasics:
@@ -91,6 +100,8 @@ class TestListStrategies:
             ("unique", [1, 2, 3, 4]),
             ("replace", [3, 4]),
             ("keep", [1, 2]),
+            ("sorted_merge", [1, 2, 3, 4]),
+            ("sorted_unique", [1, 2, 3, 4]),
         ],
     )
     def test_list_strategies(self, strategy, expected, list_dicts):
@@ -107,6 +118,71 @@ class TestListStrategies:
         result = merger.merge(dict1, dict2)
         assert result == {"items": [{"a": 1}, [1, 2], {"b": 2}, [3, 4]]}
 
+    def test_by_key_strategy(self):
+        """Test merging lists of records by key."""
+        merger = Merger().lists(by_key("name"))
+        dict1 = {"services": [{"name": "web", "port": 80}, {"name": "db"}]}
+        dict2 = {"services": [{"name": "web", "port": 8080}, {"name": "cache"}]}
+        dict3 = {"services": [{"name": "db", "replicas": 2}]}
+        result = merger.merge(dict1, dict2, dict3)
+        assert result == {
+            "services": [
+                {"name": "web", "port": 8080},
+                {"name": "db", "replicas": 2},
+                {"name": "cache"},
+            ]
+        }
+
+    @pytest.mark.parametrize("use_context", [False, True])
+    def test_by_key_records_use_scalar_strategy(self, use_context):
+        """Test that matched records are reduced but keep their key."""
+
+        @context_strategy
+        def plain(left, right, ctx):
+            return ctx.recurse(left, right)
+
+        merger = Merger().lists(by_key("id")).scalars("sum")
+        if use_context:
+            merger.dicts(plain)
+        result = merger.merge(
+            {"l": [{"id": 1, "n": 1}, {"id": 2, "n": 5}]},
+            {"l": [{"id": 1, "n": 2}, {"id": 1, "n": 4}]},
+        )
+        assert result == {"l": [{"id": 1, "n": 7}, {"id": 2, "n": 5}]}
+
+    @pytest.mark.parametrize(
+        "scalars, expected",
+        [
+            ("count", [{"name": "a", "n": 3}, {"name": "b", "n": 1}]),
+            ("min", [{"name": "a", "n": 1}, {"name": "b", "n": 7}]),
+            ("max", [{"name": "a", "n": 5}, {"name": "b", "n": 7}]),
+        ],
+    )
+    def test_by_key_string_keys_skip_scalar_strategy(self, scalars, expected):
+        """Test that reducers leave string keys out and lift record fields."""
+        merger = Merger().lists(by_key("name")).scalars(scalars)
+        result = merger.merge(
+            {"l": [{"name": "a", "n": 1}]},
+            {"l": [{"name": "a", "n": 5}]},
+            {"l": [{"name": "a", "n": 2}, {"name": "b", "n": 7}]},
+        )
+        assert result == {"l": expected}
+
+    def test_by_key_count_appended_records(self):
+        """Test that appended and duplicate records are counted per layer."""
+        merger = Merger().lists(by_key("name")).scalars("count")
+        result = merger.merge(
+            {"l": [{"name": "b", "n": 4}]},
+            {"l": [{"name": "a", "n": 4}, {"name": "a", "n": 4}]},
+        )
+        assert result == {"l": [{"name": "b", "n": 1}, {"name": "a", "n": 2}]}
+        result = merger.merge(
+            {"l": [{"name": "a", "n": 4, "tags": [{"name": "t", "c": 0}]}]},
+            {"l": [{"name": "a", "n": 4, "tags": [{"name": "t", "c": 0}]}]},
+            {"l": [{"name": "a", "n": 4, "tags": [{"name": "t", "c": 0}]}]},
+        )
+        assert result == {"l": [{"name": "a", "n": 3, "tags": [{"name": "t", "c": 3}]}]}
+
     def test_enum_strategy(self, list_dicts):
         """Test using enum for strategy."""
         merger = Merger().lists(BuiltinListStrategies.UNIQUE)
@@ -149,6 +225,118 @@ class TestDictStrategies:
         assert result == {"nested": {"b": 3, "c": 4}}
 
 
+class TestScalarStrategies:
+    """Test scalar merge strategies."""
+
+    @pytest.fixture
+    def metrics(self):
+        """Metric dicts from three hosts."""
+        return [
+            {"requests": {"ok": 10, "failed": None}, "region": "eu"},
+            {"requests": {"ok": 5, "failed": 2}, "latency": {"p99": 120}},
+            {"requests": {"ok": 1}, "latency": {"p99": 80}, "region": "us"},
+        ]
+
+    @pytest.mark.parametrize("engine", ["iterative", "recursive", "union"])
+    @pytest.mark.parametrize(
+        "strategy,expected",
+        [
+            (
+                "replace",
+                {"requests": {"ok": 1, "failed": 2}, "latency": {"p99": 80}},
+            ),
+            (
+                "sum",
+                {"requests": {"ok": 16, "failed": 2}, "latency": {"p99": 200}},
+            ),
+            ("min", {"requests": {"ok": 1, "failed": 2}, "latency": {"p99": 80}}),
+            (
+                "max",
+                {"requests": {"ok": 10, "failed": 2}, "latency": {"p99": 120}},
+            ),
+            ("count", {"requests": {"ok": 3, "failed": 2}, "latency": {"p99": 2}}),
+            (
+                "first_non_null",
+                {"requests": {"ok": 10, "failed": 2}, "latency": {"p99": 120}},
+            ),
+            (
+                "last_non_null",
+                {"requests": {"ok": 1, "failed": 2}, "latency": {"p99": 80}},
+            ),
+        ],
+    )
+    def test_builtin_scalar_strategies(self, metrics, engine, strategy, expected):
+        """Test reducing scalars with each built-in strategy and engine."""
+        result = Merger().engine(engine).scalars(strategy).merge(*metrics)
+        assert result["requests"] == expected["requests"]
+        assert result["latency"] == expected["latency"]
+
+    def test_lists_use_list_strategy(self):
+        """Test that lists are not passed to the scalar strategy."""
+        result = Merger().scalars("sum").merge({"a": [1], "b": 1}, {"a": [2], "b": 2})
+        assert result == {"a": [1, 2], "b": 3}
+
+    def test_mixed_types_replace(self):
+        """Test that a dict replacing a scalar is not reduced."""
+        result = Merger().scalars("sum").merge({"a": 1}, {"a": {"x": 1}})
+        assert result == {"a": {"x": 1}}
+
+    def test_count_single_layer_values(self):
+        """Test that count starts at one for values set by one layer."""
+        first = {"a": {"b": "x"}, "tags": ["t"]}
+        result = Merger().scalars("count").merge(first, {"c": {"d": None}})
+        assert result == {"a": {"b": 1}, "tags": ["t"], "c": {"d": 1}}
+        assert first == {"a": {"b": "x"}, "tags": ["t"]}
+
+    def test_custom_callable(self):
+        """Test a custom scalar function."""
+        merger = Merger().scalars(lambda left, right: f"{left},{right}")
+        result = merger.merge({"a": "x"}, {"a": "y"}, {"a": "z"})
+        assert result == {"a": "x,y,z"}
+
+    def test_enum_strategy(self):
+        """Test using the enum for the scalar strategy."""
+        merger = Merger().scalars(BuiltinScalarStrategies.MAX)
+        assert merger.merge({"a": 3}, {"a": 2}) == {"a": 3}
+
+    def test_unknown_strategy(self):
+        """Test that an unknown name is rejected."""
+        with pytest.raises(ValueError, match="Unknown scalar strategy: avg"):
+            Merger().scalars("avg")
+
+    def test_merge_many_and_context_strategies(self, metrics):
+        """Test that batch merges and v2 dict strategies reduce scalars too."""
+        merger = Merger().scalars("sum")
+        expected = merger.merge(*metrics)
+
+        assert list(merger.merge_many([metrics])) == [expected]
+
+        @context_strategy
+        def passthrough(left, right, ctx):
+            return ctx.recurse(left, right)
+
+        assert merger.copy().dicts(passthrough).merge(*metrics) == expected
+
+    def test_merge_fingerprinted_does_not_share_identical_subtrees(self):
+        """Test that identical subtrees are still reduced."""
+        layer = {"a": {"b": 1}}
+        result, _ = Merger().scalars("sum").merge_fingerprinted(layer, layer)
+        assert result == {"a": {"b": 2}}
+
+    def test_strict_mode_ignores_reduced_scalars(self):
+        """Test that differing scalars are not conflicts when reduced."""
+        merger = Merger().scalars("sum").strict()
+        assert merger.merge({"a": 1}, {"a": 2}) == {"a": 3}
+        with pytest.raises(MergeConflictError):
+            merger.merge({"a": 1}, {"a": {"b": 2}})
+
+    def test_copy_and_repr(self):
+        """Test that copies keep the scalar strategy and repr shows it."""
+        merger = Merger().scalars("sum")
+        assert merger.copy().merge({"a": 1}, {"a": 2}) == {"a": 3}
+        assert repr(merger) == "Merger(lists='append', dicts='deep', scalars='sum')"
+
+
 class TestCustomStrategies:
     """Test custom strategy functionality."""
 
@@ -246,6 +434,144 @@ class TestCustomStrategies:
         assert result2 == {"a": 1, "b": 2, "nested": {"y": 2}}
 
 
+class TestMergeMany:
+    """Test batch merging with merge_many."""
+
+    def test_yields_one_result_per_row(self):
+        """Test that every row is merged independently."""
+        merger = Merger().lists("unique")
+        rows = [
+            ({"a": 1, "tags": ["x"]}, {"b": 2, "tags": ["x", "y"]}),
+            ({"a": 1}, {"a": 2}, {"a": 3}),
+            ({"only": True},),
+            (),
+        ]
+        assert list(merger.merge_many(rows)) == [
+            {"a": 1, "b": 2, "tags": ["x", "y"]},
+            {"a": 3},
+            {"only": True},
+            {},
+        ]
+
+    def test_is_lazy_generator(self):
+        """Test that rows are consumed lazily."""
+        consumed = []
+
+        def rows():
+            for i in range(3):
+                consumed.append(i)
+                yield ({"i": i}, {"j": i})
+
+        results = Merger().merge_many(rows())
+        assert next(results) == {"i": 0, "j": 0}
+        assert consumed == [0]
+
+    def test_matches_merge(self):
+        """Test that results are identical to Merger.merge."""
+        merger = Merger().dicts("shallow")
+        row = ({"a": {"x": 1}}, {"a": {"y": 2}, "b": [1]})
+        assert next(merger.merge_many([row])) == merger.merge(*row)
+
+    def test_result_is_independent_of_first_input(self):
+        """Test that results do not share nested state with the first dict."""
+        first = {"nested": {"a": 1}}
+        result = next(Merger().merge_many([(first,)]))
+        result["nested"]["b"] = 2
+        assert first == {"nested": {"a": 1}}
+
+    def test_invalid_row(self):
+        """Test that invalid rows raise with row and argument index."""
+        rows = [({"a": 1},), ({"a": 1}, "not a dict")]
+        with pytest.raises(TypeError, match="Row 1 argument 1 is not a dictionary"):
+            list(Merger().merge_many(rows))
+
+    def test_trusted_skips_validation(self):
+        """Test that trusted input is not validated per row."""
+        rows = [({"a": 1}, {"b": 2})]
+        assert list(Merger().merge_many(rows, trusted=True)) == [{"a": 1, "b": 2}]
+
+
+class TestMergeFanout:
+    """Test merging one base with many overlays."""
+
+    @pytest.fixture
+    def base(self):
+        """A base with several subtrees."""
+        return {
+            "db": {"host": "localhost", "port": 5432},
+            "features": {"a": True, "b": False},
+            "tags": ["base"],
+        }
+
+    @pytest.mark.parametrize("engine", ["recursive", "iterative", "union", "auto"])
+    @pytest.mark.parametrize("dicts", ["deep", "shallow", "replace", "keep"])
+    def test_matches_merge(self, base, engine, dicts):
+        """Test that results equal Merger.merge for each overlay."""
+        merger = Merger().engine(engine).dicts(dicts)
+        overlays = [{"db": {"port": 6432}, "tags": ["t1"]}, {}, {"new": {"x": 1}}]
+
+        results = list(merger.merge_fanout(base, overlays))
+
+        assert results == [merger.merge(base, overlay) for overlay in overlays]
+
+    def test_shares_untouched_subtrees(self, base):
+        """Test that only the levels an overlay writes to are copied."""
+        result = next(Merger().merge_fanout(base, [{"db": {"port": 1}}]))
+
+        assert result["features"] is base["features"]
+        assert result["db"] is not base["db"]
+        assert base["db"]["port"] == 5432
+
+    def test_copy_policy(self, base):
+        """Test that copied results do not share state with the base."""
+        result = next(Merger().merge_fanout(base, [{"db": {"port": 1}}], copy=True))
+
+        result["features"]["c"] = True
+        result["tags"].append("x")
+
+        assert base["features"] == {"a": True, "b": False}
+        assert base["tags"] == ["base"]
+
+    def test_base_prepared_once(self, base):
+        """Test that the base is lifted once for scalar strategies with initial."""
+        merger = Merger().scalars("count")
+
+        results = list(merger.merge_fanout({"hits": 5}, [{"hits": 1}, {}]))
+
+        assert results == [{"hits": 2}, {"hits": 1}]
+
+    def test_is_lazy_generator(self, base):
+        """Test that overlays are consumed lazily."""
+        consumed = []
+
+        def overlays():
+            for i in range(3):
+                consumed.append(i)
+                yield {"i": i}
+
+        results = Merger().merge_fanout(base, overlays())
+        assert next(results)["i"] == 0
+        assert consumed == [0]
+
+    def test_strict_and_limits(self, base):
+        """Test that each overlay is checked on its own."""
+        strict = Merger().strict().merge_fanout(base, [{"x": 1}, {"db": {"port": 1}}])
+        assert next(strict) == {**base, "x": 1}
+        with pytest.raises(MergeConflictError):
+            next(strict)
+
+        limited = Merger().limits(max_depth=2)
+        with pytest.raises(MergeLimitError, match="at 'a.b'"):
+            list(limited.merge_fanout(base, [{"a": {"b": {"c": 1}}}]))
+
+    def test_invalid_arguments(self, base):
+        """Test that non-mapping bases and overlays are rejected."""
+        with pytest.raises(TypeError, match="Base is not a dictionary"):
+            list(Merger().merge_fanout([1], [{}]))
+        with pytest.raises(TypeError, match="Overlay 1 is not a dictionary"):
+            list(Merger().merge_fanout(base, [{}, "x"]))
+
+
 class TestMethodChaining:
     """Test method chaining functionality."""
 
@@ -318,6 +644,13 @@ class TestMergerCopy:
         assert copy._custom_list_strategies["custom_list"] is custom_list_strategy
         assert copy._custom_dict_strategies["custom_dict"] is custom_dict_strategy
 
+    def test_copy_preserves_unnamed_strategies(self):
+        """Test that copy keeps strategies that have no registered name."""
+        strategy = by_key("id")
+        original = Merger().lists(strategy)
+        copy = original.copy()
+        assert copy._list_strategy is strategy
+
 
 class TestMergerRepr:
     """Test string representation."""
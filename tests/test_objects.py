@@ -0,0 +1,165 @@
+"""Tests for merging dataclass and __slots__ instances."""
+
+from dataclasses import asdict, dataclass, field
+from typing import NamedTuple, Optional
+
+import pytest
+
+from flexmerge import Merger
+
+
+@dataclass
+class Database:
+    """Nested dataclass."""
+
+    host: str = "localhost"
+    options: dict = field(default_factory=dict)
+
+
+@dataclass(frozen=True, slots=True)
+class Limits:
+    """Frozen dataclass with slots."""
+
+    rate: int = 10
+    burst: Optional[int] = None
+
+
+@dataclass
+class Config:
+    """Top-level dataclass with every kind of field."""
+
+    name: str
+    tags: list = field(default_factory=list)
+    database: Database = field(default_factory=Database)
+    limits: Limits = field(default_factory=Limits)
+    computed: int = field(default=0, init=False)
+
+    def __post_init__(self):
+        self.computed = len(self.tags)
+
+
+class Point:
+    """Plain class with __slots__."""
+
+    __slots__ = ("x", "y")
+
+    def __init__(self, x, y=None):
+        self.x = x
+        if y is not None:
+            self.y = y
+
+
+class Point3(Point):
+    """Subclass adding a slot."""
+
+    __slots__ = "z"
+
+
+class Pair(NamedTuple):
+    """Tuple subclass, which is not a mergeable object."""
+
+    a: int
+    b: int
+
+
+@pytest.fixture
+def configs():
+    """Two layered configurations."""
+    base = Config(
+        "base",
+        ["a"],
+        Database("db", {"pool": {"size": 5}, "ssl": True}),
+        Limits(10, 20),
+    )
+    override = Config("prod", ["b"], Database("db.prod", {"pool": {"timeout": 3}}))
+    return base, override
+
+
+class TestMergeObjects:
+    """Test Merger.merge_objects."""
+
+    def test_matches_asdict_round_trip(self, configs):
+        """Test that the result matches asdict + merge + rebuild."""
+        merger = Merger().lists("unique")
+
+        result = merger.merge_objects(*configs)
+
+        expected = merger.merge(*(asdict(c) for c in configs))
+        assert asdict(result) == {**expected, "computed": 2}
+        assert type(result.database) is Database
+        assert type(result.limits) is Limits
+
+    def test_nested_values(self, configs):
+        """Test nested dataclass, dict and frozen slots fields."""
+        result = Merger().merge_objects(*configs)
+
+        assert result.name == "prod"
+        assert result.tags == ["a", "b"]
+        assert result.database.options == {
+            "pool": {"size": 5, "timeout": 3},
+            "ssl": True,
+        }
+        assert result.limits == Limits(10, None)
+        assert result.computed == 2
+
+    def test_inputs_are_not_modified(self, configs):
+        """Test that the inputs stay unchanged and are not shared."""
+        base, override = configs
+
+        result = Merger().merge_objects(base, override)
+        result.database.options["pool"]["size"] = 99
+
+        assert base.database.options["pool"]["size"] == 5
+        assert result.database is not base.database
+
+    def test_slots_objects(self):
+        """Test plain __slots__ classes, including unset slots."""
+        result = Merger().merge_objects(Point3([1], 2), Point3([2]))
+
+        assert type(result) is Point3
+        assert result.x == [1, 2]
+        assert result.y == 2
+        assert not hasattr(result, "z")
+
+    def test_single_object_is_copied(self, configs):
+        """Test that merging one object returns a copy."""
+        base, _ = configs
+
+        result = Merger().merge_objects(base)
+
+        assert result == base
+        assert result.tags is not base.tags
+
+    @pytest.mark.parametrize("scalars", ["sum", "count"])
+    def test_scalar_strategy(self, scalars):
+        """Test that scalar fields are reduced the way merge reduces them."""
+        merger = Merger().scalars(scalars)
+        layers = [
+            Database(1, {"pool": 1}),
+            Database(2, {"pool": 2}),
+            Database(4, {"ssl": 3}),
+        ]
+
+        result = merger.merge_objects(*layers)
+
+        assert asdict(result) == merger.merge(*(asdict(d) for d in layers))
+        assert result.host == (7 if scalars == "sum" else 3)
+        assert asdict(merger.merge_objects(layers[0])) == merger.merge(
+            asdict(layers[0])
+        )
+
+    def test_shallow_dict_strategy(self, configs):
+        """Test that other dict strategies apply to the top-level fields."""
+        result = Merger().dicts("shallow").merge_objects(*configs)
+
+        assert result.database is configs[1].database
+        assert result.tags == ["b"]
+
+    @pytest.mark.parametrize(
+        "objects",
+        [(Pair(1, 2), Pair(3, 4)), ({"a": 1}, {"a": 2}), (Point(1), Point3(1))],
+    )
+    def test_unsupported_inputs(self, objects):
+        """Test that unsupported or mixed classes are rejected."""
+        with pytest.raises(TypeError):
+            Merger().merge_objects(*objects)
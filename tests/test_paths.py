@@ -0,0 +1,131 @@
+"""Tests for key path patterns and projection."""
+
+import pytest
+
+from flexmerge import Merger
+from flexmerge.paths import PathTrie, compile_patterns, parse_path, project
+
+
+@pytest.fixture
+def layer():
+    """A layered configuration with several subtrees."""
+    return {
+        "database": {"host": "db", "port": 5432, "password": "secret"},
+        "cache": {"ttl": 60},
+        "services": {
+            "web": {"port": 80, "image": "web:1"},
+            "worker": {"port": 81, "image": "worker:1"},
+        },
+        "debug": True,
+    }
+
+
+class TestPathTrie:
+    """Test compiling and walking patterns."""
+
+    def test_parse_path(self):
+        """Test splitting dotted patterns and passing key sequences."""
+        assert parse_path("a.b") == ("a", "b")
+        assert parse_path("") == ()
+        assert parse_path(("a.b", 1)) == ("a.b", 1)
+
+    def test_step_follows_literals_and_wildcards(self):
+        """Test that a key follows both literal and wildcard children."""
+        trie = PathTrie.compile(["a.b", "*.c"])
+
+        nodes = PathTrie.step((trie,), "a")
+
+        assert len(nodes) == 2
+        assert PathTrie.matched(PathTrie.step(nodes, "b"))
+        assert PathTrie.matched(PathTrie.step(nodes, "c"))
+        assert PathTrie.step(nodes, "d") == ()
+
+    def test_values(self):
+        """Test that patterns carry values."""
+        trie = PathTrie.compile({"a.*": 1, "a.b": 2})
+
+        nodes = PathTrie.step(PathTrie.step((trie,), "a"), "b")
+
+        assert sorted(PathTrie.values(nodes)) == [1, 2]
+
+    def test_compile_cache(self):
+        """Test that equal pattern lists share one compiled trie."""
+        assert compile_patterns(["a", "b.*"]) is compile_patterns(("a", "b.*"))
+        trie = PathTrie.compile(["a"])
+        assert compile_patterns(trie) is trie
+
+
+class TestProject:
+    """Test projecting layers onto patterns."""
+
+    def test_include(self, layer):
+        """Test that included subtrees are shared with the layer."""
+        result = project(layer, compile_patterns(["database", "cache.*"]))
+
+        assert result == {"database": layer["database"], "cache": {"ttl": 60}}
+        assert result["database"] is layer["database"]
+
+    def test_wildcard(self, layer):
+        """Test selecting one key under every child."""
+        result = project(layer, compile_patterns("services.*.port"))
+        assert result == {"services": {"web": {"port": 80}, "worker": {"port": 81}}}
+
+    def test_exclude(self, layer):
+        """Test that exclusions drop subtrees and override inclusions."""
+        result = project(
+            layer,
+            compile_patterns(["database", "debug"]),
+            compile_patterns(["*.password", "debug"]),
+        )
+        assert result == {"database": {"host": "db", "port": 5432}}
+
+    def test_nothing_selected(self, layer):
+        """Test that mappings without selected keys are left out."""
+        assert project(layer, compile_patterns("services.api.port")) == {}
+        assert project(layer, compile_patterns("debug.flag")) == {}
+
+    def test_root_patterns(self, layer):
+        """Test the empty pattern, which selects the root."""
+        assert project(layer, compile_patterns("")) == layer
+        assert project(layer, None, compile_patterns("")) == {}
+
+    def test_named_keys_are_looked_up(self):
+        """Test that levels without wildcards are not iterated."""
+
+        class Unlistable(dict):
+            def keys(self):
+                raise AssertionError("level was iterated")
+
+            __iter__ = keys
+
+        layer = Unlistable(a={"b": 1}, c=2)
+
+        assert project(layer, compile_patterns("a.b")) == {"a": {"b": 1}}
+
+
+class TestMergerProjection:
+    """Test include and exclude through Merger.merge."""
+
+    def test_matches_merge_then_filter(self, layer):
+        """Test that projected merges select the same paths of the result."""
+        overlay = {"database": {"port": 6432}, "services": {"web": {"port": 8080}}}
+
+        result = Merger().merge(layer, overlay, include=["database.*", "services"])
+
+        full = Merger().merge(layer, overlay)
+        assert result == {"database": full["database"], "services": full["services"]}
+
+    def test_exclude(self, layer):
+        """Test leaving paths out of a merge."""
+        result = Merger().merge(
+            layer, {"cache": {"ttl": 30}}, exclude=["database", "services"]
+        )
+        assert result == {"cache": {"ttl": 30}, "debug": True}
+
+    def test_first_layer_not_shared(self, layer):
+        """Test that the first layer is still copied into the result."""
+        result = Merger().merge(layer, include="database")
+
+        result["database"]["host"] = "changed"
+
+        assert layer["database"]["host"] == "db"
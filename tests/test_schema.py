@@ -0,0 +1,133 @@
+"""Tests for schema validation of merge results."""
+
+import pytest
+
+from flexmerge import Merger, Schema, SchemaError, SchemaViolation
+
+
+@pytest.fixture
+def schema():
+    """A schema covering types, required keys, enums and list items."""
+    return Schema(
+        {
+            "": {"required": ["database"]},
+            "database": {"type": dict, "required": ["host", "port"]},
+            "database.port": int,
+            "database.mode": {"enum": ["ro", "rw"]},
+            "services.*.tags": {"type": list, "items": str},
+            "services.*.replicas": (int, type(None)),
+        }
+    )
+
+
+class TestSchema:
+    """Test Schema.validate."""
+
+    def test_valid(self, schema):
+        """Test that a matching value has no violations."""
+        value = {
+            "database": {"host": "db", "port": 5432, "mode": "ro"},
+            "services": {"web": {"tags": ["a"], "replicas": None}},
+            "other": {"anything": [1, "x"]},
+        }
+        assert schema.validate(value) == []
+
+    def test_reports_all_violations(self, schema):
+        """Test that every violation is reported with its path."""
+        value = {
+            "database": {"port": "5432", "mode": "rw+"},
+            "services": {
+                "web": {"tags": ["a", 1], "replicas": 2},
+                "db": {"tags": "x", "replicas": 1.5},
+            },
+        }
+
+        violations = schema.validate(value)
+
+        assert violations == [
+            SchemaViolation(("database", "host"), "required key is missing"),
+            SchemaViolation(("database", "port"), "expected int, got str"),
+            SchemaViolation(("database", "mode"), "'rw+' is not one of 'ro', 'rw'"),
+            SchemaViolation(
+                ("services", "web", "tags", 1), "expected str item, got int"
+            ),
+            SchemaViolation(("services", "db", "tags"), "expected list, got str"),
+            SchemaViolation(
+                ("services", "db", "replicas"), "expected int or NoneType, got float"
+            ),
+        ]
+
+    def test_required_at_root(self, schema):
+        """Test required keys of the root."""
+        assert schema.validate({}) == [
+            SchemaViolation(("database",), "required key is missing")
+        ]
+
+    def test_bool_is_not_int(self):
+        """Test that booleans only match int when bool is listed."""
+        assert Schema({"a": int}).validate({"a": True})
+        assert not Schema({"a": (int, bool)}).validate({"a": True})
+
+    def test_required_on_non_mapping(self):
+        """Test that required keys on a scalar are reported once."""
+        violations = Schema({"a": {"required": ["b"]}}).validate({"a": 1})
+        assert violations == [SchemaViolation(("a",), "expected a mapping, got int")]
+
+    def test_only_schema_paths_are_visited(self):
+        """Test that keys the schema does not name are not iterated."""
+
+        class Unlistable(dict):
+            def keys(self):
+                raise AssertionError("level was iterated")
+
+            __iter__ = keys
+
+        value = Unlistable(a=Unlistable(b=1), c=2)
+
+        assert Schema({"a.b": int}).validate(value) == []
+
+    def test_unknown_rule_key(self):
+        """Test that misspelled rule keys are rejected."""
+        with pytest.raises(ValueError, match="Unknown schema rule key: typ"):
+            Schema({"a": {"typ": int}})
+
+
+class TestMergerSchema:
+    """Test validating merge results."""
+
+    def test_merge_raises_with_all_violations(self, schema):
+        """Test that merge reports the violations of the merged result."""
+        merger = Merger().schema(schema)
+        base = {"database": {"host": "db", "port": 5432}}
+
+        result = merger.merge(base, {"database": {"mode": "rw"}})
+        assert result["database"]["mode"] == "rw"
+        with pytest.raises(SchemaError) as info:
+            merger.merge(base, {"database": {"port": "x", "mode": "x"}})
+
+        assert str(info.value).startswith("Schema violation at 'database.port'")
+        assert str(info.value).endswith("(and 1 more)")
+        assert len(info.value.violations) == 2
+
+    def test_rules_mapping(self):
+        """Test passing rules without compiling them first."""
+        merger = Merger().schema({"port": int})
+        assert merger.copy()._schema is merger._schema
+
+        with pytest.raises(SchemaError):
+            merger.merge({"port": 1}, {"port": "2"})
+        assert merger.schema(None).merge({"port": 1}, {"port": "2"}) == {"port": "2"}
+
+    def test_batch_methods(self):
+        """Test that batch merges validate every result."""
+        merger = Merger().schema({"port": int})
+
+        results = merger.merge_many([({"port": 1},), ({"port": "x"},)])
+        assert next(results) == {"port": 1}
+        with pytest.raises(SchemaError):
+            next(results)
+
+        with pytest.raises(SchemaError):
+            list(merger.merge_fanout({"port": 1}, [{}, {"port": None}]))
+        with pytest.raises(SchemaError):
+            merger.merge_fingerprinted({"port": 1}, {"port": 1.5})
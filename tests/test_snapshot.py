@@ -0,0 +1,220 @@
+"""Tests for binary snapshots."""
+
+import json
+import os
+
+import pytest
+
+from flexmerge import (
+    LazyDict,
+    MergeConflictError,
+    MergeLimitError,
+    Merger,
+    ParseCache,
+    SchemaError,
+    SnapshotError,
+    load_snapshot,
+    save_snapshot,
+    sorted_unique,
+)
+
+
+@pytest.fixture
+def sample():
+    """A tree using every supported value type."""
+    return {
+        "none": None,
+        "flags": [True, False],
+        "ints": [0, -42, (1 << 31) - 1, -(1 << 31), 1 << 40],
+        "big": 1 << 80,
+        "float": 1.5,
+        "text": "héllo",
+        "short": ["", "ab", "é"],
+        "nested": {"list": [{"a": 1}, [2, 3], "x"], "empty": {}},
+        "empty_list": [],
+    }
+
+
+class TestSnapshotFormat:
+    """Test saving and loading snapshots."""
+
+    def test_round_trip(self, tmp_path, sample):
+        """Test that every supported value survives a round trip."""
+        path = tmp_path / "result.snap"
+        save_snapshot(path, sample, {"note": "test"})
+        with load_snapshot(path) as snapshot:
+            assert snapshot.metadata == {"note": "test"}
+            assert snapshot.root == sample
+            assert snapshot.root.to_dict() == sample
+            assert type(snapshot.root.to_dict()["nested"]["list"][0]) is dict
+
+    def test_lazy_decoding(self, tmp_path, sample):
+        """Test that dict levels are decoded only on access."""
+        path = tmp_path / "result.snap"
+        save_snapshot(path, sample)
+        with load_snapshot(path) as snapshot:
+            root = snapshot.root
+            assert isinstance(root, LazyDict)
+            assert root._index is None
+            nested = root["nested"]
+            assert isinstance(nested, LazyDict)
+            assert nested._index is None
+            assert root["nested"] is nested
+
+    def test_deep_tree(self, tmp_path):
+        """Test that deep trees are written and materialized iteratively."""
+        root = node = {}
+        for _ in range(5000):
+            node["child"] = {}
+            node = node["child"]
+        path = tmp_path / "deep.snap"
+        save_snapshot(path, root)
+        with load_snapshot(path) as snapshot:
+            node = snapshot.root.to_dict()
+            depth = 0
+            while node:
+                node = node["child"]
+                depth += 1
+            assert depth == 5000
+
+    def test_unsupported_values(self, tmp_path):
+        """Test that non JSON-compatible values are rejected."""
+        with pytest.raises(SnapshotError, match="Cannot store value"):
+            save_snapshot(tmp_path / "a.snap", {"s": {1, 2}})
+        with pytest.raises(SnapshotError, match="keys must be strings"):
+            save_snapshot(tmp_path / "b.snap", {1: "x"})
+
+    def test_invalid_file(self, tmp_path):
+        """Test loading a file that is not a snapshot."""
+        path = tmp_path / "bad.snap"
+        path.write_bytes(b"not a snapshot")
+        with pytest.raises(SnapshotError, match="Not a snapshot file"):
+            load_snapshot(path)
+
+    @pytest.mark.parametrize("size", [10, 14, 30, 40])
+    def test_truncated_file(self, tmp_path, sample, size):
+        """Test that a truncated snapshot raises SnapshotError."""
+        path = tmp_path / "full.snap"
+        save_snapshot(path, sample, {"note": "test"})
+        truncated = tmp_path / "truncated.snap"
+        truncated.write_bytes(path.read_bytes()[:size])
+
+        with pytest.raises(SnapshotError, match="Corrupt snapshot file"):
+            load_snapshot(truncated)
+
+    def test_lazy_result_can_be_merged(self, tmp_path):
+        """Test that a loaded snapshot can be used as a merge layer."""
+        path = tmp_path / "base.snap"
+        save_snapshot(path, {"db": {"host": "a", "port": 1}})
+        with load_snapshot(path) as snapshot:
+            result = Merger().merge(snapshot.root, {"db": {"host": "b"}})
+            assert result == {"db": {"host": "b", "port": 1}}
+
+
+class TestMergeFilesSnapshot:
+    """Test Merger.merge_files_snapshot."""
+
+    @pytest.fixture
+    def files(self, tmp_path):
+        """Two JSON layers."""
+        base = tmp_path / "base.json"
+        base.write_text(json.dumps({"items": [1], "db": {"host": "a"}}))
+        overlay = tmp_path / "overlay.json"
+        overlay.write_text(json.dumps({"items": [2], "db": {"port": 1}}))
+        return base, overlay
+
+    def test_reuses_snapshot(self, tmp_path, files):
+        """Test that an unchanged merge is served from the snapshot."""
+        snap = tmp_path / "merged.snap"
+        merger = Merger()
+        first = merger.merge_files_snapshot(snap, *files, cache=ParseCache())
+        assert isinstance(first, dict)
+
+        second = merger.merge_files_snapshot(snap, *files, cache=ParseCache())
+        assert isinstance(second, LazyDict)
+        assert second == {"items": [1, 2], "db": {"host": "a", "port": 1}}
+
+    def test_changed_input_remerges(self, tmp_path, files):
+        """Test that modified inputs invalidate the snapshot."""
+        snap = tmp_path / "merged.snap"
+        merger = Merger()
+        merger.merge_files_snapshot(snap, *files, cache=ParseCache())
+
+        files[1].write_text(json.dumps({"items": [3]}))
+        stat = os.stat(files[1])
+        os.utime(files[1], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        result = merger.merge_files_snapshot(snap, *files, cache=ParseCache())
+        assert isinstance(result, dict)
+        assert result == {"items": [1, 3], "db": {"host": "a"}}
+
+    def test_changed_config_remerges(self, tmp_path, files):
+        """Test that a different strategy configuration invalidates it."""
+        snap = tmp_path / "merged.snap"
+        Merger().merge_files_snapshot(snap, *files, cache=ParseCache())
+        result = (
+            Merger()
+            .lists("replace")
+            .merge_files_snapshot(snap, *files, cache=ParseCache())
+        )
+        assert isinstance(result, dict)
+        assert result["items"] == [2]
+
+    def test_corrupt_snapshot_remerges(self, tmp_path, files):
+        """Test that a truncated snapshot is replaced by a fresh merge."""
+        snap = tmp_path / "merged.snap"
+        Merger().merge_files_snapshot(snap, *files, cache=ParseCache())
+        snap.write_bytes(snap.read_bytes()[:20])
+
+        result = Merger().merge_files_snapshot(snap, *files, cache=ParseCache())
+        assert isinstance(result, dict)
+        assert isinstance(
+            Merger().merge_files_snapshot(snap, *files, cache=ParseCache()), LazyDict
+        )
+
+    def test_reused_snapshot_checks_schema(self, tmp_path, files):
+        """Test that a reused result is validated like a merged one."""
+        snap = tmp_path / "merged.snap"
+        Merger().merge_files_snapshot(snap, *files, cache=ParseCache())
+        merger = Merger().schema({"db.host": int})
+
+        with pytest.raises(SchemaError):
+            merger.merge_files(*files, cache=ParseCache())
+        with pytest.raises(SchemaError):
+            merger.merge_files_snapshot(snap, *files, cache=ParseCache())
+
+        merger = Merger().schema({"db.host": str})
+        result = merger.merge_files_snapshot(snap, *files, cache=ParseCache())
+        assert isinstance(result, LazyDict)
+
+    def test_limits_and_strict_mode_invalidate(self, tmp_path, files):
+        """Test that limits and strict mode are part of the configuration."""
+        snap = tmp_path / "merged.snap"
+        files[1].write_text(json.dumps({"items": [2], "db": {"host": "b"}}))
+        Merger().merge_files_snapshot(snap, *files, cache=ParseCache())
+
+        with pytest.raises(MergeLimitError):
+            Merger().limits(max_output_nodes=2).merge_files_snapshot(
+                snap, *files, cache=ParseCache()
+            )
+        with pytest.raises(MergeConflictError):
+            Merger().strict().merge_files_snapshot(snap, *files, cache=ParseCache())
+
+    def test_parameterized_strategy_reuses_snapshot(self, tmp_path, files):
+        """Test that strategies built with parameters have a stable identity."""
+        snap = tmp_path / "merged.snap"
+
+        def merger():
+            return Merger().lists(sorted_unique(key=abs, reverse=True))
+
+        merger().merge_files_snapshot(snap, *files, cache=ParseCache())
+        result = merger().merge_files_snapshot(snap, *files, cache=ParseCache())
+        assert isinstance(result, LazyDict)
+        assert result["items"] == [2, 1]
+
+    def test_unidentifiable_strategy(self, tmp_path, files):
+        """Test that strategies without a stable identity are refused."""
+        merger = Merger().lists(sorted_unique(key=lambda item: item))
+
+        with pytest.raises(ValueError, match="Cannot identify lists strategy"):
+            merger.merge_files_snapshot(tmp_path / "merged.snap", *files)
@@ -0,0 +1,226 @@
+"""Tests for file layer sources and the parse cache."""
+
+import json
+import os
+
+import pytest
+
+from flexmerge import EnvSource, Merger, ParseCache
+from flexmerge.sources import coerce_env_value
+
+
+@pytest.fixture
+def config_files(tmp_path):
+    """Write a JSON base file and a TOML overlay."""
+    base = tmp_path / "base.json"
+    base.write_text(json.dumps({"db": {"host": "localhost", "port": 5432}}))
+    overlay = tmp_path / "prod.toml"
+    overlay.write_text('debug = false\n\n[db]\nhost = "prod.example.com"\n')
+    return base, overlay
+
+
+def touch(path, content):
+    """Rewrite a file and move its mtime forward."""
+    path.write_text(content)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestMergeFiles:
+    """Test Merger.merge_files."""
+
+    def test_merges_json_and_toml(self, config_files):
+        """Test merging files of both supported formats."""
+        result = Merger().merge_files(*config_files, cache=ParseCache())
+        assert result == {
+            "db": {"host": "prod.example.com", "port": 5432},
+            "debug": False,
+        }
+
+    def test_unsupported_format(self, tmp_path):
+        """Test error for unknown file extensions."""
+        path = tmp_path / "config.yaml"
+        path.write_text("a: 1")
+        with pytest.raises(ValueError, match="Unsupported file format: .yaml"):
+            Merger().merge_files(path, cache=ParseCache())
+
+    def test_non_object_document(self, tmp_path):
+        """Test that top-level arrays are rejected like other non-dicts."""
+        path = tmp_path / "list.json"
+        path.write_text("[1, 2]")
+        with pytest.raises(TypeError, match="Argument 0 is not a dictionary"):
+            Merger().merge_files(path, cache=ParseCache())
+
+    def test_first_layer_is_copied(self, config_files):
+        """Test that mutating a result does not change the cached base."""
+        cache = ParseCache()
+        result = Merger().merge_files(config_files[0], cache=cache)
+        result["db"]["host"] = "changed"
+        assert cache.load(config_files[0])["db"]["host"] == "localhost"
+
+
+class TestParseCache:
+    """Test the parse cache."""
+
+    def test_unchanged_file_is_not_parsed_again(self, config_files):
+        """Test that a cache hit returns the same document object."""
+        cache = ParseCache()
+        first = cache.load(config_files[0])
+        assert cache.load(config_files[0]) is first
+        assert config_files[0] in cache
+
+    def test_changed_file_is_reparsed(self, config_files):
+        """Test that modified files are parsed again."""
+        cache = ParseCache()
+        cache.load(config_files[0])
+        touch(config_files[0], json.dumps({"db": {"port": 1}, "new": True}))
+        assert cache.load(config_files[0]) == {"db": {"port": 1}, "new": True}
+
+    def test_bounded_size(self, tmp_path):
+        """Test that the least recently used entry is evicted."""
+        cache = ParseCache(max_entries=2)
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"{i}.json"
+            path.write_text(json.dumps({"i": i}))
+            paths.append(path)
+
+        cache.load(paths[0])
+        cache.load(paths[1])
+        cache.load(paths[0])
+        cache.load(paths[2])
+        assert len(cache) == 2
+        assert paths[0] in cache
+        assert paths[1] not in cache
+
+    def test_invalidate(self, config_files):
+        """Test explicit invalidation of one or all entries."""
+        cache = ParseCache()
+        for path in config_files:
+            cache.load(path)
+
+        cache.invalidate(config_files[0])
+        assert config_files[0] not in cache
+        assert config_files[1] in cache
+
+        cache.invalidate()
+        assert len(cache) == 0
+
+    def test_large_files_use_mmap(self, tmp_path):
+        """Test that files above the threshold are read correctly."""
+        path = tmp_path / "big.json"
+        data = {f"key{i}": "välue" for i in range(1000)}
+        path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        cache = ParseCache(mmap_threshold=1)
+        assert cache.load(path) == data
+
+    def test_invalid_max_entries(self):
+        """Test that the cache must hold at least one entry."""
+        with pytest.raises(ValueError, match="max_entries must be at least 1"):
+            ParseCache(max_entries=0)
+
+
+class TestEnvSource:
+    """Test the environment variable layer source."""
+
+    def test_builds_nested_overlay(self):
+        """Test that prefixed variables become a nested, coerced overlay."""
+        environ = {
+            "APP__DATABASE__HOST": "db.local",
+            "APP__DATABASE__PORT": "5432",
+            "APP__DEBUG": "true",
+            "APP__TAGS": '["a", "b"]',
+            "OTHER__DATABASE__HOST": "ignored",
+            "APP__": "ignored",
+            "APP__A____B": "ignored",
+        }
+
+        overlay = EnvSource("APP", environ=environ).load()
+
+        assert overlay == {
+            "database": {"host": "db.local", "port": 5432},
+            "debug": True,
+            "tags": ["a", "b"],
+        }
+
+    def test_options(self):
+        """Test the separator, case and coercion options."""
+        environ = {"APP_Db_Port": "5432", "APP_Db_Name": "007"}
+
+        overlay = EnvSource(
+            "APP", separator="_", lowercase=False, coerce=None, environ=environ
+        ).load()
+
+        assert overlay == {"Db": {"Port": "5432", "Name": "007"}}
+
+    def test_types_by_path(self):
+        """Test per-path conversions, with literal keys before wildcards."""
+        environ = {"APP__DB__NAME": "007", "APP__DB__PORT": "1", "APP__X__PORT": "2"}
+        types = {"db.name": str, "*.port": float}
+
+        overlay = EnvSource("APP", types=types, environ=environ).load()
+
+        assert overlay == {"db": {"name": "007", "port": 1.0}, "x": {"port": 2.0}}
+
+    def test_cached_until_environment_changes(self):
+        """Test that the overlay is rebuilt only after a variable changes."""
+        environ = {"APP__A": "1", "UNRELATED": "x"}
+        source = EnvSource("APP", environ=environ)
+
+        first = source.load()
+        environ["UNRELATED"] = "y"
+        assert source.load() is first
+
+        environ["APP__A"] = "2"
+        assert source.load() == {"a": 2}
+        assert source.load() is not first
+
+    def test_conflicting_variables(self):
+        """Test that a value and keys below it cannot both be set."""
+        source = EnvSource("APP", environ={"APP__DB": "x", "APP__DB__HOST": "y"})
+
+        with pytest.raises(ValueError, match="APP__DB__HOST conflicts .* at 'db'"):
+            source.load()
+
+    def test_os_environ(self, monkeypatch):
+        """Test reading os.environ by default."""
+        monkeypatch.setenv("FLEXMERGE_TEST__PORT", "8080")
+        assert EnvSource("FLEXMERGE_TEST").load() == {"port": 8080}
+
+    def test_merge_files(self, tmp_path):
+        """Test overlaying the environment on files."""
+        path = tmp_path / "base.json"
+        path.write_text(json.dumps({"db": {"host": "localhost", "port": 5432}}))
+        source = EnvSource("APP", environ={"APP__DB__HOST": "prod"})
+
+        result = Merger().merge_files(path, source, cache=ParseCache())
+
+        assert result == {"db": {"host": "prod", "port": 5432}}
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ("TRUE", True),
+            ("null", None),
+            ("-12", -12),
+            ("1e3", 1000.0),
+            ("0.5", 0.5),
+            ("-0", 0),
+            (".5", ".5"),
+            ("+5", "+5"),
+            ("01234", "01234"),
+            ("1_000", "1_000"),
+            ("0001.50", "0001.50"),
+            ("\u0661\u0662", "\u0661\u0662"),
+            ("1.", "1."),
+            ("1e", "1e"),
+            ("nan", "nan"),
+            ("-", "-"),
+            ("{bad", "{bad"),
+            ('{"a": 1}', {"a": 1}),
+            ("", ""),
+        ],
+    )
+    def test_coerce_env_value(self, value, expected):
+        """Test the default value coercion."""
+        assert coerce_env_value(value) == expected
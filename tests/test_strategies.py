@@ -5,8 +5,13 @@ import pytest
 from flexmerge.strategies import (
     BUILTIN_DICT_STRATEGIES,
     BUILTIN_LIST_STRATEGIES,
+    BUILTIN_SCALAR_STRATEGIES,
     BuiltinDictStrategies,
     BuiltinListStrategies,
+    BuiltinScalarStrategies,
+    by_key,
+    sorted_merge,
+    sorted_unique,
 )
 
 
@@ -25,8 +30,25 @@ class TestBuiltinStrategies:
             assert strategy_enum.value in BUILTIN_DICT_STRATEGIES
             assert callable(BUILTIN_DICT_STRATEGIES[strategy_enum.value])
 
+    def test_builtin_scalar_strategies_completeness(self):
+        """Test that all enum values have corresponding strategies."""
+        for strategy_enum in BuiltinScalarStrategies:
+            assert strategy_enum.value in BUILTIN_SCALAR_STRATEGIES
+            assert callable(BUILTIN_SCALAR_STRATEGIES[strategy_enum.value])
+
     @pytest.mark.parametrize(
-        "strategy_name", ["append", "prepend", "unique", "replace", "keep"]
+        "strategy_name",
+        [
+            "append",
+            "prepend",
+            "unique",
+            "replace",
+            "keep",
+            "sorted_merge",
+            "sorted_unique",
+            "unique_approx",
+            "unique_partitioned",
+        ],
     )
     def test_builtin_list_strategies_callable(self, strategy_name):
         """Test that all built-in list strategies are callable."""
@@ -53,7 +75,17 @@ class TestStrategyEnums:
 
     def test_builtin_list_strategies_enum_values(self):
         """Test BuiltinListStrategies enum values."""
-        expected_values = {"append", "prepend", "unique", "replace", "keep"}
+        expected_values = {
+            "append",
+            "prepend",
+            "unique",
+            "replace",
+            "keep",
+            "sorted_merge",
+            "sorted_unique",
+            "unique_approx",
+            "unique_partitioned",
+        }
         actual_values = {strategy.value for strategy in BuiltinListStrategies}
         assert actual_values == expected_values
 
@@ -67,3 +99,109 @@ class TestStrategyEnums:
         """Test string representation of enums."""
         assert BuiltinListStrategies.APPEND.value == "append"
         assert BuiltinDictStrategies.DEEP.value == "deep"
+
+
+class TestKeyedListStrategy:
+    """Test the by_key list strategy."""
+
+    def test_merges_matching_records(self):
+        """Test that records with the same key are deep merged in place."""
+        strategy = by_key("name")
+        left = [{"name": "web", "port": 80}, {"name": "db", "port": 5432}]
+        right = [{"name": "db", "port": 6432}, {"name": "web", "tls": True}]
+        assert strategy(left, right) == [
+            {"name": "web", "port": 80, "tls": True},
+            {"name": "db", "port": 6432},
+        ]
+
+    def test_appends_new_records_in_order(self):
+        """Test that unmatched right records are appended in order."""
+        strategy = by_key("id")
+        result = strategy([{"id": 1}], [{"id": 3}, {"id": 1, "x": 1}, {"id": 2}])
+        assert result == [{"id": 1, "x": 1}, {"id": 3}, {"id": 2}]
+
+    def test_nested_lists_use_same_strategy(self):
+        """Test that nested record lists are merged by key too."""
+        strategy = by_key("name")
+        left = [{"name": "web", "routes": [{"name": "a", "v": 1}]}]
+        right = [{"name": "web", "routes": [{"name": "a", "v": 2}, {"name": "b"}]}]
+        assert strategy(left, right) == [
+            {"name": "web", "routes": [{"name": "a", "v": 2}, {"name": "b"}]}
+        ]
+
+    def test_duplicate_right_keys_are_folded(self):
+        """Test that duplicate keys in the right list merge into one record."""
+        strategy = by_key("id")
+        result = strategy([], [{"id": 1, "a": 1}, {"id": 1, "b": 2}])
+        assert result == [{"id": 1, "a": 1, "b": 2}]
+
+    def test_unkeyed_items_are_kept(self):
+        """Test items without a usable key are never matched."""
+        strategy = by_key("id")
+        left = [{"id": 1}, "scalar", {"other": 1}, {"id": [1]}]
+        right = [{"other": 1}, {"id": [1]}, "scalar"]
+        assert strategy(left, right) == left + right
+
+    def test_inputs_are_not_mutated(self):
+        """Test that input records are left untouched."""
+        strategy = by_key("id")
+        left = [{"id": 1, "a": 1}]
+        right = [{"id": 1, "b": 2}]
+        strategy(left, right)
+        assert left == [{"id": 1, "a": 1}]
+        assert right == [{"id": 1, "b": 2}]
+
+
+class TestSortedListStrategies:
+    """Test the sorted_merge and sorted_unique list strategies."""
+
+    def test_sorted_merge(self):
+        """Test merging two sorted lists keeps duplicates."""
+        assert sorted_merge()([1, 3, 5, 5], [2, 3, 6]) == [1, 2, 3, 3, 5, 5, 6]
+
+    def test_sorted_unique(self):
+        """Test merging two sorted lists drops duplicates."""
+        assert sorted_unique()([1, 3, 5, 5], [2, 3, 6]) == [1, 2, 3, 5, 6]
+
+    def test_matches_sorted_set(self):
+        """Test sorted_unique matches sorted(set(left + right))."""
+        left = list(range(0, 100, 3))
+        right = list(range(0, 100, 4))
+        assert sorted_unique()(left, right) == sorted(set(left + right))
+
+    def test_key_and_reverse(self):
+        """Test key function and descending order."""
+        strategy = sorted_unique(key=lambda item: item["v"], reverse=True)
+        left = [{"v": 9, "side": "l"}, {"v": 4, "side": "l"}]
+        right = [{"v": 9, "side": "r"}, {"v": 7, "side": "r"}, {"v": 1}]
+        assert strategy(left, right) == [
+            {"v": 9, "side": "l"},
+            {"v": 7, "side": "r"},
+            {"v": 4, "side": "l"},
+            {"v": 1},
+        ]
+
+    def test_stable_for_equal_keys(self):
+        """Test that equal items keep left before right."""
+        strategy = sorted_merge(key=lambda item: item[0])
+        assert strategy([(1, "l")], [(0, "r"), (1, "r")]) == [
+            (0, "r"),
+            (1, "l"),
+            (1, "r"),
+        ]
+
+    def test_runs_without_overlap(self):
+        """Test that disjoint runs are concatenated in either order."""
+        left = [1, 2, 2]
+        right = [2, 3]
+
+        assert sorted_merge()(left, right) == [1, 2, 2, 2, 3]
+        assert sorted_merge()(right, left) == [1, 2, 2, 2, 3]
+        assert sorted_merge(reverse=True)([5, 4], [4, 1]) == [5, 4, 4, 1]
+        assert sorted_unique()(right, left) == [1, 2, 3]
+        assert left == [1, 2, 2] and right == [2, 3]
+
+    def test_empty_inputs(self):
+        """Test merging with empty lists."""
+        assert sorted_unique()([], []) == []
+        assert sorted_unique()([1], []) == [1]
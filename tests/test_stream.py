@@ -0,0 +1,113 @@
+"""Tests for merging straight into a JSON stream."""
+
+import io
+import json
+
+import pytest
+
+from flexmerge import MergeConflictError, Merger
+
+LAYERS = [
+    {
+        "name": "app",
+        "db": {"host": "localhost", "port": 5432, "options": {"ssl": False}},
+        "tags": ["a", "b"],
+        "replaced": {"x": 1},
+        "counts": {"hits": 1},
+        1: "int key",
+    },
+    {
+        "db": {"options": {"ssl": True, "pool": [1, 2]}, "port": 6432},
+        "tags": ["b", "c"],
+        "replaced": "scalar",
+        "counts": {"hits": 2, "misses": 1},
+        "new": {"nested": {"deep": [{"k": "v"}]}},
+    },
+    {
+        "replaced": {"y": 2},
+        "tags": "not a list",
+        "empty": {},
+        "unicode": "é☃",
+        None: 0.5,
+    },
+]
+
+
+def stream(merger, *layers, **kwargs):
+    """Stream a merge into a string."""
+    out = io.StringIO()
+    merger.merge_to_stream(out, *layers, **kwargs)
+    return out.getvalue()
+
+
+class TestMergeToStream:
+    """Test Merger.merge_to_stream."""
+
+    @pytest.mark.parametrize("lists", ["append", "unique", "replace"])
+    @pytest.mark.parametrize("scalars", ["replace", "sum", "count"])
+    @pytest.mark.parametrize("dicts", ["deep", "shallow"])
+    def test_matches_merge(self, lists, scalars, dicts):
+        """Test that the output equals json.dumps of the merged result."""
+        merger = Merger().lists(lists).scalars(scalars).dicts(dicts)
+
+        for layers in (LAYERS, LAYERS[:1], LAYERS[1:], [LAYERS[2], LAYERS[0]]):
+            expected = json.dumps(merger.merge(*layers))
+            assert stream(merger, *layers) == expected
+
+    @pytest.mark.parametrize("indent", [None, 0, 2, "\t"])
+    @pytest.mark.parametrize("sort_keys", [False, True])
+    def test_formatting(self, indent, sort_keys):
+        """Test that indentation and key sorting match json.dumps."""
+        layers = [
+            {k: v for k, v in layer.items() if k is not None and k != 1}
+            for layer in LAYERS
+        ]
+        merger = Merger()
+
+        result = stream(merger, *layers, indent=indent, sort_keys=sort_keys)
+
+        expected = json.dumps(merger.merge(*layers), indent=indent, sort_keys=sort_keys)
+        assert result == expected
+
+    def test_binary_stream(self):
+        """Test writing UTF-8 to a binary stream."""
+        out = io.BytesIO()
+
+        Merger().merge_to_stream(out, {"a": "☃"}, {"b": [1]})
+
+        assert json.loads(out.getvalue().decode("utf-8")) == {"a": "☃", "b": [1]}
+
+    def test_no_layers(self):
+        """Test that merging nothing writes an empty object."""
+        assert stream(Merger()) == "{}"
+
+    def test_chunked_writes(self, monkeypatch):
+        """Test that output is written in chunks rather than per token."""
+        writes = []
+
+        class Recorder(io.StringIO):
+            def write(self, data):
+                writes.append(data)
+                return super().write(data)
+
+        layer = {f"k{i}": {"v": i} for i in range(20000)}
+        out = Recorder()
+
+        Merger().merge_to_stream(out, layer, {"k1": {"w": 1}})
+
+        assert json.loads(out.getvalue())["k1"] == {"v": 1, "w": 1}
+        assert 1 < len(writes) < 100
+
+    def test_unsupported_dict_strategy(self):
+        """Test that dict strategies that cannot be streamed are rejected."""
+        with pytest.raises(ValueError, match="'deep' or 'shallow'"):
+            stream(Merger().dicts("replace"), {"a": 1})
+
+    def test_invalid_arguments(self):
+        """Test argument validation and strict mode."""
+        with pytest.raises(TypeError, match="Argument 1 is not a dictionary"):
+            stream(Merger(), {}, [1])
+        with pytest.raises(MergeConflictError):
+            stream(Merger().strict(), {"a": 1}, {"a": 2})
+        with pytest.raises(TypeError, match="keys must be"):
+            stream(Merger(), {(1, 2): 1})